@@ -0,0 +1,220 @@
+"""
+Offline, headless microbenchmarks for the perception / intent / control / UI hot paths.
+
+    python benchmarks/bench.py                          # run all
+    python benchmarks/bench.py -k hud                   # name filter
+    python benchmarks/bench.py --save baseline.json     # store results
+    python benchmarks/bench.py --compare baseline.json  # fail on regressions
+
+Reports per call: ns/op (median of repeats), peak traced bytes/op and net
+retained memory blocks/op (growth indicator). OS input and display are stubbed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import stubs
+stubs.install(record=False)
+
+import numpy as np
+from benchmarks.synthetic import circle_trajectory, hand_pose, landmark_list
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """
+    Register a setup function returning a zero-arg callable (one op per call).
+    """
+    def wrap(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return wrap
+
+# --- Perception ---
+
+@benchmark("perception.one_euro_filter")
+def _one_euro():
+    from gesture_v3.perception.smoothing import OneEuroFilter
+    stream = [[lm[5].x, lm[5].y] for lm in circle_trajectory(256)]
+    f = OneEuroFilter(0.0, stream[0], min_cutoff=1.2, beta=10.0)
+    state = {"i": 0, "t": 0.0}
+    def op():
+        state["i"] += 1
+        state["t"] += 1 / 60
+        f(state["t"], stream[state["i"] & 255])
+    return op
+
+# --- Intent ---
+
+@benchmark("intent.gesture_classifier")
+def _classifier():
+    from gesture_v3.intent.classifier import GestureClassifier
+    c = GestureClassifier()
+    frames = circle_trajectory(128) + [hand_pose(0.5, 0.6, p) for p in ("CLICK_LEFT", "SCROLL", "FIST")] * 8
+    state = {"i": 0}
+    def op():
+        state["i"] += 1
+        c.process(frames[state["i"] % len(frames)])
+    return op
+
+@benchmark("intent.v1_gesture_recognizer")
+def _v1_recognizer():
+    from gesture_recognition import GestureRecognizer
+    g = GestureRecognizer()
+    frames = [landmark_list(lm) for lm in circle_trajectory(128)]
+    state = {"i": 0}
+    def op():
+        state["i"] += 1
+        g.detect_gesture(frames[state["i"] & 127])
+    return op
+
+# --- Control ---
+
+@benchmark("control.physics_cursor")
+def _cursor():
+    from gesture_v3.control.mouse_physics import PhysicsCursor
+    cur = PhysicsCursor()
+    deltas = [(0.004 * np.cos(i / 10), 0.004 * np.sin(i / 10)) for i in range(256)]
+    deltas = [(float(dx), float(dy)) for dx, dy in deltas]
+    state = {"i": 0}
+    def op():
+        state["i"] += 1
+        dx, dy = deltas[state["i"] & 255]
+        cur.update_relative(dx, dy, 1 / 60)
+    return op
+
+@benchmark("control.v1_mouse_controller")
+def _v1_mouse():
+    from mouse_control import MouseController
+    m = MouseController()
+    points = [landmark_list(lm)[8][1:] for lm in circle_trajectory(128)]
+    state = {"i": 0}
+    def op():
+        state["i"] += 1
+        x, y = points[state["i"] & 127]
+        m.move_mouse(x, y)
+    return op
+
+# --- UI ---
+
+@benchmark("ui.cinematic_hud")
+def _hud():
+    from gesture_v3.ui.hud import CinematicHUD
+    from gesture_v3 import config
+    hud = CinematicHUD()
+    frames = circle_trajectory(64)
+    canvas = np.zeros((config.DISPLAY_HEIGHT, config.DISPLAY_WIDTH, 3), np.uint8)
+    state = {"i": 0}
+    def op():
+        state["i"] += 1
+        hud.draw(canvas, frames[state["i"] & 63], "MOVE", 1.0)
+    return op
+
+@benchmark("ui.security_hud")
+def _security_hud():
+    from gesture_v3.security.authenticator import FaceAuthenticator
+    auth = FaceAuthenticator()
+    h, w = 720, 1280
+    frame = np.full((h, w, 3), 90, np.uint8)
+    def op():
+        auth.draw_hud(frame, w, h, status="SCANNING", face_loc=(200, 760, 520, 520))
+    return op
+
+# --- Runner ---
+
+def measure(op, min_time=0.2, repeats=5):
+    # Warm-up (also fills lazy caches)
+    for _ in range(50):
+        op()
+
+    # Calibrate batch size to ~min_time / repeats
+    n = 1
+    while True:
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            op()
+        elapsed = time.perf_counter_ns() - t0
+        if elapsed > min_time * 1e9 / repeats or n >= 1 << 22:
+            break
+        n *= 2
+
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            op()
+        samples.append((time.perf_counter_ns() - t0) / n)
+    samples.sort()
+
+    # Memory: peak bytes for a single call, retained blocks over a batch
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    batch = min(n, 1000)
+    blocks0 = sys.getallocatedblocks()
+    for _ in range(batch):
+        op()
+    blocks = (sys.getallocatedblocks() - blocks0) / batch
+
+    return {"ns_per_op": samples[len(samples) // 2], "min_ns": samples[0],
+            "peak_bytes_per_op": peak - base, "blocks_per_op": blocks, "ops": n * repeats}
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        ratio = r["ns_per_op"] / max(baseline[name]["ns_per_op"], 1e-9)
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"  {name:<32} {baseline[name]['ns_per_op']:>12.0f} -> {r['ns_per_op']:>12.0f} ns  x{ratio:5.2f} {flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot path microbenchmarks (headless).")
+    parser.add_argument("-k", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Approx. seconds of timing per benchmark")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'benchmark':<34}{'ns/op':>12}{'peak B/op':>12}{'blocks/op':>11}")
+    for name, setup in BENCHMARKS.items():
+        if args.k not in name:
+            continue
+        try:
+            op = setup()
+        except ImportError as e:
+            print(f"{name:<34} SKIPPED ({e})")
+            continue
+        r = measure(op, min_time=args.min_time)
+        results[name] = r
+        print(f"{name:<34}{r['ns_per_op']:>12.0f}{r['peak_bytes_per_op']:>12}{r['blocks_per_op']:>11.2f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} (threshold x{args.threshold}):")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+End-to-end motion-to-event latency harness for the V3 pipeline.
+
+Drives the real SystemController loop (smoothing -> GestureClassifier ->
+PhysicsCursor / actions) with a scripted landmark source standing in for
+camera + MediaPipe, and a recording pyautogui backend that timestamps every
+emitted move / click / scroll. Runs headless on a CPU-only box.
+
+    python benchmarks/latency_harness.py
+    python benchmarks/latency_harness.py --repeats 10 --fps 30 --json latency.json
+"""
+import argparse
+import bisect
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import stubs
+backend = stubs.install(record=True)
+
+import numpy as np
+from benchmarks.synthetic import hand_pose
+from gesture_v3.core.system import SystemController
+
+# Wrist position that puts the Index MCP anchor at (0.5, 0.5), where the smoother starts
+HOME = (0.542, 0.64)
+
+class Scenario:
+    """
+    A scripted hand performance.
+    segments: [(duration_s, pose or None, (dx0, dy0), (dx1, dy1), mark)]
+      positions are offsets from HOME, interpolated linearly over the segment;
+      mark names the event kind this segment should trigger (its onset is the
+      capture time of the segment's first frame).
+    expect: {event_kind: (min_count, max_count or None)}
+    """
+    def __init__(self, name, segments, expect):
+        self.name = name
+        self.segments = segments
+        self.expect = expect
+
+    def frames(self, fps):
+        out = []
+        for seg_idx, (duration, pose, (x0, y0), (x1, y1), _) in enumerate(self.segments):
+            n = max(1, int(round(duration * fps)))
+            for i in range(n):
+                if pose is None:
+                    out.append((None, seg_idx))
+                    continue
+                a = i / max(1, n - 1)
+                x = HOME[0] + x0 + (x1 - x0) * a
+                y = HOME[1] + y0 + (y1 - y0) * a
+                out.append((hand_pose(x, y, pose), seg_idx))
+        return out
+
+STILL = (0.0, 0.0)
+
+SCENARIOS = [
+    Scenario("still_hand",
+             [(1.0, "MOVE", STILL, STILL, None)],
+             {"move": (0, 0), "click": (0, 0), "rightClick": (0, 0)}),
+    Scenario("move_onset",
+             [(0.5, "MOVE", STILL, STILL, None),
+              (0.5, "MOVE", STILL, (0.2, 0.0), "move")],
+             {"move": (1, None), "click": (0, 0)}),
+    Scenario("left_click",
+             [(0.5, "MOVE", STILL, STILL, None),
+              (0.25, "CLICK_LEFT", STILL, STILL, "click"),
+              (0.5, "MOVE", STILL, STILL, None)],
+             {"click": (1, 1), "rightClick": (0, 0)}),
+    Scenario("right_click",
+             [(0.5, "MOVE", STILL, STILL, None),
+              (0.25, "CLICK_RIGHT", STILL, STILL, "rightClick"),
+              (0.5, "MOVE", STILL, STILL, None)],
+             {"rightClick": (1, 1), "click": (0, 0)}),
+    Scenario("scroll_up",
+             [(0.4, "SCROLL", STILL, STILL, None),
+              (0.5, "SCROLL", STILL, (0.0, -0.15), "scroll")],
+             {"scroll": (1, None), "click": (0, 0)}),
+]
+
+class _Result:
+    __slots__ = ("hand_landmarks",)
+
+    def __init__(self, hand_landmarks):
+        self.hand_landmarks = hand_landmarks
+
+class ScriptedSource:
+    """
+    Camera + tracker stand-in. read() paces frames in real time at fps and
+    timestamps each capture; process() returns the scripted landmarks for
+    the frame most recently read.
+    """
+    def __init__(self, frames, fps, frame_shape=(72, 128, 3)):
+        self.frames = frames
+        self.fps = fps
+        self.image = np.zeros(frame_shape, np.uint8)
+        self.capture_times = []
+        self.index = -1
+        self.on_exhausted = None
+        self._t0 = None
+
+    # --- cv2.VideoCapture subset ---
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        due = self._t0 + (self.index + 1) / self.fps
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+
+        self.index += 1
+        if self.index >= len(self.frames):
+            if self.on_exhausted is not None:
+                self.on_exhausted()
+            return False, None
+        self.capture_times.append(time.perf_counter())
+        return True, self.image
+
+    def release(self):
+        pass
+
+    # --- HandTracker subset ---
+    def process(self, image_rgb, timestamp_ms):
+        landmarks, _ = self.frames[self.index]
+        return _Result([landmarks] if landmarks is not None else [])
+
+def run_scenario(scenario, fps):
+    frames = scenario.frames(fps)
+    source = ScriptedSource(frames, fps)
+    controller = SystemController(cap=source, tracker=source, display=False)
+    source.on_exhausted = lambda: setattr(controller, "running", False)
+
+    backend.clear()
+    controller.run()
+    events = list(backend.events)
+
+    # Segment onsets (capture time of each segment's first frame)
+    onsets = {}
+    for i, (_, seg_idx) in enumerate(frames):
+        onsets.setdefault(seg_idx, source.capture_times[i])
+
+    counts = {}
+    for kind, _, _ in events:
+        counts[kind] = counts.get(kind, 0) + 1
+
+    # Motion-to-event latency per marked segment
+    onset_latency = []
+    missed = 0
+    for seg_idx, segment in enumerate(scenario.segments):
+        mark = segment[4]
+        if mark is None:
+            continue
+        onset = onsets[seg_idx]
+        hits = [t for kind, t, _ in events if kind == mark and t >= onset]
+        if hits:
+            onset_latency.append(hits[0] - onset)
+        else:
+            missed += 1
+
+    # Pipeline latency: each event vs capture of the frame being processed
+    pipeline = []
+    for _, t, _ in events:
+        i = bisect.bisect_right(source.capture_times, t) - 1
+        if i >= 0:
+            pipeline.append(t - source.capture_times[i])
+
+    # Count bounds (marked kinds already counted as missed above)
+    marks = {segment[4] for segment in scenario.segments}
+    spurious = 0
+    for kind, (lo, hi) in scenario.expect.items():
+        got = counts.get(kind, 0)
+        if kind not in marks:
+            missed += max(0, lo - got)
+        if hi is not None:
+            spurious += max(0, got - hi)
+
+    return {"onset_latency": onset_latency, "pipeline_latency": pipeline,
+            "missed": missed, "spurious": spurious, "counts": counts}
+
+def _pct(values, p):
+    return float(np.percentile(values, p)) * 1000 if values else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description="Motion-to-event latency harness (headless).")
+    parser.add_argument("--fps", type=float, default=60.0, help="Scripted capture rate (keep above FAILSAFE_FPS)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("-k", default="", help="Only run scenarios whose name contains this")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = {}
+    print(f"{'scenario':<14}{'onset p50':>10}{'p95':>8}{'max':>8}{'pipe p50':>10}{'p95':>8}{'missed':>8}{'spurious':>10}")
+    for scenario in SCENARIOS:
+        if args.k not in scenario.name:
+            continue
+        onset, pipeline, missed, spurious = [], [], 0, 0
+        for _ in range(args.repeats):
+            r = run_scenario(scenario, args.fps)
+            onset += r["onset_latency"]
+            pipeline += r["pipeline_latency"]
+            missed += r["missed"]
+            spurious += r["spurious"]
+
+        report[scenario.name] = {
+            "onset_ms": {"p50": _pct(onset, 50), "p95": _pct(onset, 95), "max": max(onset) * 1000 if onset else None},
+            "pipeline_ms": {"p50": _pct(pipeline, 50), "p95": _pct(pipeline, 95)},
+            "missed": missed, "spurious": spurious, "runs": args.repeats,
+        }
+        s = report[scenario.name]
+        print(f"{scenario.name:<14}{s['onset_ms']['p50']:>10.1f}{s['onset_ms']['p95']:>8.1f}"
+              f"{(s['onset_ms']['max'] or float('nan')):>8.1f}{s['pipeline_ms']['p50']:>10.2f}{s['pipeline_ms']['p95']:>8.2f}"
+              f"{missed:>8}{spurious:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
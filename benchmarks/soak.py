@@ -0,0 +1,167 @@
+"""
+Soak test for allocation churn and memory growth in the V3 control loop.
+
+Runs the real SystemController headless for a fixed duration with
+MEMPROF_ENABLED, on either a looping synthetic gesture script (camera +
+MediaPipe stubbed) or a replayed video through the real HandTracker, then
+prints per-stage allocation counters, RSS / traced-memory growth and GC
+pauses, and writes the full MemoryProfiler report (with timeline) as JSON.
+
+    python benchmarks/soak.py --duration 600
+    python benchmarks/soak.py --duration 14400 --fps 0 --report soak_4h.json
+    python benchmarks/soak.py --video session.mp4 --duration 3600
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import stubs
+stubs.install(record=False) # Recording would itself grow without bound
+
+import cv2
+import numpy as np
+from benchmarks.synthetic import hand_pose
+from gesture_v3 import config
+from gesture_v3.core.system import SystemController
+
+def gesture_script(fps):
+    """
+    One cycle of a busy session: circling, clicks, scroll, a drag round trip and a hand drop-out.
+    :return: List of landmark lists (None = no hand)
+    """
+    out = []
+
+    def hold(seconds, pose, x=0.55, y=0.65, dx=0.0, dy=0.0):
+        n = max(1, int(seconds * fps))
+        for i in range(n):
+            a = i / n
+            out.append(hand_pose(x + dx * a, y + dy * a, pose) if pose else None)
+
+    n = int(3 * fps)
+    for i in range(n):
+        a = 2 * np.pi * i / n
+        out.append(hand_pose(0.55 + 0.12 * np.cos(a), 0.65 + 0.1 * np.sin(a), "MOVE"))
+    hold(0.3, "CLICK_LEFT")
+    hold(0.5, "MOVE")
+    hold(0.3, "CLICK_RIGHT")
+    hold(0.5, "MOVE")
+    hold(1.0, "SCROLL", dy=-0.15)
+    hold(0.5, "MOVE")
+    hold(0.3, "FIST")                    # Drag on
+    hold(1.2, "MOVE", dx=0.1)            # Cooldown passes while dragging
+    hold(0.3, "FIST")                    # Drag off
+    hold(1.0, None)                      # Hand lost
+    return out
+
+class _Result:
+    __slots__ = ("hand_landmarks",)
+
+    def __init__(self, hand_landmarks):
+        self.hand_landmarks = hand_landmarks
+
+class LoopingSource:
+    """
+    Camera (+ optionally tracker) stand-in that loops its input until the deadline.
+    Synthetic mode returns a capture-sized blank frame and the scripted landmarks;
+    video mode rewinds the file at EOF and leaves tracking to the real HandTracker.
+    fps <= 0 runs unpaced.
+    """
+    def __init__(self, duration, fps, script=None, video=None):
+        self.deadline = time.perf_counter() + duration
+        self.fps = fps
+        self.script = script
+        self.video = cv2.VideoCapture(video) if video else None
+        self.image = np.zeros((config.CAPTURE_HEIGHT, config.CAPTURE_WIDTH, 3), np.uint8)
+        self.index = -1
+        self.on_exhausted = None
+        self._t0 = None
+
+    def isOpened(self):
+        return self.video.isOpened() if self.video is not None else True
+
+    def read(self):
+        now = time.perf_counter()
+        if self._t0 is None:
+            self._t0 = now
+        if now >= self.deadline:
+            if self.on_exhausted is not None:
+                self.on_exhausted()
+            return False, None
+        if self.fps > 0:
+            wait = self._t0 + (self.index + 1) / self.fps - now
+            if wait > 0:
+                time.sleep(wait)
+        self.index += 1
+
+        if self.video is None:
+            return True, self.image
+        ok, frame = self.video.read()
+        if not ok:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.video.read()
+        return ok, frame
+
+    def release(self):
+        if self.video is not None:
+            self.video.release()
+
+    def process(self, image_rgb, timestamp_ms):
+        landmarks = self.script[self.index % len(self.script)]
+        return _Result([landmarks] if landmarks is not None else [])
+
+def _kb(n):
+    return n / 1024.0
+
+def print_report(report):
+    print(f"\nframes {report['frames']}  duration {report['duration_s']:.0f}s")
+    print(f"{'stage':<12}{'net KB/f':>10}{'churn KB/f':>12}{'churn max KB':>14}{'blocks/f':>10}")
+    for name, s in report["stages"].items():
+        print(f"{name:<12}{_kb(s['net_bytes_per_frame']):>10.2f}{_kb(s['transient_bytes_per_frame']):>12.1f}"
+              f"{_kb(s['transient_bytes_max']):>14.1f}{s['net_blocks_per_frame']:>10.2f}")
+
+    for key, label in (("rss_growth_bytes_per_hour", "RSS"), ("traced_growth_bytes_per_hour", "traced")):
+        slope = report[key]
+        print(f"{label} growth: " + (f"{slope / 2**20:+.2f} MB/h" if slope is not None else "n/a (too few snapshots)"))
+
+    for gen, s in report["gc"]["pauses"].items():
+        if s["count"]:
+            print(f"gc {gen}: {s['count']} pauses  p50 {s['p50_ms']:.2f} ms  p99 {s['p99_ms']:.2f} ms  max {s['max_ms']:.2f} ms")
+
+    if report["top_growth"]:
+        print("top growth since start:")
+        for g in report["top_growth"][:10]:
+            print(f"  {g['size_diff'] / 1024:+10.1f} KB {g['count_diff']:+8d} blocks  {g['where']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocation / memory-growth soak test (headless).")
+    parser.add_argument("--duration", type=float, default=600.0, help="Seconds to run")
+    parser.add_argument("--fps", type=float, default=30.0, help="Input rate; 0 runs as fast as possible")
+    parser.add_argument("--video", help="Replay this video through the real HandTracker instead of the synthetic script")
+    parser.add_argument("--snapshot-every", type=int, default=config.MEMPROF_SNAPSHOT_EVERY, help="Frames between tracemalloc snapshots")
+    parser.add_argument("--report", default="memprof_soak.json", help="JSON report path")
+    args = parser.parse_args()
+
+    config.MEMPROF_ENABLED = True
+    config.MEMPROF_SNAPSHOT_EVERY = args.snapshot_every
+    config.MEMPROF_PATH = args.report
+
+    if args.video:
+        source = LoopingSource(args.duration, args.fps, video=args.video)
+        controller = SystemController(cap=source, display=False)
+    else:
+        source = LoopingSource(args.duration, args.fps, script=gesture_script(args.fps if args.fps > 0 else 30.0))
+        controller = SystemController(cap=source, tracker=source, display=False)
+    source.on_exhausted = lambda: setattr(controller, "running", False)
+
+    controller.run()
+
+    with open(args.report) as f:
+        print_report(json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Headless stand-ins for OS input and display.
+install() must run before anything from gesture_v3 (or the v1 modules) is imported:
+gesture_v3.config queries pyautogui.size() at import time.
+"""
+import sys
+import time
+import types
+
+SCREEN_SIZE = (1920, 1080)
+
+class RecordingInput:
+    """
+    Fake pyautogui backend. Every emitted event is timestamped with
+    time.perf_counter() as (kind, t, payload).
+    """
+    def __init__(self, record=True):
+        self.record = record
+        self.events = []
+
+    def _emit(self, kind, payload=None):
+        if self.record:
+            self.events.append((kind, time.perf_counter(), payload))
+
+    def clear(self):
+        self.events.clear()
+
+    # --- pyautogui API subset used by the project ---
+    def size(self):
+        return SCREEN_SIZE
+
+    def move(self, x, y, *args, **kwargs):
+        self._emit("move", (x, y))
+
+    def moveTo(self, x, y, *args, **kwargs):
+        self._emit("moveTo", (x, y))
+
+    def click(self, *args, **kwargs):
+        self._emit("click")
+
+    def rightClick(self, *args, **kwargs):
+        self._emit("rightClick")
+
+    def mouseDown(self, *args, **kwargs):
+        self._emit("mouseDown")
+
+    def mouseUp(self, *args, **kwargs):
+        self._emit("mouseUp")
+
+    def scroll(self, clicks, *args, **kwargs):
+        self._emit("scroll", clicks)
+
+def install(record=False):
+    """
+    Register a fake 'pyautogui' module backed by a RecordingInput.
+    :return: The RecordingInput instance
+    """
+    backend = RecordingInput(record=record)
+    module = types.ModuleType("pyautogui")
+    for name in ("size", "move", "moveTo", "click", "rightClick", "mouseDown", "mouseUp", "scroll"):
+        setattr(module, name, getattr(backend, name))
+    module.FAILSAFE = False
+    module.FailSafeException = type("FailSafeException", (Exception,), {})
+    module.backend = backend
+    sys.modules["pyautogui"] = module
+    return backend
@@ -0,0 +1,67 @@
+"""
+Synthetic hand landmark streams (MediaPipe-like normalized landmarks).
+"""
+import math
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+# Open right palm, fingers up, offsets from the wrist (normalized image units)
+_OPEN_PALM = [
+    (0.0, 0.0),                                                           # 0 wrist
+    (-0.04, -0.02), (-0.07, -0.05), (-0.09, -0.08), (-0.11, -0.10),       # 1-4 thumb
+    (-0.03, -0.10), (-0.035, -0.15), (-0.037, -0.18), (-0.04, -0.21),     # 5-8 index
+    (0.0, -0.11), (0.0, -0.165), (0.0, -0.20), (0.0, -0.235),             # 9-12 middle
+    (0.025, -0.10), (0.028, -0.15), (0.03, -0.18), (0.032, -0.21),        # 13-16 ring
+    (0.05, -0.085), (0.055, -0.12), (0.058, -0.145), (0.06, -0.17),       # 17-20 pinky
+]
+
+FINGER_TIPS = {"index": 8, "middle": 12, "ring": 16, "pinky": 20}
+
+# Poses understood by hand_pose(); matches the V3 GestureClassifier states
+POSES = {
+    "MOVE": dict(curled=(), pinch=None),
+    "CLICK_LEFT": dict(curled=(), pinch="index"),
+    "CLICK_RIGHT": dict(curled=("index",), pinch="middle"), # Index folded away so it isn't the nearer pinch
+    "SCROLL": dict(curled=("ring", "pinky"), pinch=None),
+    "FIST": dict(curled=("index", "middle", "ring", "pinky"), pinch=None),
+}
+
+def hand_pose(cx, cy, pose="MOVE", scale=1.4):
+    """
+    Build 21 landmarks for a pose with the wrist at (cx, cy).
+    :return: List of Landmark
+    """
+    spec = POSES[pose]
+    pts = [[dx * scale, dy * scale] for dx, dy in _OPEN_PALM]
+
+    for finger in spec["curled"]:
+        tip = FINGER_TIPS[finger]
+        pip = pts[tip - 2]
+        # Fold DIP and tip back below the PIP joint
+        pts[tip - 1] = [pip[0], pip[1] + 0.015 * scale]
+        pts[tip] = [pip[0], pip[1] + 0.03 * scale]
+
+    if spec["pinch"] is not None:
+        tip = pts[FINGER_TIPS[spec["pinch"]]]
+        pts[4] = [tip[0] + 0.01 * scale, tip[1] + 0.01 * scale]
+
+    return [Landmark(cx + x, cy + y) for x, y in pts]
+
+def circle_trajectory(n, radius=0.15, center=(0.5, 0.6), pose="MOVE"):
+    """
+    n frames of an open hand moving on a circle.
+    :return: List of landmark lists
+    """
+    return [hand_pose(center[0] + radius * math.cos(2 * math.pi * i / n),
+                      center[1] + radius * math.sin(2 * math.pi * i / n), pose)
+            for i in range(n)]
+
+def landmark_list(landmarks, w=640, h=480):
+    """
+    v1 format: [[id, cx, cy], ...] in pixels.
+    """
+    return [[i, int(lm.x * w), int(lm.y * h)] for i, lm in enumerate(landmarks)]
@@ -36,6 +36,9 @@ DOUBLE_CLICK_DISTANCE = 40 # Max distance for pinch
 SCREEN_MARGIN = 0 # Full camera frame used for control
 FAILSAFE_FPS = 10 # Minimum FPS before pausing for safety
 
+# MouseController and GestureRecognizer read a frozen snapshot of this module
+# (gesture_v3/core/settings.py); pass a new one to apply_config() to retune them.
+
 # Visuals
 COLOR_HAND_POINTS = (0, 255, 0)
 COLOR_HAND_LINES = (0, 255, 0)
@@ -0,0 +1,222 @@
+"""
+Batch hand landmark extraction from recorded videos.
+
+Fans video files out over a process pool; each worker owns one MediaPipe
+HandLandmarker and streams one compact landmark recording (.lmk, see
+gesture_v3/perception/recording.py) per video into the output directory.
+
+    python extract_landmarks.py footage/ --out dataset/
+    python extract_landmarks.py footage/ --out dataset/ --workers 8 --stride 2
+    python extract_landmarks.py footage/ --out dataset/ --shard 0/4   # machine 1 of 4
+
+Finished recordings are skipped on re-run; interrupted ones (.lmk.part) resume
+from the last written frame. Shards are assigned by a stable hash of each
+file's path relative to its input root, so every machine agrees on the split.
+"""
+import argparse
+import os
+import sys
+import time
+import zlib
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+
+def find_videos(inputs):
+    """
+    :return: List of (absolute path, path relative to its input root)
+    """
+    videos = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        videos.append((os.path.abspath(path), os.path.relpath(path, item)))
+        elif os.path.isfile(item):
+            videos.append((os.path.abspath(item), os.path.basename(item)))
+        else:
+            print(f"[EXTRACT] Skipping {item}: not found")
+    return sorted(videos, key=lambda v: v[1])
+
+def in_shard(rel_path, index, count):
+    return zlib.crc32(rel_path.replace(os.sep, "/").encode("utf-8")) % count == index
+
+def output_path(out_dir, rel_path):
+    return os.path.join(out_dir, os.path.splitext(rel_path)[0] + ".lmk")
+
+# --- Worker process ---
+
+_tracker = None
+_tracker_used = False
+_init_error = None
+_options = None
+
+def _init_worker(options):
+    """
+    Pool initializer: one landmarker per worker process.
+    """
+    global _tracker, _options, _init_error
+    _options = options
+    # MediaPipe and OpenCV would otherwise each spin up a thread per core in every worker
+    cv2.setNumThreads(1)
+    try:
+        from gesture_v3.perception.tracker import HandTracker
+        _tracker = HandTracker(options["model"], mode=options["mode"])
+    except Exception as e:
+        # An initializer that raises makes Pool respawn workers forever: report it per job instead
+        _init_error = f"landmarker init failed: {e}"
+
+def _extract(job):
+    """
+    Extract one video into its recording.
+    :return: (relative path, frames processed, frames with a hand, seconds, error or None)
+    """
+    from gesture_v3.perception.recording import LandmarkRecordingWriter
+
+    global _tracker, _tracker_used
+    src, rel, dst = job
+    if _init_error:
+        return rel, 0, 0, 0.0, _init_error
+    start = time.time()
+    cap = cv2.VideoCapture(src)
+    if not cap.isOpened():
+        return rel, 0, 0, 0.0, "cannot open"
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    header = {
+        "source": rel,
+        "fps": fps,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        "stride": _options["stride"],
+        "mode": _options["mode"],
+    }
+    try:
+        writer = LandmarkRecordingWriter(dst, header, resume=not _options["force"])
+    except (ValueError, OSError):
+        # Unreadable leftover .part (e.g. torn header): start over
+        writer = LandmarkRecordingWriter(dst, header, resume=False)
+    first = writer.resume_frame()
+
+    if _options["mode"] == "video" and _tracker_used:
+        # VIDEO mode keeps tracking state and needs increasing timestamps: fresh landmarker per video
+        from gesture_v3.perception.tracker import HandTracker
+        _tracker.close()
+        _tracker = HandTracker(_options["model"], mode="video")
+    _tracker_used = True
+
+    frames = hands = 0
+    max_width = _options["max_width"]
+    try:
+        index = 0
+        # Exact seek for resume: decode-only grab() is much cheaper than inference
+        while index < first and cap.grab():
+            index += 1
+
+        while True:
+            if index % _options["stride"]:
+                if not cap.grab():
+                    break
+                index += 1
+                continue
+            ok, frame = cap.read()
+            if not ok:
+                break
+            t_ms = int(round(index * 1000.0 / fps))
+
+            if max_width and frame.shape[1] > max_width:
+                # Landmarks are normalized, so a smaller inference frame does not change their scale
+                scale = max_width / frame.shape[1]
+                frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = _tracker.process(rgb, t_ms)
+
+            if result.hand_landmarks:
+                handed = result.handedness[0][0] if result.handedness else None
+                writer.append(index, t_ms, result.hand_landmarks[0],
+                              handed.category_name if handed else None, handed.score if handed else 0.0)
+                hands += 1
+            else:
+                writer.append(index, t_ms)
+            frames += 1
+            index += 1
+    except Exception as e:
+        writer.abort()
+        cap.release()
+        return rel, frames, hands, time.time() - start, str(e)
+
+    writer.close()
+    cap.release()
+    return rel, frames, hands, time.time() - start, None
+
+# --- Driver ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from videos into .lmk recordings.")
+    parser.add_argument("inputs", nargs="+", help="Video files or directories (searched recursively)")
+    parser.add_argument("--out", required=True, help="Output directory (mirrors the input layout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--mode", choices=("video", "image"), default="video",
+                        help="video: temporal tracking per file; image: every frame independent")
+    parser.add_argument("--stride", type=int, default=1, help="Process every Nth frame")
+    parser.add_argument("--max-width", type=int, default=0, help="Downscale wider frames before inference (0 = off)")
+    parser.add_argument("--shard", default="0/1", help="i/n: only process shard i of n")
+    parser.add_argument("--model", default="hand_landmarker.task", help="MediaPipe hand landmarker model")
+    parser.add_argument("--force", action="store_true", help="Re-extract finished recordings")
+    args = parser.parse_args()
+
+    shard_index, shard_count = (int(v) for v in args.shard.split("/"))
+    if not 0 <= shard_index < shard_count:
+        parser.error("--shard must be i/n with 0 <= i < n")
+    if args.stride < 1:
+        parser.error("--stride must be >= 1")
+
+    jobs = []
+    skipped = 0
+    for src, rel in find_videos(args.inputs):
+        if not in_shard(rel, shard_index, shard_count):
+            continue
+        dst = output_path(args.out, rel)
+        if os.path.exists(dst) and not args.force:
+            skipped += 1
+            continue
+        jobs.append((src, rel, dst))
+
+    # Longest first so one big file does not become the tail of the run
+    jobs.sort(key=lambda j: os.path.getsize(j[0]), reverse=True)
+    print(f"[EXTRACT] {len(jobs)} videos to process ({skipped} already done), shard {args.shard}, {args.workers} workers")
+    if not jobs:
+        return
+
+    import multiprocessing
+    options = {"model": args.model, "mode": args.mode, "stride": args.stride, "max_width": args.max_width,
+               "force": args.force}
+    ctx = multiprocessing.get_context("spawn")
+    start = time.time()
+    total_frames = failures = 0
+    with ctx.Pool(min(args.workers, len(jobs)), initializer=_init_worker, initargs=(options,)) as pool:
+        for i, (rel, frames, hands, seconds, error) in enumerate(pool.imap_unordered(_extract, jobs), 1):
+            total_frames += frames
+            if error:
+                failures += 1
+                kept = "; partial output kept for resume" if frames else ""
+                print(f"[EXTRACT] {i}/{len(jobs)} {rel}: FAILED ({error}){kept}")
+            else:
+                print(f"[EXTRACT] {i}/{len(jobs)} {rel}: {frames} frames, {hands} with hand, "
+                      f"{frames / max(seconds, 1e-6):.0f} fps")
+
+    elapsed = time.time() - start
+    print(f"[EXTRACT] Done: {total_frames} frames in {elapsed:.0f}s ({total_frames / max(elapsed, 1e-6):.0f} fps total), "
+          f"{failures} failed")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
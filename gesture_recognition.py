@@ -1,13 +1,26 @@
 import math
 import config
+from gesture_v3.core.settings import default_snapshot
 
 class GestureRecognizer:
-    def __init__(self):
+    def __init__(self, cfg=None):
+        """
+        :param cfg: Config snapshot (default: config.py as written)
+        """
         self.tip_ids = [4, 8, 12, 16, 20] # Thumb, Index, Middle, Ring, Pinky
+        self.finger_tip_ids = self.tip_ids[1:]
+        self.apply_config(cfg or default_snapshot(config))
+
+    def apply_config(self, cfg):
+        """
+        Bind thresholds from a config snapshot (between frames only).
+        """
+        self.click_threshold = cfg.CLICK_DISTANCE_THRESHOLD
     
     def detect_gesture(self, lm_list):
         """
         Analyzes the landmark list to determine the current gesture.
+        lm_list: [[id, x, y], ...] from HandTracker.get_landmark_list
         Returns:
             gesture_name (str): "MOVE", "CLICK", "PAUSE", "NEUTRAL"
             info (dict): Additional info like distance or finger status
@@ -16,26 +29,9 @@ class GestureRecognizer:
             return "NEUTRAL", {}
 
         # 1. Determine which fingers are up
-        fingers = []
-        
-        # Thumb (check x for left/right decision, but for simplicity here check relative to knuckle)
-        # Using a simpler heuristic for general hand orientation:
-        # Check if tip is to the left or right of knuckle might depend on hand (left/right).
-        # For V1, assuming right hand or general "outwards" extension. 
-        # Better: check x-coordinate relative to IP joint (id 3)
-        if lm_list[self.tip_ids[0]][1] > lm_list[self.tip_ids[0] - 1][1]: # Assuming right hand facing camera? 
-                                                                           # Actually, simpler is checking x for thumb.
-                                                                           # Let's stick to standard vertical check for others, 
-                                                                           # and a distance check for thumb-index click.
-            # fingers.append(1) 
-            pass # Thumb logic is complex due to rotation, will use distance for CLICK anyway.
-
-        # 4 Fingers
-        for id in range(1, 5):
-            if lm_list[self.tip_ids[id]][2] < lm_list[self.tip_ids[id] - 2][2]: # y-coordinate (up is lower value in pixels)
-                fingers.append(1)
-            else:
-                fingers.append(0)
+        # Thumb is skipped (its rotation makes up/down unreliable); pinch distance is used for CLICK instead.
+        # 4 Fingers: tip above PIP joint (up is lower value in pixels)
+        fingers = [1 if lm_list[tip][2] < lm_list[tip - 2][2] else 0 for tip in self.finger_tip_ids]
         
         # Fingers array now has [Index, Middle, Ring, Pinky] status (1=Up, 0=Down)
         
@@ -55,11 +51,11 @@ class GestureRecognizer:
         # --- PRIORITY GESTURES (Clicks) ---
 
         # LEFT CLICK: Pinch Thumb + Index (Primary interaction)
-        if dist_idx < config.CLICK_DISTANCE_THRESHOLD:
+        if dist_idx < self.click_threshold:
              return "CLICK", {"distance": dist_idx}
 
         # RIGHT CLICK: Pinch Thumb + Middle
-        if dist_mid < config.CLICK_DISTANCE_THRESHOLD:
+        if dist_mid < self.click_threshold:
              return "RIGHT_CLICK", {"distance": dist_mid}
 
         # --- STATE GESTURES ---
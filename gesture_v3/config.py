@@ -10,6 +10,37 @@ APP_NAME = "J.A.R.V.I.S Gesture Interface"
 WINDOW_WIDTH, WINDOW_HEIGHT = pyautogui.size()
 TARGET_FPS = 60
 
+# Capture (tracking input) and preview window are sized independently.
+# The HUD is drawn on the downscaled preview; the captured frame is never touched.
+CAPTURE_WIDTH, CAPTURE_HEIGHT = 1280, 720
+DISPLAY_WIDTH, DISPLAY_HEIGHT = 640, 360
+
+# Live tuning: JSON {"NAME": value, ...} applied over this module and re-read while running.
+# Only the stage tuning below can be overridden; it takes effect on the next frame.
+# Structural settings (capture, tracker, profiling, presence, ...) are read once at startup
+# straight from this module, so the override file warns about and skips them.
+CONFIG_OVERRIDES_PATH = "config_overrides.json"
+CONFIG_WATCH_INTERVAL = 1.0  # Seconds between override file checks
+_LIVE = (
+    "ONE_EURO_MIN_CUTOFF", "ONE_EURO_BETA",                            # Smoothing
+    "PINCH_THRESHOLD_NORM", "CONFIDENCE_GROWTH", "CONFIDENCE_DECAY",  # Classifier
+    "DEAD_ZONE", "DELTA_SMOOTHING", "BASE_SENSITIVITY",               # Cursor
+    "ACCELERATION_FACTOR", "MAX_SENSITIVITY",
+    "CLICK_COOLDOWN", "DRAG_TOGGLE_COOLDOWN", "SCROLL_SPEED",         # Actions
+)
+
+# Model warm-up: dummy inferences in the background until latency is steady; control starts after
+WARMUP_ENABLED = True
+WARMUP_MIN_FRAMES = 5           # Inferences always run
+WARMUP_MAX_FRAMES = 30          # Stop waiting for steady latency after this many
+WARMUP_STEADY_RATIO = 1.25      # Last three latencies within this factor of each other = steady
+
+# Tracker worker process: MediaPipe runs outside this process, fed through a shared-memory frame ring
+TRACKER_PROCESS = False            # Off = in-process HandTracker
+TRACKER_PROCESS_SLOTS = 3          # Shared frame slots (in flight + being written)
+TRACKER_PROCESS_PIPELINED = False  # Overlap capture with inference; landmarks are one frame older
+TRACKER_PROCESS_TIMEOUT = 0.5      # Seconds to wait for a frame's landmarks before moving on
+
 # --- PERCEPTION (OneEuroFilter) ---
 # Low-jitter smoothing parameters
 ONE_EURO_MIN_CUTOFF = 1.2   # Increased for better static precision (less drift)
@@ -45,6 +76,23 @@ SCROLL_DEADZONE = 0.05
 DRAG_TOGGLE_COOLDOWN = 1.0 # Prevent double-toggle
 COLOR_DRAG_ACTIVE = (0, 255, 0) # Green (Locked)
 
+# Macros: gesture -> action chains (hotkeys, typing, launching apps), run off the frame loop
+MACROS_PATH = "macros.json"     # JSON list of bindings; missing file = no macros
+MACRO_ACTION_TIMEOUT = 5.0      # Seconds per action step unless the step sets "timeout"
+MACRO_QUEUE_SIZE = 8            # Chains allowed to wait behind the running one
+
+# Event bus: gesture states, edges and anchor positions for local tools (UNIX domain socket)
+EVENT_BUS_ENABLED = False
+EVENT_BUS_PATH = "/tmp/jarvis_gestures.sock"
+EVENT_BUS_MAX_BACKLOG = 65536   # Unsent bytes per subscriber before it is dropped
+EVENT_BUS_MAX_SUBSCRIBERS = 8
+
+# Remote mode: tracking box streams quantized landmarks over UDP (stream_landmarks.py -> main_v3.py --remote)
+REMOTE_HOST = "127.0.0.1"       # Sender: control machine address
+REMOTE_BIND = "127.0.0.1"       # Receiver: listen address (set the LAN address to accept a remote tracker)
+REMOTE_PORT = 50555
+REMOTE_HAND_TIMEOUT = 0.25      # Seconds without a packet before the hand counts as lost
+
 # --- UI COLORS (BGR) ---
 COLOR_IDLE = (255, 255, 0)      # Cyan
 COLOR_MOVE = (255, 255, 255)    # White (Open Palm)
@@ -53,5 +101,57 @@ COLOR_RIGHT_CLICK = (255, 0, 0) # Blue
 COLOR_SCROLL = (255, 0, 255)    # Magenta
 COLOR_TEXT = (255, 255, 255)
 
+# --- HUD RENDERING ---
+HUD_THREADED = True  # Draw the HUD on a background thread (imshow stays on the main thread)
+HUD_MAX_FPS = 30     # Preview refresh cap (Hz); the control loop is not capped
+
 # --- SAFETY ---
-FAILSAFE_FPS = 15  # Minimum FPS to maintain active control
+FAILSAFE_FPS = 15  # Minimum FPS to maintain active control (frame budget = 1 / FAILSAFE_FPS)
+
+# Frame health monitor (degrades NORMAL -> NO_HUD -> LOW_RES -> FRAME_SKIP -> PAUSED)
+HEALTH_WINDOW = 90              # Frame-cost samples kept for the p95
+HEALTH_EWMA_ALPHA = 0.1         # Weight of the newest sample in the moving average
+HEALTH_WARMUP = 2.0             # Seconds after start before any tier change
+HEALTH_DEGRADE_HOLD = 1.0       # Seconds of sustained overload before stepping down
+HEALTH_RECOVER_HOLD = 3.0       # Seconds of sustained headroom before stepping back up
+HEALTH_RECOVER_HOLD_MAX = 30.0  # Recover hold doubles (up to this) when recoveries flap
+HEALTH_RECOVER_RATIO = 0.7      # Recover only below budget * ratio (hysteresis band)
+HEALTH_SPIKE_RATIO = 2.0        # p95 above budget * ratio is overload even with a good mean
+HEALTH_LOW_RES_SCALE = 0.5      # Tracker input scale in LOW_RES and below
+HEALTH_SKIP_FACTOR = 2          # Process 1 of every N frames in FRAME_SKIP and PAUSED
+
+# --- PROFILING ---
+PERF_STATS = False                  # Per-stage latency histograms (p50/p95/p99)
+PERF_HUD = False                    # Show the stage latency panel in the preview
+PERF_JSON_PATH = "perf_stats.json"  # Written on exit and on SIGUSR1
+TRACE_ENABLED = False               # Per-frame span timeline (Chrome trace-event JSON)
+TRACE_PATH = "trace.json"           # Written on exit and on SIGUSR2
+TRACE_CAPACITY = 200000             # Ring buffer size (spans); oldest are overwritten
+MEMPROF_ENABLED = False             # tracemalloc allocation / growth profiling (slows every allocation)
+MEMPROF_SNAPSHOT_EVERY = 600        # Frames between tracemalloc snapshots
+MEMPROF_TOP = 15                    # Growing source lines kept per snapshot
+MEMPROF_PATH = "memprof.json"       # Written on exit
+
+# --- MOTION GATE (cheap change detection before expensive detectors) ---
+MOTION_THUMB_SIZE = (64, 36)    # Thumbnail (w, h) used for frame differencing
+MOTION_PIXEL_DELTA = 18         # Grey-level change counted as "changed"
+MOTION_AREA_FRACTION = 0.02     # Fraction of thumbnail pixels that must change
+
+# --- IDLE (power saving while no hand is visible; woken by the motion gate) ---
+IDLE_AFTER = 10.0               # Seconds without a hand before idling (0 = never idle)
+IDLE_FPS = 5                    # Capture / loop rate while idle
+IDLE_CAPTURE_SIZE = (320, 180)  # Camera resolution while idle (None = keep CAPTURE_WIDTH x CAPTURE_HEIGHT)
+IDLE_SETTLE_FRAMES = 2          # Idle frames ignored for motion after switching (camera re-exposes)
+
+# --- LOGIN (face unlock) ---
+LOGIN_HEARTBEAT_MIN = 0.5       # Seconds between checks on a static scene (initial)
+LOGIN_HEARTBEAT_MAX = 8.0       # Idle backoff ceiling
+FACE_WORKER_TIMEOUT = 10.0      # Seconds before an unanswered face check is dropped
+
+# --- PRESENCE (continuous face verification while in control) ---
+PRESENCE_CHECK = False          # Re-verify the enrolled face in the background
+PRESENCE_MIN_INTERVAL = 1.0     # Seconds between checks while unverified
+PRESENCE_MAX_INTERVAL = 2.0     # Backoff ceiling while the user keeps verifying (capped at timeout - allowance)
+PRESENCE_ABSENT_TIMEOUT = 4.0   # Pause control this long after the last verified check
+PRESENCE_CHECK_ALLOWANCE = 1.5  # Time a low-priority check may take to answer
+PRESENCE_SCALE = 0.25           # Downscale factor for check frames
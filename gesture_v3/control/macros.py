@@ -0,0 +1,361 @@
+import collections
+import json
+import os
+import shlex
+import subprocess
+import threading
+import time
+from gesture_v3 import config
+from gesture_v3.intent.states import NO_HAND
+
+MODES = ("queue", "restart", "ignore")
+
+class MacroTimeout(Exception):
+    pass
+
+class MacroCancelled(Exception):
+    pass
+
+def _pyautogui():
+    import pyautogui
+    return pyautogui
+
+def _command(step):
+    command = step["command"]
+    return shlex.split(command) if isinstance(command, str) else list(command)
+
+def _sleep(cancel, seconds, deadline):
+    """
+    Sleep that ends early on cancel and fails past the step deadline.
+    """
+    remaining = deadline - time.perf_counter()
+    if cancel.wait(min(seconds, max(0.0, remaining))):
+        raise MacroCancelled()
+    if seconds > remaining:
+        raise MacroTimeout()
+
+def _do_hotkey(step, cancel, deadline):
+    _pyautogui().hotkey(*step["keys"], _pause=False)
+
+def _do_press(step, cancel, deadline):
+    pyautogui = _pyautogui()
+    for i in range(int(step.get("presses", 1))):
+        if i:
+            _sleep(cancel, float(step.get("interval", 0.05)), deadline)
+        pyautogui.press(step["key"], _pause=False)
+
+def _do_type(step, cancel, deadline):
+    pyautogui = _pyautogui()
+    interval = float(step.get("interval", 0.0))
+    # One character at a time so long text stays cancellable
+    for ch in step["text"]:
+        if cancel.is_set():
+            raise MacroCancelled()
+        if time.perf_counter() > deadline:
+            raise MacroTimeout()
+        pyautogui.write(ch, _pause=False)
+        if interval:
+            _sleep(cancel, interval, deadline)
+
+def _do_click(step, cancel, deadline):
+    _pyautogui().click(button=step.get("button", "left"), clicks=int(step.get("clicks", 1)), _pause=False)
+
+def _do_scroll(step, cancel, deadline):
+    _pyautogui().scroll(int(step["amount"]), _pause=False)
+
+def _do_wait(step, cancel, deadline):
+    _sleep(cancel, float(step["seconds"]), deadline)
+
+def _do_launch(step, cancel, deadline):
+    # Detached: the app outlives the step (and us)
+    subprocess.Popen(_command(step), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+def _do_run(step, cancel, deadline):
+    proc = subprocess.Popen(_command(step), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+    try:
+        while proc.poll() is None:
+            if cancel.wait(0.02):
+                raise MacroCancelled()
+            if time.perf_counter() > deadline:
+                raise MacroTimeout()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    if proc.returncode:
+        raise RuntimeError(f"exit code {proc.returncode}")
+
+# "do" -> (handler, required keys)
+ACTIONS = {
+    "hotkey": (_do_hotkey, ("keys",)),
+    "press": (_do_press, ("key",)),
+    "type": (_do_type, ("text",)),
+    "click": (_do_click, ()),
+    "scroll": (_do_scroll, ("amount",)),
+    "wait": (_do_wait, ("seconds",)),
+    "launch": (_do_launch, ("command",)),
+    "run": (_do_run, ("command",)),
+}
+
+# Optional numeric step keys -> (int only, minimum, exclusive minimum)
+STEP_NUMBERS = {
+    "timeout": (False, 0.0, True),
+    "seconds": (False, 0.0, False),
+    "interval": (False, 0.0, False),
+    "amount": (True, None, False),
+    "presses": (True, 1, False),
+    "clicks": (True, 1, False),
+}
+
+class _Job:
+    __slots__ = ("name", "actions", "cancel")
+
+    def __init__(self, name, actions):
+        self.name = name
+        self.actions = actions
+        self.cancel = threading.Event()
+
+class ActionExecutor:
+    """
+    Runs action chains on a background thread so they never touch the frame loop.
+    Chains run one at a time in submission order (keystrokes from two macros must not
+    interleave); up to max_pending wait behind the running one.
+    Each step gets its own timeout. Timeouts and cancellation are checked between
+    steps and inside every step that can take time (waits, typing, child processes,
+    which are killed), so a cancelled or stuck chain stops within a few milliseconds.
+    A single input call (one hotkey, one click) is never interrupted.
+    """
+    def __init__(self, max_pending=config.MACRO_QUEUE_SIZE, default_timeout=config.MACRO_ACTION_TIMEOUT):
+        """
+        :param max_pending: Chains allowed to wait; further submissions are dropped
+        :param default_timeout: Seconds per step unless the step sets "timeout"
+        """
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self._pending = collections.deque()
+        self._current = None
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="ActionExecutor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cancel_locked(None)
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def submit(self, name, actions, mode="queue"):
+        """
+        Called from the control loop. Never blocks on the chain itself.
+        :param name: Chain name (used for cancellation and logging)
+        :param actions: List of validated action steps
+        :param mode: "queue" (always add), "restart" (cancel this chain's running/waiting
+                     copies first) or "ignore" (drop if a copy is running or waiting)
+        :return: True if the chain was queued
+        """
+        with self._cond:
+            if mode == "ignore" and self._busy_locked(name):
+                return False
+            if mode == "restart":
+                self._cancel_locked(name)
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                print(f"[MACRO] Queue full, dropped {name}")
+                return False
+            self._pending.append(_Job(name, actions))
+            self._cond.notify()
+            return True
+
+    def cancel(self, name=None):
+        """
+        Cancel the running chain and drop waiting ones (only those called name, if given).
+        """
+        with self._cond:
+            self._cancel_locked(name)
+
+    def _busy_locked(self, name):
+        return (self._current is not None and self._current.name == name) or any(j.name == name for j in self._pending)
+
+    def _cancel_locked(self, name):
+        if self._pending:
+            self._pending = collections.deque(j for j in self._pending if name is not None and j.name != name)
+        if self._current is not None and (name is None or self._current.name == name):
+            self._current.cancel.set()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                job = self._current = self._pending.popleft()
+            try:
+                self._run(job)
+            finally:
+                with self._cond:
+                    self._current = None
+
+    def _run(self, job):
+        for i, step in enumerate(job.actions):
+            if job.cancel.is_set():
+                return
+            timeout = self.default_timeout
+            try:
+                timeout = float(step.get("timeout", self.default_timeout))
+                ACTIONS[step["do"]][0](step, job.cancel, time.perf_counter() + timeout)
+            except MacroCancelled:
+                return
+            except MacroTimeout:
+                print(f"[MACRO] {job.name}: step {i + 1} ({step['do']}) timed out after {timeout:.1f}s, chain stopped")
+                self.failed += 1
+                return
+            except Exception as e:
+                print(f"[MACRO] {job.name}: step {i + 1} ({step['do']}) failed: {e}")
+                self.failed += 1
+                return
+        self.completed += 1
+
+def validate_binding(raw, index):
+    """
+    Normalize one binding from the macro file.
+    :raises ValueError: Malformed binding
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get("on"), str):
+        raise ValueError(f"binding {index}: needs an \"on\" gesture state")
+    name = raw.get("name", f"{raw['on']}#{index}")
+    hold = raw.get("hold", 0.0)
+    if not isinstance(hold, (int, float)) or hold < 0:
+        raise ValueError(f"{name}: hold must be seconds >= 0")
+    mode = raw.get("mode", "queue")
+    if mode not in MODES:
+        raise ValueError(f"{name}: mode must be one of {', '.join(MODES)}")
+    actions = raw.get("actions")
+    if not isinstance(actions, list) or not actions:
+        raise ValueError(f"{name}: needs a non-empty \"actions\" list")
+    for i, step in enumerate(actions):
+        if not isinstance(step, dict) or step.get("do") not in ACTIONS:
+            raise ValueError(f"{name}: step {i + 1} must have \"do\" in {', '.join(ACTIONS)}")
+        missing = [k for k in ACTIONS[step["do"]][1] if k not in step]
+        if missing:
+            raise ValueError(f"{name}: step {i + 1} ({step['do']}) is missing {', '.join(missing)}")
+        for key, (integer, minimum, exclusive) in STEP_NUMBERS.items():
+            if key not in step:
+                continue
+            value = step[key]
+            kind = "an integer" if integer else "a number"
+            if isinstance(value, bool) or not isinstance(value, int if integer else (int, float)):
+                raise ValueError(f"{name}: step {i + 1} ({step['do']}) {key} must be {kind}")
+            if minimum is not None and (value <= minimum if exclusive else value < minimum):
+                raise ValueError(f"{name}: step {i + 1} ({step['do']}) {key} must be {'>' if exclusive else '>='} {minimum}")
+    return {"name": name, "on": raw["on"], "hold": float(hold), "mode": mode, "actions": actions}
+
+class MacroEngine:
+    """
+    Maps gesture events to action chains.
+    Bindings come from a JSON list (MACROS_PATH):
+        [{"on": "SCROLL", "hold": 1.5, "mode": "ignore",
+          "actions": [{"do": "hotkey", "keys": ["alt", "tab"]}]}, ...]
+    "on" is a classifier state (or NO_HAND); a binding fires once when that state is
+    entered (hold = 0) or once it has been held for hold seconds. Chains run on an
+    ActionExecutor; update() itself only compares states, so it is safe per frame.
+    The built-in cursor actions (move, click, drag, scroll) stay in the control loop.
+    """
+    def __init__(self, bindings=(), executor=None):
+        """
+        :param bindings: Validated bindings (see validate_binding())
+        :param executor: ActionExecutor (default: one with the MACRO_* settings)
+        """
+        self.executor = executor if executor is not None else ActionExecutor()
+        self.by_state = {}
+        for binding in bindings:
+            self.by_state.setdefault(binding["on"], []).append(binding)
+        self.state = None
+        self._since = 0.0
+        self._waiting = [] # Hold bindings of the current state that have not fired yet
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read bindings from a JSON file. A missing file means no macros;
+        malformed bindings are reported and skipped.
+        """
+        bindings = []
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    raw = json.load(f)
+                if not isinstance(raw, list):
+                    raise ValueError("macro file must contain a JSON list of bindings")
+            except (OSError, ValueError) as e:
+                print(f"[MACRO] Ignoring {path}: {e}")
+                raw = []
+            for i, item in enumerate(raw):
+                try:
+                    bindings.append(validate_binding(item, i))
+                except ValueError as e:
+                    print(f"[MACRO] Skipping {e}")
+            if bindings:
+                print(f"[MACRO] {len(bindings)} bindings loaded from {path}")
+        return cls(bindings)
+
+    @property
+    def enabled(self):
+        return bool(self.by_state)
+
+    def start(self):
+        if self.enabled:
+            self.executor.start()
+
+    def stop(self):
+        self.executor.stop()
+
+    def cancel(self):
+        """
+        Cancel everything (control is being suspended).
+        """
+        if self.enabled:
+            self.executor.cancel()
+        self.state = None
+        self._waiting = []
+
+    def update(self, now, state):
+        """
+        Called once per tracked frame.
+        :param now: Current time
+        :param state: Classifier state, or NO_HAND
+        """
+        if not self.by_state:
+            return
+        if state != self.state:
+            self.state = state
+            self._since = now
+            self._waiting = []
+            for binding in self.by_state.get(state, ()):
+                if binding["hold"] > 0:
+                    self._waiting.append(binding)
+                else:
+                    self._fire(binding)
+        elif self._waiting:
+            held = now - self._since
+            for binding in [b for b in self._waiting if held >= b["hold"]]:
+                self._waiting.remove(binding)
+                self._fire(binding)
+
+    def _fire(self, binding):
+        self.executor.submit(binding["name"], binding["actions"], binding["mode"])
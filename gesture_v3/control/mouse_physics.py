@@ -3,6 +3,7 @@ import math
 import pyautogui
 import numpy as np
 from gesture_v3 import config
+from gesture_v3.core.settings import default_snapshot
 
 pyautogui.FAILSAFE = False 
 
@@ -12,11 +13,27 @@ class PhysicsCursor:
     Input: Relative Delta (dx, dy)
     Output: Relative Mouse Movement
     """
-    def __init__(self):
+    def __init__(self, cfg=None):
+        """
+        :param cfg: Config snapshot (default: gesture_v3.config as written)
+        """
         self.prev_dx = 0.0
         self.prev_dy = 0.0
         self.remainder_x = 0.0
         self.remainder_y = 0.0
+        self.apply_config(cfg or default_snapshot(config))
+
+    def apply_config(self, cfg):
+        """
+        Bind tuning values from a config snapshot (between frames only).
+        """
+        self.dead_zone = cfg.DEAD_ZONE
+        self.alpha = 1.0 - cfg.DELTA_SMOOTHING
+        self.base_sensitivity = cfg.BASE_SENSITIVITY
+        self.acceleration = cfg.ACCELERATION_FACTOR
+        self.max_sensitivity = cfg.MAX_SENSITIVITY
+        self.screen_w = cfg.WINDOW_WIDTH
+        self.screen_h = cfg.WINDOW_HEIGHT
 
     def update_relative(self, dx, dy, dt):
         """
@@ -24,11 +41,11 @@ class PhysicsCursor:
         """
         # 1. Dead Zone
         mag = math.hypot(dx, dy)
-        if mag < config.DEAD_ZONE:
+        if mag < self.dead_zone:
             return 
             
         # 2. Smoothing
-        alpha = 1.0 - config.DELTA_SMOOTHING
+        alpha = self.alpha
         dx = alpha * dx + (1.0 - alpha) * self.prev_dx
         dy = alpha * dy + (1.0 - alpha) * self.prev_dy
         
@@ -37,11 +54,11 @@ class PhysicsCursor:
         
         # 3. Acceleration
         # Using a squared factor for much more aggressive "flick" speed
-        gain = config.BASE_SENSITIVITY * (1.0 + (config.ACCELERATION_FACTOR * mag) ** 2)
-        gain = min(gain, config.MAX_SENSITIVITY)
+        gain = self.base_sensitivity * (1.0 + (self.acceleration * mag) ** 2)
+        gain = min(gain, self.max_sensitivity)
         
-        move_x = dx * config.WINDOW_WIDTH * gain
-        move_y = dy * config.WINDOW_HEIGHT * gain
+        move_x = dx * self.screen_w * gain
+        move_y = dy * self.screen_h * gain
         
         # Accumulate
         self.remainder_x += move_x
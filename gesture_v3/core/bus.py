@@ -0,0 +1,244 @@
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import time
+from gesture_v3 import config
+from gesture_v3.intent.states import NO_HAND
+
+# Wire format: every message is  u8 type | u16 payload length | payload  (little endian)
+HEADER = struct.Struct("<BH")
+
+MSG_HELLO = 0 # JSON: {"version", "states"} (sent once on connect)
+MSG_FRAME = 1 # Once per processed frame
+MSG_EDGE = 2  # State transition
+
+# t_us (wall clock) | state | flags | confidence | anchor x, y | anchor dx, dy  (normalized, filtered)
+FRAME = struct.Struct("<qBBfffff")
+# t_us | previous state | new state
+EDGE = struct.Struct("<qBB")
+
+FLAG_HAND = 1
+
+# State codes (index); anything else is sent as 255
+STATES = (NO_HAND, "PAUSED", "IDLE", "MOVE", "CLICK_LEFT", "CLICK_RIGHT", "SCROLL", "FIST", "DRAG_ACTIVE")
+UNKNOWN_STATE = 255
+_CODES = {name: i for i, name in enumerate(STATES)}
+
+class _Subscriber:
+    __slots__ = ("sock", "backlog")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.backlog = b""
+
+class EventBus:
+    """
+    Local publisher of gesture events over a UNIX domain stream socket.
+    Runs inside the control loop without a thread: publish() only packs fixed-size
+    records into a batch, and flush() (once per frame) accepts new subscribers and
+    hands the whole batch to each of them with one non-blocking send.
+    A subscriber that cannot keep up accumulates a backlog; past max_backlog bytes
+    it is disconnected, so a stuck consumer can never stall the loop.
+    """
+    def __init__(self, path=config.EVENT_BUS_PATH, max_backlog=config.EVENT_BUS_MAX_BACKLOG,
+                 max_subscribers=config.EVENT_BUS_MAX_SUBSCRIBERS):
+        """
+        :param path: Socket path (a stale socket there is replaced; any other file is left alone)
+        :param max_backlog: Unsent bytes allowed per subscriber before it is dropped
+        :param max_subscribers: Connections beyond this are refused
+        """
+        self.path = path
+        self.max_backlog = max_backlog
+        self.max_subscribers = max_subscribers
+        self.subscribers = []
+        self.dropped = 0
+        self._server = None
+        self._batch = bytearray()
+        self._state = NO_HAND
+        body = json.dumps({"version": 1, "states": list(STATES)}).encode("utf-8")
+        self._hello = HEADER.pack(MSG_HELLO, len(body)) + body
+
+    def start(self):
+        """
+        :return: False if UNIX sockets are unavailable or the path cannot be bound
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            print("[BUS] UNIX domain sockets are not available on this platform; event bus disabled.")
+            return False
+        server = None
+        try:
+            try:
+                mode = os.lstat(self.path).st_mode
+            except FileNotFoundError:
+                pass
+            else:
+                if not stat.S_ISSOCK(mode):
+                    print(f"[BUS] {self.path} exists and is not a socket; event bus disabled.")
+                    return False
+                os.unlink(self.path) # Left over from a previous run
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Created 0600 from the start (same-user consumers only), with no window for others to connect
+            old_umask = os.umask(0o177)
+            try:
+                server.bind(self.path)
+            finally:
+                os.umask(old_umask)
+            server.listen(self.max_subscribers)
+            server.setblocking(False)
+        except OSError as e:
+            print(f"[BUS] Cannot listen on {self.path}: {e}")
+            if server is not None:
+                server.close()
+            return False
+        self._server = server
+        print(f"[BUS] Publishing gesture events on {self.path}")
+        return True
+
+    def stop(self):
+        for sub in self.subscribers:
+            sub.sock.close()
+        self.subscribers = []
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def publish(self, now, state, confidence=0.0, anchor=None, delta=(0.0, 0.0)):
+        """
+        Queue this frame's record (and an edge record if the state changed).
+        :param now: Frame time (time.time())
+        :param state: Gesture state shown to the user (classifier state, DRAG_ACTIVE, NO_HAND, PAUSED)
+        :param confidence: Gesture confidence (0-1)
+        :param anchor: Filtered (x, y) of the movement anchor, or None without a hand
+        :param delta: Filtered anchor movement since the previous frame
+        """
+        t_us = int(now * 1e6)
+        code = _CODES.get(state, UNKNOWN_STATE)
+        batch = self._batch
+        if state != self._state:
+            batch += HEADER.pack(MSG_EDGE, EDGE.size)
+            batch += EDGE.pack(t_us, _CODES.get(self._state, UNKNOWN_STATE), code)
+            self._state = state
+        x, y = anchor if anchor is not None else (0.0, 0.0)
+        batch += HEADER.pack(MSG_FRAME, FRAME.size)
+        batch += FRAME.pack(t_us, code, FLAG_HAND if anchor is not None else 0, confidence, x, y, delta[0], delta[1])
+
+    def flush(self):
+        """
+        Accept waiting subscribers and send the queued batch. Never blocks.
+        """
+        if self._server is None:
+            self._batch.clear()
+            return
+        self._accept()
+        if not self._batch:
+            return
+        data = bytes(self._batch)
+        self._batch.clear()
+        for sub in list(self.subscribers):
+            self._send(sub, data)
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if len(self.subscribers) >= self.max_subscribers:
+                sock.close()
+                continue
+            sock.setblocking(False)
+            sub = _Subscriber(sock)
+            self.subscribers.append(sub)
+            self._send(sub, self._hello)
+
+    def _send(self, sub, data):
+        if sub.backlog:
+            data = sub.backlog + data
+        try:
+            sent = sub.sock.send(data)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError: # Subscriber went away
+            self._drop(sub, None)
+            return
+        sub.backlog = data[sent:]
+        if len(sub.backlog) > self.max_backlog:
+            self._drop(sub, f"{len(sub.backlog)} bytes behind")
+
+    def _drop(self, sub, reason):
+        self.subscribers.remove(sub)
+        sub.sock.close()
+        if reason:
+            self.dropped += 1
+            print(f"[BUS] Dropped slow subscriber ({reason})")
+
+def decode(buffer):
+    """
+    Split a received byte stream into messages.
+    :param buffer: bytes / bytearray received so far
+    :return: (list of (type, fields), unconsumed tail)
+        fields: HELLO -> dict, FRAME -> FRAME tuple, EDGE -> EDGE tuple, unknown types -> raw bytes
+    """
+    messages = []
+    offset = 0
+    view = memoryview(buffer)
+    while len(buffer) - offset >= HEADER.size:
+        kind, length = HEADER.unpack_from(buffer, offset)
+        end = offset + HEADER.size + length
+        if end > len(buffer):
+            break
+        payload = view[offset + HEADER.size:end]
+        if kind == MSG_FRAME:
+            messages.append((kind, FRAME.unpack(payload)))
+        elif kind == MSG_EDGE:
+            messages.append((kind, EDGE.unpack(payload)))
+        elif kind == MSG_HELLO:
+            messages.append((kind, json.loads(bytes(payload).decode("utf-8"))))
+        else:
+            messages.append((kind, bytes(payload)))
+        offset = end
+    tail = bytes(view[offset:])
+    view.release()
+    return messages, tail
+
+def subscribe(path=config.EVENT_BUS_PATH):
+    """
+    Minimal blocking consumer.
+    Yields (type, fields) as decoded by decode(); state codes index the HELLO "states" list.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    tail = b""
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            messages, tail = decode(tail + chunk)
+            yield from messages
+    finally:
+        sock.close()
+
+if __name__ == "__main__":
+    # Print events from a running instance:  python -m gesture_v3.core.bus [socket path]
+    states = STATES
+    name = lambda code: states[code] if code < len(states) else "?"
+    for kind, fields in subscribe(sys.argv[1] if len(sys.argv) > 1 else config.EVENT_BUS_PATH):
+        if kind == MSG_HELLO:
+            states = fields["states"]
+            continue
+        lag_ms = (time.time() - fields[0] / 1e6) * 1000
+        if kind == MSG_EDGE:
+            print(f"EDGE  {name(fields[1])} -> {name(fields[2])}  ({lag_ms:.2f} ms)")
+        elif kind == MSG_FRAME:
+            print(f"FRAME {name(fields[1]):<12} conf {fields[3]:.2f} "
+                  f"anchor ({fields[4]:.3f}, {fields[5]:.3f})  ({lag_ms:.2f} ms)")
@@ -0,0 +1,171 @@
+from gesture_v3 import config
+
+class FrameHealthMonitor:
+    """
+    Rolling frame-cost monitor that picks a degradation tier for the control loop.
+    Tiers (in order of severity):
+        NORMAL     - full pipeline
+        NO_HUD     - preview shows the raw frame only
+        LOW_RES    - tracker runs on a downscaled frame
+        FRAME_SKIP - only every HEALTH_SKIP_FACTOR-th frame is processed
+        PAUSED     - control is suspended (still skipping, so recovery can be measured)
+    The monitor steps one tier down after HEALTH_DEGRADE_HOLD seconds of sustained
+    overload and one tier up after HEALTH_RECOVER_HOLD seconds of sustained headroom,
+    so a single slow frame never changes anything and a marginal machine does not flap.
+    Samples are the processing cost of a frame (camera read excluded), divided by
+    the skip factor of the current tier, compared against a 1 / FAILSAFE_FPS budget.
+    """
+    TIERS = ("NORMAL", "NO_HUD", "LOW_RES", "FRAME_SKIP", "PAUSED")
+    NORMAL, NO_HUD, LOW_RES, FRAME_SKIP, PAUSED = range(5)
+
+    def __init__(self, budget=1.0 / config.FAILSAFE_FPS, window=config.HEALTH_WINDOW, alpha=config.HEALTH_EWMA_ALPHA,
+                 warmup=config.HEALTH_WARMUP, degrade_hold=config.HEALTH_DEGRADE_HOLD,
+                 recover_hold=config.HEALTH_RECOVER_HOLD, recover_hold_max=config.HEALTH_RECOVER_HOLD_MAX,
+                 recover_ratio=config.HEALTH_RECOVER_RATIO, spike_ratio=config.HEALTH_SPIKE_RATIO,
+                 skip_factor=config.HEALTH_SKIP_FACTOR, verbose=True):
+        """
+        :param budget: Per-frame processing budget in seconds
+        :param window: Number of samples kept for the p95
+        :param alpha: EWMA weight of the newest sample
+        :param warmup: Seconds after start() during which the tier is not changed
+        :param degrade_hold: Seconds of overload before stepping down
+        :param recover_hold: Seconds of headroom before stepping up (doubles on flapping)
+        :param recover_hold_max: Ceiling for the recover hold backoff
+        :param recover_ratio: Recover only when the projected EWMA is below budget * ratio
+        :param spike_ratio: p95 above budget * ratio counts as overload even if the mean is fine
+        :param skip_factor: Frames per processed frame in FRAME_SKIP / PAUSED
+        """
+        self.budget = budget
+        self.alpha = alpha
+        self.warmup = warmup
+        self.degrade_hold = degrade_hold
+        self.base_recover_hold = recover_hold
+        self.recover_hold = recover_hold
+        self.recover_hold_max = recover_hold_max
+        self.recover_ratio = recover_ratio
+        self.spike_ratio = spike_ratio
+        self.skip_factor = max(1, int(skip_factor))
+        self.verbose = verbose
+
+        # Ring buffer of samples (seconds)
+        self._samples = [0.0] * window
+        self._index = 0
+        self._filled = 0
+
+        self.tier = self.NORMAL
+        self.ewma = 0.0
+        self.transitions = [] # (time, from, to, reason)
+        self._frame = 0
+        self._start = None
+        self._overload_since = None
+        self._headroom_since = None
+        self._last_recover = None
+
+    @property
+    def tier_name(self):
+        return self.TIERS[self.tier]
+
+    @property
+    def hud_enabled(self):
+        return self.tier < self.NO_HUD
+
+    @property
+    def process_scale(self):
+        return config.HEALTH_LOW_RES_SCALE if self.tier >= self.LOW_RES else 1.0
+
+    @property
+    def control_enabled(self):
+        return self.tier < self.PAUSED
+
+    def _skip(self, tier):
+        return self.skip_factor if tier >= self.FRAME_SKIP else 1
+
+    def start(self, now):
+        self._start = now
+
+    def skip_frame(self):
+        """
+        Call once per captured frame.
+        :return: True if this frame should be dropped without processing
+        """
+        self._frame += 1
+        skip = self._skip(self.tier)
+        return skip > 1 and self._frame % skip != 0
+
+    def p95(self):
+        if self._filled == 0:
+            return 0.0
+        ordered = sorted(self._samples[:self._filled])
+        return ordered[min(self._filled - 1, int(self._filled * 0.95))]
+
+    def update(self, now, cost):
+        """
+        Record the processing cost of a frame and re-evaluate the tier.
+        :param now: Current time (seconds)
+        :param cost: Processing time of this frame (seconds)
+        :return: Current tier
+        """
+        if self._start is None:
+            self._start = now
+        sample = cost / self._skip(self.tier)
+
+        self._samples[self._index] = sample
+        self._index = (self._index + 1) % len(self._samples)
+        self._filled = min(self._filled + 1, len(self._samples))
+        self.ewma = sample if self._filled == 1 else self.ewma + self.alpha * (sample - self.ewma)
+
+        if now - self._start < self.warmup:
+            return self.tier
+
+        if self._last_recover is not None and now - self._last_recover > self.recover_hold_max:
+            # Stable for a while: forget earlier flapping
+            self.recover_hold = self.base_recover_hold
+            self._last_recover = None
+
+        p95 = self.p95()
+        overloaded = self.ewma > self.budget or p95 > self.budget * self.spike_ratio
+
+        # Leaving FRAME_SKIP multiplies the per-frame cost again; project it before deciding
+        factor = self._skip(self.tier) / self._skip(self.tier - 1) if self.tier > self.NORMAL else 1
+        projected = self.ewma * factor
+        headroom = projected < self.budget * self.recover_ratio and p95 * factor < self.budget
+
+        if overloaded:
+            self._headroom_since = None
+            if self._overload_since is None:
+                self._overload_since = now
+            elif now - self._overload_since >= self.degrade_hold and self.tier < self.PAUSED:
+                if self._last_recover is not None and now - self._last_recover < self.recover_hold + self.degrade_hold:
+                    # Recovery did not stick: wait longer before the next attempt
+                    self.recover_hold = min(self.recover_hold * 2, self.recover_hold_max)
+                reason = "ewma %.1f ms, p95 %.1f ms over %.1f ms budget for %.1fs" % (
+                    self.ewma * 1000, p95 * 1000, self.budget * 1000, now - self._overload_since)
+                self._transition(now, self.tier + 1, reason)
+        elif headroom:
+            self._overload_since = None
+            if self._headroom_since is None:
+                self._headroom_since = now
+            elif now - self._headroom_since >= self.recover_hold and self.tier > self.NORMAL:
+                reason = "projected ewma %.1f ms, p95 %.1f ms under %.1f ms for %.1fs" % (
+                    projected * 1000, p95 * factor * 1000, self.budget * self.recover_ratio * 1000, now - self._headroom_since)
+                self._last_recover = now
+                self._transition(now, self.tier - 1, reason)
+        else:
+            # In the hysteresis band: hold the current tier
+            self._overload_since = None
+            self._headroom_since = None
+
+        return self.tier
+
+    def _transition(self, now, tier, reason):
+        old = self.tier
+        self.tier = tier
+        self.transitions.append((now, self.TIERS[old], self.TIERS[tier], reason))
+        if self.verbose:
+            print(f"[HEALTH] {self.TIERS[old]} -> {self.TIERS[tier]}: {reason}")
+
+        # Samples from the previous tier do not describe the new one
+        self._filled = 0
+        self._index = 0
+        self._overload_since = None
+        self._headroom_since = None
@@ -0,0 +1,108 @@
+import time
+import cv2
+from gesture_v3 import config
+from gesture_v3.perception.motion import MotionGate
+
+class IdleMonitor:
+    """
+    Power saving while nobody is in front of the camera.
+    After IDLE_AFTER seconds without a hand the loop goes idle:
+    - the camera (if we own it) is switched to IDLE_CAPTURE_SIZE at IDLE_FPS
+    - frames are paced to IDLE_FPS even if the camera ignores the request
+    - the tracker is not run; only a MotionGate thumbnail diff against the previous frame
+    The first idle frame that differs from its predecessor wakes the loop and is
+    tracked right away (landmarks are normalized, so the low-res frame is fine);
+    full capture settings apply from the next frames on.
+    """
+    def __init__(self, cap=None, idle_after=config.IDLE_AFTER, idle_fps=config.IDLE_FPS,
+                 idle_size=config.IDLE_CAPTURE_SIZE, settle_frames=config.IDLE_SETTLE_FRAMES, motion=None, verbose=True):
+        """
+        :param cap: cv2.VideoCapture to reconfigure while idle (None = leave the source alone)
+        :param idle_after: Seconds without a hand before idling (0 disables idling)
+        :param idle_fps: Frame rate while idle
+        :param idle_size: Capture (w, h) while idle, or None to keep the resolution
+        :param settle_frames: Idle frames ignored for motion (camera re-exposing after a mode switch)
+        :param motion: MotionGate to use (default: one with the MOTION_* settings)
+        """
+        self.cap = cap
+        self.idle_after = idle_after
+        self.interval = 1.0 / idle_fps if idle_fps > 0 else 0.0
+        self.idle_size = idle_size
+        self.settle_frames = max(1, settle_frames) # The first frame only sets the reference
+        self.motion = motion if motion is not None else MotionGate()
+        self.verbose = verbose
+
+        self.idle = False
+        self.idle_since = None
+        self.idle_seconds = 0.0 # Total time spent idle
+        self._last_hand = None
+        self._idle_frames = 0
+        self._next_frame = 0.0
+
+    def start(self, now):
+        self._last_hand = now
+
+    def hand_seen(self, now, present):
+        """
+        Active frames: record whether the tracker found a hand.
+        :return: True if this call put the loop to sleep
+        """
+        if self._last_hand is None or present:
+            self._last_hand = now
+            return False
+        if self.idle_after > 0 and now - self._last_hand >= self.idle_after:
+            self._enter(now)
+            return True
+        return False
+
+    def pace(self):
+        """
+        Idle frames: call before reading the camera. Sleeps until the next idle frame is due.
+        """
+        now = time.perf_counter()
+        wait = self._next_frame - now
+        if wait > 0:
+            time.sleep(wait)
+            now += wait
+        self._next_frame = now + self.interval
+
+    def check(self, frame, now):
+        """
+        Idle frames: look for motion.
+        :param frame: BGR frame (any resolution, not modified)
+        :param now: Current time
+        :return: True if the loop woke up and this frame should be tracked
+        """
+        moved = self.motion.update(frame)
+        self.motion.mark()
+        self._idle_frames += 1
+        if moved and self._idle_frames > self.settle_frames:
+            self._wake(now)
+            return True
+        return False
+
+    def _enter(self, now):
+        self.idle = True
+        self.idle_since = now
+        self._idle_frames = 0
+        self._next_frame = 0.0
+        self.motion.reset()
+        self._configure(self.idle_size, 1.0 / self.interval if self.interval else config.TARGET_FPS)
+        if self.verbose:
+            print(f"[IDLE] No hand for {now - self._last_hand:.1f}s: idling until motion.")
+
+    def _wake(self, now):
+        self.idle = False
+        self.idle_seconds += now - self.idle_since
+        self._last_hand = now # Full idle_after grace before sleeping again
+        self._configure((config.CAPTURE_WIDTH, config.CAPTURE_HEIGHT), config.TARGET_FPS)
+        if self.verbose:
+            print(f"[IDLE] Motion after {now - self.idle_since:.1f}s idle: tracking resumed.")
+
+    def _configure(self, size, fps):
+        if self.cap is None:
+            return
+        if self.idle_size is not None:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
@@ -0,0 +1,237 @@
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from gesture_v3.core.metrics import LatencyHistogram
+
+def rss_bytes():
+    """
+    Current resident set size. Falls back to the peak RSS where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+class _StageAlloc:
+    """
+    Allocation counters for one stage.
+    net: traced bytes still held when the stage ends (leak indicator)
+    transient: peak traced bytes above the stage's starting point (churn)
+    blocks: net change in live Python memory blocks
+    """
+    __slots__ = ("count", "net", "transient", "transient_max", "blocks")
+
+    def __init__(self):
+        self.count = 0
+        self.net = 0
+        self.transient = 0
+        self.transient_max = 0
+        self.blocks = 0
+
+    def summary(self):
+        n = max(1, self.count)
+        return {
+            "samples": self.count,
+            "net_bytes_per_frame": self.net / n,
+            "transient_bytes_per_frame": self.transient / n,
+            "transient_bytes_max": self.transient_max,
+            "net_blocks_per_frame": self.blocks / n,
+            "net_bytes_total": self.net,
+        }
+
+class MemoryProfiler:
+    """
+    Allocation / memory-growth profiling for long-running sessions.
+    - Per-stage allocation counters, fed from StageProfiler.mark() (stage = since the previous mark)
+    - tracemalloc snapshot every snapshot_every frames, diffed against the first one (top growing lines)
+    - RSS, traced memory and GC pause timeline
+    report() adds growth slopes (bytes/hour) so a soak run shows which stage leaks or churns.
+    tracemalloc roughly doubles allocation cost: keep this off in production.
+    Stage counters are process-wide, so allocations on other threads (e.g. the HUD renderer)
+    land in whichever control-loop stage is open; run headless or with HUD_THREADED = False
+    for clean per-stage numbers. Snapshot diffs are attributed by source line regardless.
+    """
+    def __init__(self, snapshot_every=600, top=15, nframes=1, report_path="memprof.json"):
+        """
+        :param snapshot_every: Frames between tracemalloc snapshots
+        :param top: Growing source lines kept per snapshot
+        :param nframes: Traceback depth stored by tracemalloc
+        :param report_path: Where write_report() puts the JSON
+        """
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.nframes = nframes
+        self.report_path = report_path
+
+        self.stages = {}
+        self.frame = 0
+        self.timeline = [] # one row per snapshot
+        self.gc_pauses = {0: LatencyHistogram(), 1: LatencyHistogram(), 2: LatencyHistogram()}
+        self.gc_collected = 0
+
+        self._owner = None
+        self._mark_mem = 0
+        self._mark_blocks = 0
+        self._frame_mem = 0
+        self._frame_blocks = 0
+        self._frame_peak = 0
+        self._gc_start = 0.0
+        self._baseline = None
+        self._latest_growth = []
+        self._started = None
+        self._filters = None
+
+    # --- Lifecycle ---
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframes)
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+            tracemalloc.Filter(False, __file__),
+        ]
+        gc.callbacks.append(self._on_gc)
+        self._owner = threading.get_ident()
+        self._started = time.time()
+        self._baseline = self._snapshot()
+        self._sample(self._baseline)
+        self._reset_marks()
+
+    def stop(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if tracemalloc.is_tracing():
+            self._sample(self._snapshot())
+            tracemalloc.stop()
+
+    # --- Per-frame hooks (control loop thread) ---
+
+    def next_frame(self):
+        """
+        Close the previous frame and open a new one. Takes a snapshot every snapshot_every frames.
+        """
+        if threading.get_ident() != self._owner:
+            return
+        self.frame += 1
+        if self.snapshot_every and self.frame % self.snapshot_every == 0:
+            self._sample(self._snapshot())
+        self._reset_marks()
+
+    def record(self, stage, frame_total=False):
+        """
+        Attribute allocations since the previous mark (or since next_frame() for frame_total) to stage.
+        """
+        if threading.get_ident() != self._owner:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = _StageAlloc()
+        if frame_total:
+            base_mem, base_blocks = self._frame_mem, self._frame_blocks
+            peak = max(peak, self._frame_peak)
+        else:
+            base_mem, base_blocks = self._mark_mem, self._mark_blocks
+            self._frame_peak = max(self._frame_peak, peak)
+        transient = max(0, peak - base_mem)
+        stats.count += 1
+        stats.net += current - base_mem
+        stats.transient += transient
+        stats.blocks += blocks - base_blocks
+        if transient > stats.transient_max:
+            stats.transient_max = transient
+
+        if not frame_total:
+            # Re-measure so this bookkeeping is not charged to the next stage
+            self._mark_mem = tracemalloc.get_traced_memory()[0]
+            self._mark_blocks = sys.getallocatedblocks()
+            tracemalloc.reset_peak()
+
+    def _reset_marks(self):
+        self._mark_mem = self._frame_mem = tracemalloc.get_traced_memory()[0]
+        self._mark_blocks = self._frame_blocks = sys.getallocatedblocks()
+        self._frame_peak = 0
+        tracemalloc.reset_peak()
+
+    # --- GC pauses ---
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            self.gc_pauses[info.get("generation", 2)].record(time.perf_counter() - self._gc_start)
+            self.gc_collected += info.get("collected", 0)
+
+    # --- Snapshots ---
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def _sample(self, snapshot):
+        current, _ = tracemalloc.get_traced_memory()
+        growth = snapshot.compare_to(self._baseline, "lineno")[:self.top] if snapshot is not self._baseline else []
+        self._latest_growth = [
+            {"where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+             "size_diff": s.size_diff, "count_diff": s.count_diff, "size": s.size}
+            for s in growth
+        ]
+        self.timeline.append({
+            "frame": self.frame,
+            "elapsed_s": time.time() - self._started,
+            "rss_bytes": rss_bytes(),
+            "traced_bytes": current,
+            "gc_counts": list(gc.get_count()),
+            "gc_collections": [h.count for h in self.gc_pauses.values()],
+            "top_growth": self._latest_growth[:5],
+        })
+
+    # --- Report ---
+
+    @staticmethod
+    def _slope_per_hour(rows, key):
+        # Least-squares slope of key over elapsed time, ignoring the first sample (warm-up)
+        pts = [(r["elapsed_s"], r[key]) for r in rows[1:]]
+        if len(pts) < 2:
+            return None
+        n = len(pts)
+        mx = sum(x for x, _ in pts) / n
+        my = sum(y for _, y in pts) / n
+        var = sum((x - mx) ** 2 for x, _ in pts)
+        if var == 0:
+            return None
+        return sum((x - mx) * (y - my) for x, y in pts) / var * 3600
+
+    def report(self):
+        return {
+            "frames": self.frame,
+            "duration_s": time.time() - self._started if self._started else 0.0,
+            "stages": {name: s.summary() for name, s in self.stages.items()},
+            "rss_growth_bytes_per_hour": self._slope_per_hour(self.timeline, "rss_bytes"),
+            "traced_growth_bytes_per_hour": self._slope_per_hour(self.timeline, "traced_bytes"),
+            "gc": {
+                "collected": self.gc_collected,
+                "pauses": {f"gen{g}": h.summary() for g, h in self.gc_pauses.items()},
+            },
+            "top_growth": self._latest_growth,
+            "timeline": self.timeline,
+        }
+
+    def write_report(self, path=None):
+        path = path or self.report_path
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        os.replace(tmp, path)
+        print(f"[MEMPROF] Allocation report written to {path}")
+        return path
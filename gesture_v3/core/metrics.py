@@ -0,0 +1,136 @@
+
+import bisect
+import json
+import math
+import os
+import signal
+import time
+
+# Log-spaced bucket upper bounds: 10 us .. ~2 s, 8 buckets per octave
+_BUCKET_BOUNDS = [1e-5 * 2 ** (i / 8) for i in range(8 * 18)]
+
+class LatencyHistogram:
+    """
+    Fixed-size log-bucketed latency histogram.
+    record() only bumps counters in preallocated lists (no per-sample allocation).
+    Percentiles are resolved to the bucket's upper bound (~9% resolution).
+    """
+    __slots__ = ("counts", "total", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """
+        :param p: Percentile (0-100)
+        :return: Latency in seconds
+        """
+        if self.count == 0:
+            return 0.0
+        target = math.ceil(self.count * p / 100.0)
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(_BUCKET_BOUNDS[i], self.max) if i < len(_BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+class StageProfiler:
+    """
+    Per-stage latency instrumentation for the control loop.
+    Usage:
+        t = profiler.now()
+        ... capture ...
+        t = profiler.mark("capture", t)   # records and returns the new start time
+    Each stage must be recorded from a single thread.
+    If a FrameTracer is attached, every mark is also recorded as a span.
+    If a MemoryProfiler is attached, allocations since the previous mark are charged to the stage.
+    """
+    STAGES = ("capture", "preprocess", "tracker", "smoothing", "classifier", "control", "hud", "display", "frame")
+
+    def __init__(self, enabled=True, json_path=None, tracer=None, memory=None):
+        self.enabled = enabled
+        self.json_path = json_path
+        self.tracer = tracer
+        self.memory = memory
+        self.stages = {name: LatencyHistogram() for name in self.STAGES}
+        self.started = time.time()
+
+    now = staticmethod(time.perf_counter)
+
+    def mark(self, stage, start, frame=None):
+        """
+        :param frame: Trace frame sequence of the work; pass it for stages running behind
+            the control loop on another thread (e.g. the HUD renderer)
+        """
+        end = time.perf_counter()
+        if self.enabled:
+            self.stages[stage].record(end - start)
+        if self.tracer is not None:
+            self.tracer.record(stage, start, end, frame)
+        if self.memory is not None:
+            self.memory.record(stage, frame_total=stage == "frame")
+        return end
+
+    def summary(self):
+        return {name: h.summary() for name, h in self.stages.items() if h.count}
+
+    def hud_lines(self):
+        """
+        Compact text rows for the preview panel.
+        """
+        lines = ["STAGE        p50   p95   p99 ms"]
+        for name, h in self.stages.items():
+            if h.count:
+                lines.append(f"{name:<11}{h.percentile(50)*1000:6.1f}{h.percentile(95)*1000:6.1f}{h.percentile(99)*1000:6.1f}")
+        return lines
+
+    def dump_json(self, path=None):
+        path = path or self.json_path
+        if not path:
+            return
+        report = {
+            "started": self.started,
+            "duration_s": time.time() - self.started,
+            "stages": self.summary(),
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+        print(f"[PERF] Stage latency report written to {path}")
+
+    def install_signal_handler(self, signum=getattr(signal, "SIGUSR1", None)):
+        """
+        Dump the JSON report on a signal (SIGUSR1 where available) without stopping.
+        """
+        if signum is None:
+            return
+        signal.signal(signum, lambda *_: self.dump_json())
@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+
+class ConfigSnapshot:
+    """
+    Frozen view of a config module's UPPERCASE constants.
+    Subclasses are generated per module with one slot per constant (see snapshot_type()),
+    so reads are plain slot lookups and a snapshot can never be modified after creation:
+    a running stage always sees one consistent set of values.
+    """
+    __slots__ = ("_version",)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"config snapshot is read-only (tried to set {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"config snapshot is read-only (tried to delete {name})")
+
+    @property
+    def version(self):
+        return self._version
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in type(self).__slots__}
+
+_TYPES = {}
+
+def snapshot_type(module):
+    """
+    Snapshot class for a config module (cached). Slots are fixed by the module's constants,
+    so reloads can change values but never add names.
+    """
+    cls = _TYPES.get(module.__name__)
+    if cls is None:
+        names = tuple(sorted(n for n in vars(module) if n.isupper() and not n.startswith("_")))
+        cls = type("ConfigSnapshot", (ConfigSnapshot,), {"__slots__": names})
+        _TYPES[module.__name__] = cls
+    return cls
+
+def make_snapshot(module, overrides=None, version=0):
+    """
+    Build a snapshot from the module's values with overrides applied.
+    :param module: Config module (defaults)
+    :param overrides: {NAME: value}, already validated
+    :param version: Reload counter stored on the snapshot
+    """
+    cls = snapshot_type(module)
+    snap = object.__new__(cls)
+    values = {name: getattr(module, name) for name in cls.__slots__}
+    if overrides:
+        values.update(overrides)
+    for name, value in values.items():
+        object.__setattr__(snap, name, value)
+    object.__setattr__(snap, "_version", version)
+    return snap
+
+_DEFAULTS = {}
+
+def default_snapshot(module):
+    """
+    Snapshot of the module as written (no override file). Used by stages constructed without a store.
+    """
+    snap = _DEFAULTS.get(module.__name__)
+    if snap is None:
+        snap = _DEFAULTS[module.__name__] = make_snapshot(module)
+    return snap
+
+def _coerce(name, value, default):
+    """
+    Check an override against the default's type. Lists become tuples where the default is a tuple.
+    Int settings stay ints (2.0 is accepted as 2, 2.5 is not); None only where the default is None.
+    :raises ValueError: Type mismatch
+    """
+    if value is None and default is None:
+        return None
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+    elif isinstance(default, float):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    elif isinstance(default, int):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+    elif isinstance(default, tuple):
+        if isinstance(value, (list, tuple)) and len(value) == len(default):
+            return tuple(_coerce(name, v, d) for v, d in zip(value, default))
+    elif isinstance(default, str):
+        if isinstance(value, str):
+            return value
+    raise ValueError(f"{name}: expected {type(default).__name__} like {default!r}, got {value!r}")
+
+class ConfigStore:
+    """
+    Holds the live config snapshot for a config module.
+    The optional JSON override file ({"NAME": value, ...}) is applied on top of the module
+    defaults. If the module lists its live-tunable names in _LIVE, other names are skipped
+    with a warning: they are read once at startup and an override could never apply. reload() builds and validates a new snapshot off the control loop and parks it;
+    the control loop picks it up with poll() between frames and rebinds its stages,
+    so a frame never mixes old and new values. A bad file keeps the previous snapshot.
+    """
+    def __init__(self, module, path=None):
+        """
+        :param module: Config module providing defaults and the allowed names
+        :param path: JSON override file (optional; missing file = defaults)
+        """
+        self.module = module
+        self.path = path
+        self.current = default_snapshot(module)
+        self._latest = self.current # Newest validated snapshot (written by reload, read by poll)
+        self._mtime = None
+        self._watcher = None
+        self._stop = threading.Event()
+        self.reload()
+        self.current = self._latest
+
+    def _read_overrides(self):
+        with open(self.path) as f:
+            raw = json.load(f)
+        if not isinstance(raw, dict):
+            raise ValueError("override file must contain a JSON object")
+        names = snapshot_type(self.module).__slots__
+        live = getattr(self.module, "_LIVE", None)
+        overrides = {}
+        for name, value in raw.items():
+            if name not in names:
+                raise ValueError(f"{name}: unknown setting")
+            if live is not None and name not in live:
+                print(f"[CONFIG] {name} is only read at startup; edit config.py instead (override skipped)")
+                continue
+            overrides[name] = _coerce(name, value, getattr(self.module, name))
+        return overrides
+
+    def reload(self):
+        """
+        Re-read the override file if it changed. Safe to call from any thread.
+        :return: True if a new snapshot was parked for poll()
+        """
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        try:
+            overrides = self._read_overrides() if mtime is not None else {}
+        except (OSError, ValueError) as e:
+            print(f"[CONFIG] Ignoring {self.path}: {e}")
+            return False
+
+        base = self._latest
+        snap = make_snapshot(self.module, overrides, version=base.version + 1)
+        changed = [n for n in type(snap).__slots__ if getattr(snap, n) != getattr(base, n)]
+        if not changed:
+            return False
+        self._latest = snap # Single reference store: atomic for the reader
+        print(f"[CONFIG] Loaded {self.path} (v{snap.version}): {', '.join(changed)}")
+        return True
+
+    def poll(self):
+        """
+        Control loop, between frames: swap in a parked snapshot.
+        :return: The new snapshot, or None if nothing changed
+        """
+        snap = self._latest
+        if snap is self.current:
+            return None
+        self.current = snap
+        return snap
+
+    # --- File watcher ---
+
+    def watch(self, interval=1.0):
+        """
+        Start a daemon thread that polls the override file's mtime every interval seconds.
+        """
+        if not self.path or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval,), name="ConfigWatcher", daemon=True)
+        self._watcher.start()
+
+    def _watch_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.reload()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=1.0)
+            self._watcher = None
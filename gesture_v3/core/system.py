@@ -2,25 +2,70 @@
 import cv2
 import time
 from gesture_v3 import config
-from gesture_v3.perception.tracker import HandTracker
+from gesture_v3.core.metrics import StageProfiler
+from gesture_v3.core.tracing import FrameTracer
+from gesture_v3.core.health import FrameHealthMonitor
+from gesture_v3.core.idle import IdleMonitor
+from gesture_v3.core.bus import EventBus
+from gesture_v3.perception.warmup import TrackerWarmup
+from gesture_v3.core.memory import MemoryProfiler
+from gesture_v3.core.settings import ConfigStore
 
 class SystemController:
     """
     Core Application Loop (V3)
     Orchestrates: Camera -> Tracker -> Smoother -> Intent -> Physics -> UI -> Display
     """
-    def __init__(self):
+    def __init__(self, cap=None, tracker=None, display=True):
+        """
+        :param cap: Frame source with read()/release() (default: camera 0)
+        :param tracker: Object with process(image_rgb, timestamp_ms) (default: MediaPipe HandTracker)
+        :param display: False runs headless (no window, no HUD rendering)
+        """
         self.running = True
-        self.cap = cv2.VideoCapture(0)
-        
-        # Setup Camera
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-        self.cap.set(cv2.CAP_PROP_FPS, config.TARGET_FPS)
-        
-        # Modules
-        self.tracker = HandTracker()
+        self.display = display
+        self.owns_camera = cap is None # Only our own camera is reconfigured (e.g. while idle)
         self.start_time = time.time()
+
+        # Modules
+        if tracker is None and config.TRACKER_PROCESS:
+            from gesture_v3.perception.tracker_process import HandTrackerProcess
+            tracker = HandTrackerProcess((config.CAPTURE_HEIGHT, config.CAPTURE_WIDTH, 3),
+                                         slots=config.TRACKER_PROCESS_SLOTS,
+                                         pipelined=config.TRACKER_PROCESS_PIPELINED,
+                                         timeout=config.TRACKER_PROCESS_TIMEOUT)
+            tracker.start()
+            self.warmup = TrackerWarmup(tracker, self.start_time) if config.WARMUP_ENABLED else None
+        elif tracker is None:
+            from gesture_v3.perception.tracker import HandTracker
+            tracker = HandTracker()
+            self.warmup = TrackerWarmup(tracker, self.start_time) if config.WARMUP_ENABLED else None
+        else:
+            self.warmup = None # Injected trackers are used as they are
+        self.tracker = tracker
+        # Warm-up runs while the camera opens and run() sets up the UI
+        if self.warmup is not None:
+            self.warmup.start()
+
+        if cap is None:
+            cap = cv2.VideoCapture(0)
+            # Setup Camera
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAPTURE_WIDTH)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAPTURE_HEIGHT)
+            cap.set(cv2.CAP_PROP_FPS, config.TARGET_FPS)
+        self.cap = cap
+
+    def _release_control(self):
+        """Drop any held drag and forget the movement anchor (control is being suspended)."""
+        if getattr(self, 'drag_active', False):
+            import pyautogui
+            pyautogui.mouseUp()
+            self.drag_active = False
+        if hasattr(self, 'prev_hand_x'):
+            del self.prev_hand_x
+            del self.prev_hand_y
+        if getattr(self, 'macros', None) is not None:
+            self.macros.cancel()
         
     def run(self):
         print(f"[{config.APP_NAME}] System Initialized. Press 'Q' to Quit.")
@@ -29,8 +74,12 @@ class SystemController:
         from gesture_v3.perception.smoothing import OneEuroFilter
         from gesture_v3.intent.classifier import GestureClassifier
         from gesture_v3.control.mouse_physics import PhysicsCursor
+        from gesture_v3.control.macros import MacroEngine
+        from gesture_v3.intent.states import NO_HAND
         from gesture_v3.ui.hud import CinematicHUD
+        from gesture_v3.ui.renderer import HUDRenderer
         from gesture_v3.security.authenticator import FaceAuthenticator
+        from gesture_v3.security.presence import PresenceMonitor
 
         # Security Check
         # authenticator = FaceAuthenticator()
@@ -38,166 +87,300 @@ class SystemController:
         #     print("Authentication failed or cancelled.")
         #     return
 
-        smoother = OneEuroFilter(time.time(), [0.5, 0.5], min_cutoff=config.ONE_EURO_MIN_CUTOFF, beta=config.ONE_EURO_BETA)
-        classifier = GestureClassifier()
-        cursor = PhysicsCursor()
+        # Live config: stages bind a frozen snapshot; reloads are swapped in between frames
+        settings = ConfigStore(config, config.CONFIG_OVERRIDES_PATH)
+        settings.watch(config.CONFIG_WATCH_INTERVAL)
+        cfg = settings.current
+
+        smoother = OneEuroFilter(time.time(), [0.5, 0.5], min_cutoff=cfg.ONE_EURO_MIN_CUTOFF, beta=cfg.ONE_EURO_BETA)
+        classifier = GestureClassifier(cfg)
+        cursor = PhysicsCursor(cfg)
         hud = CinematicHUD()
+        # Gesture -> action chains (run on a background executor, never in this loop)
+        self.macros = macros = MacroEngine.load(config.MACROS_PATH)
+        macros.start()
+        bus = None
+        if config.EVENT_BUS_ENABLED:
+            bus = EventBus()
+            if not bus.start():
+                bus = None
+        tracer = None
+        if config.TRACE_ENABLED:
+            tracer = FrameTracer(capacity=config.TRACE_CAPACITY, path=config.TRACE_PATH)
+            tracer.install()
+        memory = None
+        if config.MEMPROF_ENABLED:
+            memory = MemoryProfiler(snapshot_every=config.MEMPROF_SNAPSHOT_EVERY, top=config.MEMPROF_TOP,
+                                    report_path=config.MEMPROF_PATH)
+            memory.start()
+        profiler = StageProfiler(enabled=config.PERF_STATS or config.PERF_HUD, json_path=config.PERF_JSON_PATH,
+                                 tracer=tracer, memory=memory)
+        if config.PERF_STATS:
+            profiler.install_signal_handler()
+        renderer = HUDRenderer(hud, profiler=profiler, display=self.display)
+        renderer.start()
+
+        # Optional continuous presence verification (background, low priority)
+        presence = None
+        if config.PRESENCE_CHECK:
+            presence = PresenceMonitor()
+            presence.start(time.time())
         
+        # Frame health: degrades HUD -> resolution -> frame rate -> control under sustained overload
+        health = FrameHealthMonitor()
+        health.start(time.time())
+
+        # Idle: no hand for a while -> low-rate, low-res capture and motion detection only
+        # A source that also supplies the landmarks (remote stream, synthetic input) has no real
+        # images to detect motion in, so it never idles
+        idle = IdleMonitor(self.cap if self.owns_camera else None,
+                           idle_after=0 if self.tracker is self.cap else config.IDLE_AFTER)
+        idle.start(time.time())
+
+        acquire_slot = getattr(self.tracker, "acquire", None)
         last_time = time.time()
+        last_ts = -1 # Last tracker timestamp (ms); VIDEO mode rejects non-increasing ones
+        warming = self.warmup is not None
 
-        while self.running:
-            # Time Delta
-            current_time = time.time()
-            dt = current_time - last_time
-            last_time = current_time
-            
-            success, img = self.cap.read()
-            if not success:
-               continue
+        try:
+            while self.running and not renderer.quit_requested:
+                if idle.idle:
+                    idle.pace()
+                current_time = time.time()
+                frame_start = t = profiler.now()
+                if tracer is not None:
+                    tracer.next_frame()
+                if memory is not None:
+                    memory.next_frame()
 
-            # 1. Flip & Color correction
-            img = cv2.flip(img, 1) # Mirror view
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                new_cfg = settings.poll()
+                if new_cfg is not None:
+                    cfg = new_cfg
+                    smoother.min_cutoff = float(cfg.ONE_EURO_MIN_CUTOFF)
+                    smoother.beta = float(cfg.ONE_EURO_BETA)
+                    classifier.apply_config(cfg)
+                    cursor.apply_config(cfg)
             
-            # 2. Perception (Tracking)
-            frame_timestamp_ms = (current_time - self.start_time) * 1000
+                success, img = self.cap.read()
+                if not success:
+                   continue
+                t = profiler.mark("capture", t)
+                work_start = t
+
+                # Cursor is handed over only once the tracker has reached steady-state latency
+                if warming:
+                    if not self.warmup.ready.is_set():
+                        renderer.submit(cv2.flip(img, 1), None, "IDLE", 0.0, 0.0, banner="WARMING UP...")
+                        continue
+                    warming = False
+                    # Warm-up timestamps came from the same clock but may be ahead of this
+                    # frame's (taken before the blocking read)
+                    last_ts = self.warmup.last_ts
+
+                # Idle: only the motion gate runs until something moves; that frame is tracked
+                if idle.idle and not idle.check(img, current_time):
+                    renderer.submit(cv2.flip(img, 1), None, "IDLE", 0.0, 0.0, banner="STANDBY: NO HAND")
+                    continue
+
+                # Degraded tiers drop frames before any processing
+                if health.skip_frame():
+                    continue
+
+                # Time Delta (between processed frames)
+                dt = current_time - last_time
+                last_time = current_time
+                fps = 1/dt if dt > 0 else 0
+
+                # 1. Flip & Color correction
+                img = cv2.flip(img, 1) # Mirror view
+                scale = health.process_scale
+                src = img
+                if scale < 1.0:
+                    # Landmarks are normalized, so the tracker can run on a smaller frame
+                    src = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                # A tracker worker lends a shared-memory slot: convert straight into it (no copy)
+                buf = acquire_slot(src.shape) if acquire_slot is not None else None
+                img_rgb = cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=buf)
+                t = profiler.mark("preprocess", t)
             
-            # Safety Check: Low FPS
-            fps = 1/dt if dt > 0 else 0
-            if fps < config.FAILSAFE_FPS and (current_time - self.start_time) > 2.0:
-                 cv2.putText(img, "SAFETY PAUSE: LOW FPS", (config.WINDOW_WIDTH//2 - 150, config.WINDOW_HEIGHT//2), 
-                             cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                 cv2.imshow(config.APP_NAME, img)
-                 key = cv2.waitKey(1)
-                 if key == ord('q'): self.running = False
-                 continue
-
-            detection_result = self.tracker.process(img_rgb, frame_timestamp_ms)
+                # 2. Perception (Tracking)
+                frame_timestamp_ms = max(int((current_time - self.start_time) * 1000), last_ts + 1)
+                last_ts = frame_timestamp_ms
+
+                # Presence Check: pause control while the verified user is away
+                if presence is not None and not presence.update(img, current_time):
+                    self._release_control()
+                    if bus is not None:
+                        bus.publish(current_time, "PAUSED")
+                        bus.flush()
+                    renderer.submit(img, None, "IDLE", 0.0, fps, banner="PAUSED: USER ABSENT")
+                    profiler.mark("frame", frame_start) # Paused frames still count in the histogram / trace
+                    continue
+
+                t = profiler.now()
+                detection_result = self.tracker.process(img_rgb, frame_timestamp_ms)
+                t = profiler.mark("tracker", t)
+                idle.hand_seen(current_time, bool(detection_result.hand_landmarks))
+
+                # Safety Check: sustained overload suspends control.
+                # The tracker keeps running so the monitor can measure when it is safe to resume.
+                if not health.control_enabled:
+                    self._release_control()
+                    if bus is not None:
+                        bus.publish(current_time, "PAUSED")
+                        bus.flush()
+                    renderer.submit(img, None, "IDLE", 0.0, fps, banner="SAFETY PAUSE: LOW FPS")
+                    health.update(current_time, profiler.now() - work_start)
+                    profiler.mark("frame", frame_start)
+                    continue
             
-            hand_landmarks = None
-            delta_x, delta_y = 0.0, 0.0
-            state = "IDLE"
-            confidence = 0.0
+                hand_landmarks = None
+                delta_x, delta_y = 0.0, 0.0
+                anchor = None
+                state = "IDLE"
+                confidence = 0.0
             
-            if detection_result.hand_landmarks:
-                hand_landmarks = detection_result.hand_landmarks[0]
+                if detection_result.hand_landmarks:
+                    hand_landmarks = detection_result.hand_landmarks[0]
                 
-                # --- V6 RELATIVE TRACKING ---
-                # Use Index MCP (5) as the anchor for movement (stable part of palm)
-                raw_point = hand_landmarks[5] 
-                norm_x, norm_y = raw_point.x, raw_point.y
+                    # --- V6 RELATIVE TRACKING ---
+                    # Use Index MCP (5) as the anchor for movement (stable part of palm)
+                    raw_point = hand_landmarks[5] 
+                    norm_x, norm_y = raw_point.x, raw_point.y
                 
-                # 3. Smoothing
-                filtered_pos = smoother(current_time, [norm_x, norm_y])
-                curr_x, curr_y = filtered_pos[0], filtered_pos[1]
+                    # 3. Smoothing
+                    filtered_pos = smoother(current_time, [norm_x, norm_y])
+                    curr_x, curr_y = filtered_pos[0], filtered_pos[1]
+                    t = profiler.mark("smoothing", t)
                 
-                # Calculate Delta
-                if hasattr(self, 'prev_hand_x'):
-                    delta_x = curr_x - self.prev_hand_x
-                    delta_y = curr_y - self.prev_hand_y
+                    # Calculate Delta
+                    if hasattr(self, 'prev_hand_x'):
+                        delta_x = curr_x - self.prev_hand_x
+                        delta_y = curr_y - self.prev_hand_y
                 
-                self.prev_hand_x = curr_x
-                self.prev_hand_y = curr_y
+                    self.prev_hand_x = curr_x
+                    self.prev_hand_y = curr_y
+                    anchor = (curr_x, curr_y)
                 
-                # 4. Intent Classification
-                state, meta = classifier.process(hand_landmarks)
-                # Store raw state because we might override it for HUD
-                raw_state = state 
-                confidence = meta.get("confidence", 0.0)
+                    # 4. Intent Classification
+                    state, meta = classifier.process(hand_landmarks)
+                    # Store raw state because we might override it for HUD
+                    raw_state = state 
+                    confidence = meta.get("confidence", 0.0)
+                    t = profiler.mark("classifier", t)
                 
-                # --- V6 STATE MACHINE ---
-                current_time_loop = time.time()
+                    # --- V6 STATE MACHINE ---
+                    current_time_loop = time.time()
                 
-                # Globals
-                if not hasattr(self, 'drag_active'): self.drag_active = False
-                if not hasattr(self, 'last_toggle_time'): self.last_toggle_time = 0
-                if not hasattr(self, 'last_click_time'): self.last_click_time = 0
+                    # Globals
+                    if not hasattr(self, 'drag_active'): self.drag_active = False
+                    if not hasattr(self, 'last_toggle_time'): self.last_toggle_time = 0
+                    if not hasattr(self, 'last_click_time'): self.last_click_time = 0
                 
-                # 1. DRAG TOGGLE LOGIC (FIST)
-                if state == "FIST":
-                    if (current_time_loop - self.last_toggle_time) > config.DRAG_TOGGLE_COOLDOWN:
-                        self.drag_active = not self.drag_active # Toggle
-                        self.last_toggle_time = current_time_loop
+                    # 1. DRAG TOGGLE LOGIC (FIST)
+                    if state == "FIST":
+                        if (current_time_loop - self.last_toggle_time) > cfg.DRAG_TOGGLE_COOLDOWN:
+                            self.drag_active = not self.drag_active # Toggle
+                            self.last_toggle_time = current_time_loop
                         
-                        if self.drag_active:
-                            import pyautogui
-                            pyautogui.mouseDown() # PICK
-                        else:
-                            import pyautogui
-                            pyautogui.mouseUp()   # DROP
+                            if self.drag_active:
+                                import pyautogui
+                                pyautogui.mouseDown() # PICK
+                            else:
+                                import pyautogui
+                                pyautogui.mouseUp()   # DROP
                             
-                # 2. EXECUTE ACTIONS BASED ON STATE & TOGGLE
+                    # 2. EXECUTE ACTIONS BASED ON STATE & TOGGLE
                 
-                # A. DRAG MODE (Active)
-                if self.drag_active:
-                    state = "DRAG_ACTIVE" # Override classifier state for HUD
+                    # A. DRAG MODE (Active)
+                    if self.drag_active:
+                        state = "DRAG_ACTIVE" # Override classifier state for HUD
                     
-                    # Allow movement if not performing another exclusive action
-                    if raw_state == "MOVE" or raw_state == "IDLE" or raw_state == "FIST":
-                         cursor.update_relative(delta_x, delta_y, dt)
+                        # Allow movement if not performing another exclusive action
+                        if raw_state == "MOVE" or raw_state == "IDLE" or raw_state == "FIST":
+                             cursor.update_relative(delta_x, delta_y, dt)
                 
-                # B. NORMAL MODE (Not Dragging)
-                else:
-                    if state == "MOVE":
-                        cursor.update_relative(delta_x, delta_y, dt)
+                    # B. NORMAL MODE (Not Dragging)
+                    else:
+                        if state == "MOVE":
+                            cursor.update_relative(delta_x, delta_y, dt)
                         
-                    elif state == "CLICK_LEFT":
-                        if (current_time_loop - self.last_click_time) > config.CLICK_COOLDOWN:
-                             import pyautogui
-                             pyautogui.click()
-                             self.last_click_time = current_time_loop
-                             cv2.circle(img, (int(norm_x*config.WINDOW_WIDTH), int(norm_y*config.WINDOW_HEIGHT)), 50, config.COLOR_CLICK, 4)
-                             
-                    elif state == "CLICK_RIGHT":
-                        if (current_time_loop - self.last_click_time) > config.CLICK_COOLDOWN: 
-                             import pyautogui
-                             pyautogui.rightClick()
-                             self.last_click_time = current_time_loop
+                        elif state == "CLICK_LEFT":
+                            if (current_time_loop - self.last_click_time) > cfg.CLICK_COOLDOWN:
+                                 import pyautogui
+                                 pyautogui.click()
+                                 self.last_click_time = current_time_loop
                              
-                    elif state == "SCROLL":
-                        if hasattr(self, 'last_scroll_y'):
-                             dy = norm_y - self.last_scroll_y
-                             if abs(dy) > 0.005: 
+                        elif state == "CLICK_RIGHT":
+                            if (current_time_loop - self.last_click_time) > cfg.CLICK_COOLDOWN: 
                                  import pyautogui
-                                 scroll_amount = int(-dy * config.SCROLL_SPEED * 100)
-                                 pyautogui.scroll(scroll_amount)
-                        self.last_scroll_y = norm_y
-                    else:
-                        if hasattr(self, 'last_scroll_y'): del self.last_scroll_y
+                                 pyautogui.rightClick()
+                                 self.last_click_time = current_time_loop
+                             
+                        elif state == "SCROLL":
+                            if hasattr(self, 'last_scroll_y'):
+                                 dy = norm_y - self.last_scroll_y
+                                 if abs(dy) > 0.005: 
+                                     import pyautogui
+                                     scroll_amount = int(-dy * cfg.SCROLL_SPEED * 100)
+                                     pyautogui.scroll(scroll_amount)
+                            self.last_scroll_y = norm_y
+                        else:
+                            if hasattr(self, 'last_scroll_y'): del self.last_scroll_y
 
-                # 5. UI Layer
-                hud.draw(img, hand_landmarks, state, confidence)
-                
-            else:
-                # HAND LOST SAFETY
-                if hasattr(self, 'drag_active') and self.drag_active:
-                    import pyautogui
-                    pyautogui.mouseUp()
-                    self.drag_active = False
-                    print("Hand lost. Safety Drop.")
+                    macros.update(current_time, raw_state)
+                    t = profiler.mark("control", t)
+
+                else:
+                    # HAND LOST SAFETY
+                    if hasattr(self, 'drag_active') and self.drag_active:
+                        import pyautogui
+                        pyautogui.mouseUp()
+                        self.drag_active = False
+                        print("Hand lost. Safety Drop.")
                 
-                # Reset Delta Reference
-                if hasattr(self, 'prev_hand_x'): 
-                    del self.prev_hand_x
-                    del self.prev_hand_y
+                    # Reset Delta Reference
+                    if hasattr(self, 'prev_hand_x'): 
+                        del self.prev_hand_x
+                        del self.prev_hand_y
                 
-                classifier.process(None)
-                hud.draw(img, None, "IDLE", 0.0)
+                    classifier.process(None)
+                    macros.update(current_time, NO_HAND)
             
-            # Physics call handles internally now (update_relative called above)
-
-
-            # 7. System Info
-            fps = 1/dt if dt > 0 else 0
-            cv2.putText(img, f"J.A.R.V.I.S  |  FPS: {int(fps)}", (20, 30), cv2.FONT_HERSHEY_PLAIN, 1, (200, 255, 200), 1)
+                # Physics call handles internally now (update_relative called above)
 
-            # 8. Display
-            cv2.imshow(config.APP_NAME, img)
+                # Event bus: one batched write per frame to local subscribers
+                if bus is not None:
+                    bus.publish(current_time, state if hand_landmarks is not None else NO_HAND, confidence,
+                                anchor, (delta_x, delta_y))
+                    bus.flush()
 
-            # 9. Inputs
-            key = cv2.waitKey(1)
-            if key == ord('q'):
-                self.running = False
 
-        self.cap.release()
-        cv2.destroyAllWindows()
+                # 5. UI Layer + Display (rendered off-thread at HUD_MAX_FPS)
+                # Keys ('q') are polled by the renderer
+                renderer.submit(img, hand_landmarks, state, confidence, fps, hud=health.hud_enabled)
+                health.update(current_time, profiler.now() - work_start)
+                profiler.mark("frame", frame_start)
+        finally:
+            # Always runs: worker processes, shared memory, sockets and threads must not outlive us
+            self._release_control()
+            if config.PERF_STATS:
+                profiler.dump_json()
+            if tracer is not None:
+                tracer.uninstall()
+                tracer.flush()
+            if memory is not None:
+                memory.stop()
+                memory.write_report()
+            if presence is not None:
+                presence.stop()
+            settings.stop()
+            macros.stop()
+            if bus is not None:
+                bus.stop()
+            renderer.stop()
+            if self.warmup is not None:
+                self.warmup.wait(1.0)
+            if hasattr(self.tracker, "stop"):
+                self.tracker.stop()
+            self.cap.release()
@@ -0,0 +1,110 @@
+
+import gc
+import json
+import os
+import signal
+import threading
+import time
+
+class FrameTracer:
+    """
+    Opt-in span recorder for individual frames.
+    Spans (stage, start, end, thread, frame sequence) go into a preallocated
+    ring buffer; flush() writes Chrome trace-event JSON (open in Perfetto or
+    chrome://tracing). GC pauses are recorded as their own spans.
+    When tracing is off no tracer exists and StageProfiler skips it entirely.
+    """
+    def __init__(self, capacity=200000, path="trace.json"):
+        self.capacity = capacity
+        self.path = path
+        self.frame = 0
+
+        # Ring buffer (parallel preallocated slots)
+        self._names = [None] * capacity
+        self._starts = [0.0] * capacity
+        self._ends = [0.0] * capacity
+        self._tids = [0] * capacity
+        self._frames = [0] * capacity
+        self._next = 0
+        self._lock = threading.Lock()
+
+        self._thread_names = {}
+        self._gc_start = 0.0
+        self._origin = time.perf_counter()
+
+    def next_frame(self):
+        """
+        Start a new frame sequence number (control loop only).
+        """
+        self.frame += 1
+        return self.frame
+
+    def record(self, name, start, end, frame=None):
+        """
+        Record a span. start/end are time.perf_counter() values.
+        :param frame: Frame sequence the work belongs to (default: the control loop's current one)
+        """
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        with self._lock:
+            i = self._next % self.capacity
+            self._next += 1
+        self._names[i] = name
+        self._starts[i] = start
+        self._ends[i] = end
+        self._tids[i] = tid
+        self._frames[i] = self.frame if frame is None else frame
+
+    # --- GC pauses ---
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            self.record(f"gc(gen{info.get('generation', '?')})", self._gc_start, time.perf_counter())
+
+    def install(self, signum=getattr(signal, "SIGUSR2", None)):
+        """
+        Hook GC callbacks and flush on a signal (SIGUSR2 where available).
+        """
+        gc.callbacks.append(self._on_gc)
+        if signum is not None:
+            signal.signal(signum, lambda *_: self.flush())
+
+    def uninstall(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    # --- Export ---
+
+    def events(self):
+        """
+        Recorded spans, oldest first, as Chrome trace "complete" events.
+        """
+        with self._lock:
+            n = min(self._next, self.capacity)
+            first = self._next - n
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in self._thread_names.items()]
+        for k in range(first, first + n):
+            i = k % self.capacity
+            events.append({
+                "name": self._names[i],
+                "ph": "X",
+                "ts": (self._starts[i] - self._origin) * 1e6,
+                "dur": (self._ends[i] - self._starts[i]) * 1e6,
+                "pid": pid,
+                "tid": self._tids[i],
+                "args": {"frame": self._frames[i]},
+            })
+        return events
+
+    def flush(self, path=None):
+        path = path or self.path
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
+        print(f"[PERF] Frame trace written to {path}")
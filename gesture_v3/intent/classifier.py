@@ -2,6 +2,7 @@
 import time
 import math
 from gesture_v3 import config
+from gesture_v3.core.settings import default_snapshot
 
 class GestureClassifier:
     """
@@ -14,7 +15,10 @@ class GestureClassifier:
     - CLICK: Pinch confirmed
     - DRAG: Pinch held + movement (Future)
     """
-    def __init__(self):
+    def __init__(self, cfg=None):
+        """
+        :param cfg: Config snapshot (default: gesture_v3.config as written)
+        """
         self.state = "IDLE"
         self.pinch_confidence = 0.0
         self.last_update = time.time()
@@ -22,6 +26,15 @@ class GestureClassifier:
         # Tip Indices
         self.THUMB_TIP = 4
         self.INDEX_TIP = 8
+        self.apply_config(cfg or default_snapshot(config))
+
+    def apply_config(self, cfg):
+        """
+        Bind thresholds from a config snapshot (between frames only).
+        """
+        self.pinch_threshold = cfg.PINCH_THRESHOLD_NORM
+        self.confidence_growth = cfg.CONFIDENCE_GROWTH
+        self.confidence_decay = cfg.CONFIDENCE_DECAY
 
     def process(self, landmarks):
         """
@@ -68,14 +81,14 @@ class GestureClassifier:
         # Better: Priority check.
 
         # CLICK LOGIC
-        if dist_click < config.PINCH_THRESHOLD_NORM and is_stable:
-             self.pinch_confidence += config.CONFIDENCE_GROWTH
+        if dist_click < self.pinch_threshold and is_stable:
+             self.pinch_confidence += self.confidence_growth
              self.pinch_type = "LEFT"
-        elif dist_right < config.PINCH_THRESHOLD_NORM and is_stable:
-             self.pinch_confidence += config.CONFIDENCE_GROWTH
+        elif dist_right < self.pinch_threshold and is_stable:
+             self.pinch_confidence += self.confidence_growth
              self.pinch_type = "RIGHT"
         else:
-             self.pinch_confidence -= config.CONFIDENCE_DECAY
+             self.pinch_confidence -= self.confidence_decay
             
         # Clamp confidence
         self.pinch_confidence = max(0.0, min(1.0, self.pinch_confidence))
@@ -120,11 +133,11 @@ class GestureClassifier:
         # D. PINCHES
         # Index Pinch
         dist_index = math.hypot(landmarks[4].x - landmarks[8].x, landmarks[4].y - landmarks[8].y)
-        is_pinch_index = dist_index < config.PINCH_THRESHOLD_NORM
+        is_pinch_index = dist_index < self.pinch_threshold
         
         # Middle Pinch
         dist_middle = math.hypot(landmarks[4].x - landmarks[12].x, landmarks[4].y - landmarks[12].y)
-        is_pinch_middle = dist_middle < config.PINCH_THRESHOLD_NORM
+        is_pinch_middle = dist_middle < self.pinch_threshold
         
         # 3. State Determination
         
@@ -0,0 +1,7 @@
+"""
+Gesture states that do not come from the classifier, shared by the control loop,
+the macro engine and the event bus.
+"""
+
+# No hand is tracked
+NO_HAND = "NO_HAND"
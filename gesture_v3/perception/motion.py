@@ -0,0 +1,50 @@
+
+import cv2
+import numpy as np
+from gesture_v3 import config
+
+class MotionGate:
+    """
+    Cheap scene-change detector.
+    Compares a tiny grayscale thumbnail of the current frame against a
+    reference thumbnail (set with mark()), so that expensive detectors only
+    run after something actually changed in front of the camera.
+    """
+    def __init__(self, thumb_size=config.MOTION_THUMB_SIZE,
+                 pixel_delta=config.MOTION_PIXEL_DELTA, area_fraction=config.MOTION_AREA_FRACTION):
+        self.thumb_size = thumb_size
+        self.pixel_delta = pixel_delta
+        self.min_changed = int(area_fraction * thumb_size[0] * thumb_size[1])
+
+        # Preallocated thumbnails / scratch
+        w, h = thumb_size
+        self._small = np.empty((h, w, 3), np.uint8)
+        self._thumb = np.empty((h, w), np.uint8)
+        self._reference = np.empty((h, w), np.uint8)
+        self._diff = np.empty((h, w), np.uint8)
+        self._has_reference = False
+
+    def update(self, frame):
+        """
+        :param frame: BGR frame (any resolution, not modified)
+        :return: True if the scene differs significantly from the reference
+        """
+        # Downscale first, then convert: the colour conversion only touches the thumbnail
+        cv2.resize(frame, self.thumb_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._thumb)
+
+        if not self._has_reference:
+            return True
+
+        cv2.absdiff(self._thumb, self._reference, dst=self._diff)
+        return cv2.countNonZero(cv2.threshold(self._diff, self.pixel_delta, 255, cv2.THRESH_BINARY, dst=self._diff)[1]) >= self.min_changed
+
+    def mark(self):
+        """
+        Use the most recent thumbnail as the new reference.
+        """
+        np.copyto(self._reference, self._thumb)
+        self._has_reference = True
+
+    def reset(self):
+        self._has_reference = False
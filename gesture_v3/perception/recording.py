@@ -0,0 +1,161 @@
+import json
+import os
+import struct
+import numpy as np
+
+MAGIC = b"LMK1"
+NUM_LANDMARKS = 21
+
+# Flags
+HAND_PRESENT = 1
+
+# Handedness codes
+HANDEDNESS = {"Left": 1, "Right": 2}
+HANDEDNESS_NAMES = {v: k for k, v in HANDEDNESS.items()}
+
+# One fixed-size record per processed frame (138 bytes).
+# Normalized coordinates as float16 (~0.0005 resolution in [0, 1], sub-pixel at 1080p)
+RECORD_DTYPE = np.dtype([
+    ("frame", "<u4"),          # Source frame index
+    ("t_ms", "<u4"),           # Source timestamp (ms from start of video)
+    ("flags", "u1"),           # HAND_PRESENT
+    ("handedness", "u1"),      # 0 unknown, 1 Left, 2 Right
+    ("score", "<f2"),          # Handedness score
+    ("xyz", "<f2", (NUM_LANDMARKS, 3)),
+])
+
+class RecordedLandmark:
+    """
+    Landmark view with MediaPipe's .x/.y/.z attributes, so recordings can be replayed through the pipeline.
+    """
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+class LandmarkRecordingWriter:
+    """
+    Streaming writer for the compact landmark recording format.
+    Layout:
+        b"LMK1" | uint32 header length | UTF-8 JSON header | records (RECORD_DTYPE, little endian)
+    Records are buffered and appended in batches to <path>.part; close() renames the
+    finished file into place, so a complete recording is never half-written.
+    A .part file left behind by an interrupted run can be resumed (see resume_frame()).
+    """
+    def __init__(self, path, header=None, resume=False, batch=256):
+        """
+        :param path: Final recording path
+        :param header: JSON-serializable metadata (source, fps, width, height, ...)
+        :param resume: Append to an existing .part file instead of starting over
+        :param batch: Records buffered before each write
+        """
+        self.path = path
+        self.part_path = path + ".part"
+        self.header = header or {}
+        self._buffer = np.zeros(batch, RECORD_DTYPE)
+        self._count = 0
+        self.records_written = 0
+
+        if resume and os.path.exists(self.part_path):
+            header, data_offset, n = _scan(self.part_path)
+            # Drop a torn trailing record from a crash mid-write
+            with open(self.part_path, "r+b") as f:
+                f.truncate(data_offset + n * RECORD_DTYPE.itemsize)
+            self.header = header
+            self.records_written = n
+            self._file = open(self.part_path, "ab")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._file = open(self.part_path, "wb")
+            blob = json.dumps(self.header).encode("utf-8")
+            self._file.write(MAGIC + struct.pack("<I", len(blob)) + blob)
+
+    def append(self, frame, t_ms, landmarks=None, handedness=None, score=0.0):
+        """
+        :param frame: Source frame index
+        :param t_ms: Source timestamp (ms)
+        :param landmarks: 21 MediaPipe landmarks, or None when no hand was found
+        :param handedness: "Left" / "Right" / None
+        :param score: Handedness score
+        """
+        rec = self._buffer[self._count]
+        rec["frame"] = frame
+        rec["t_ms"] = t_ms
+        if landmarks is not None:
+            rec["flags"] = HAND_PRESENT
+            rec["handedness"] = HANDEDNESS.get(handedness, 0)
+            rec["score"] = score
+            rec["xyz"] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+        else:
+            rec["flags"] = 0
+            rec["handedness"] = 0
+            rec["score"] = 0.0
+            rec["xyz"] = 0.0
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._count:
+            self._file.write(self._buffer[:self._count].tobytes())
+            self.records_written += self._count
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        """
+        Flush and move the finished recording into place.
+        """
+        self.flush()
+        self._file.close()
+        os.replace(self.part_path, self.path)
+
+    def abort(self):
+        """
+        Flush what we have and keep the .part file for a later resume.
+        """
+        self.flush()
+        self._file.close()
+
+    def resume_frame(self):
+        """
+        :return: Source frame index to continue from (0 for a fresh file)
+        """
+        if self.records_written == 0:
+            return 0
+        _, data_offset, _ = _scan(self.part_path)
+        with open(self.part_path, "rb") as f:
+            f.seek(data_offset + (self.records_written - 1) * RECORD_DTYPE.itemsize)
+            last = np.frombuffer(f.read(RECORD_DTYPE.itemsize), RECORD_DTYPE)[0]
+        return int(last["frame"]) + 1
+
+def _scan(path):
+    """
+    :return: (header, data offset, number of complete records)
+    """
+    with open(path, "rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"{path}: not a landmark recording")
+        (n,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(n).decode("utf-8"))
+    data_offset = 8 + n
+    count = (os.path.getsize(path) - data_offset) // RECORD_DTYPE.itemsize
+    return header, data_offset, count
+
+def read_recording(path):
+    """
+    Open a recording without loading it.
+    :return: (header dict, memory-mapped record array)
+    """
+    header, data_offset, count = _scan(path)
+    if count == 0:
+        return header, np.zeros(0, RECORD_DTYPE)
+    return header, np.memmap(path, RECORD_DTYPE, mode="r", offset=data_offset, shape=(count,))
+
+def record_landmarks(record):
+    """
+    Landmark objects for one record, or None if no hand was present.
+    """
+    if not record["flags"] & HAND_PRESENT:
+        return None
+    return [RecordedLandmark(x, y, z) for x, y, z in record["xyz"].astype(np.float64).tolist()]
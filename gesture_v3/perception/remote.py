@@ -0,0 +1,177 @@
+import select
+import socket
+import struct
+import time
+import numpy as np
+from gesture_v3 import config
+from gesture_v3.perception.recording import NUM_LANDMARKS, RecordedLandmark
+from gesture_v3.perception.tracker_process import TrackedResult
+
+# One datagram per tracked frame (142 bytes with a hand, 16 without):
+#   b"LM" | u8 version | u8 flags | u32 sequence | u64 capture time (us, sender clock) | 21 x (x, y, z) int16
+MAGIC = b"LM"
+VERSION = 1
+HEADER = struct.Struct("<2sBBIQ")
+LANDMARKS = struct.Struct("<%dh" % (NUM_LANDMARKS * 3))
+PACKET_SIZE = HEADER.size + LANDMARKS.size
+
+FLAG_HAND = 1
+
+# Normalized coordinate -> int16: 1/16384 resolution over [-2, 2) (sub-pixel at 4K)
+QUANT_SCALE = 16384.0
+
+def _newer(seq, last):
+    """
+    Serial-number comparison (RFC 1982 style), so the 32-bit counter may wrap.
+    """
+    return 0 < (seq - last) & 0xFFFFFFFF < 0x80000000
+
+class LandmarkSender:
+    """
+    Tracking side: sends one quantized landmark datagram per frame.
+    Fire-and-forget UDP: a lost frame is superseded by the next one anyway.
+    """
+    def __init__(self, host=config.REMOTE_HOST, port=config.REMOTE_PORT):
+        self.address = (host, port)
+        self.seq = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._packet = bytearray(PACKET_SIZE)
+
+    def send(self, hand_landmarks, timestamp):
+        """
+        :param hand_landmarks: 21 landmarks with .x/.y/.z, or None when no hand was found
+        :param timestamp: Capture time in seconds (time.time())
+        """
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        t_us = int(timestamp * 1e6)
+        if hand_landmarks is None:
+            HEADER.pack_into(self._packet, 0, MAGIC, VERSION, 0, self.seq, t_us)
+            size = HEADER.size
+        else:
+            HEADER.pack_into(self._packet, 0, MAGIC, VERSION, FLAG_HAND, self.seq, t_us)
+            values = []
+            for lm in hand_landmarks:
+                for v in (lm.x, lm.y, lm.z):
+                    q = int(round(v * QUANT_SCALE))
+                    values.append(-32768 if q < -32768 else 32767 if q > 32767 else q)
+            LANDMARKS.pack_into(self._packet, HEADER.size, *values)
+            size = PACKET_SIZE
+        try:
+            self._sock.sendto(memoryview(self._packet)[:size], self.address)
+        except OSError as e:
+            # Receiver not up yet / network hiccup: the next frame tries again
+            if self.seq % 300 == 1:
+                print(f"[REMOTE] Send failed: {e}")
+
+    def close(self):
+        self._sock.close()
+
+class RemoteLandmarkSource:
+    """
+    Control side: stands in for both the camera and the tracker of SystemController.
+    read() waits for the next landmark datagram (or hand_timeout) and returns a small
+    blank preview frame; process() returns the landmarks of that datagram, so they go
+    through the usual smoothing -> classifier -> cursor path unchanged.
+    Only packets newer than the last accepted sequence number are used: late or
+    reordered ones are discarded, queued ones are skipped in favour of the newest
+    (stale landmarks are worse than none for cursor control), and gaps are counted as lost.
+    No packet for hand_timeout means no hand (sender stopped or network down).
+    """
+    def __init__(self, bind=config.REMOTE_BIND, port=config.REMOTE_PORT, hand_timeout=config.REMOTE_HAND_TIMEOUT,
+                 frame_size=(config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT)):
+        """
+        :param bind: Local address to listen on (anything but loopback lets the network move the cursor)
+        :param port: UDP port
+        :param hand_timeout: Seconds without a packet before the hand counts as lost
+        :param frame_size: (w, h) of the blank preview frame
+        """
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((bind, port))
+        self._sock.setblocking(False)
+        self.hand_timeout = hand_timeout
+        self.image = np.zeros((frame_size[1], frame_size[0], 3), np.uint8)
+        self._buf = bytearray(PACKET_SIZE + 1) # +1 detects oversized datagrams
+        self._seen_seq = None # Highest sequence number seen (used or superseded)
+        self._last_packet = 0.0
+        self._result = TrackedResult([])
+        self.received = 0
+        self.lost = 0
+        self.late = 0
+        self.skipped = 0
+        self.latency = 0.0 # Capture -> arrival (seconds), meaningful only with synchronized clocks
+        print(f"[REMOTE] Listening for landmarks on {bind}:{port}")
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        """
+        :return: (True, blank frame); the landmarks are picked up by the following process()
+        """
+        if not self._receive():
+            if time.time() - self._last_packet > self.hand_timeout:
+                self._result = TrackedResult([])
+        return True, self.image
+
+    def process(self, image_rgb, timestamp_ms):
+        return self._result
+
+    def _receive(self):
+        """
+        Wait up to hand_timeout for data, then drain the socket and keep the newest valid packet.
+        :return: True if a new packet was accepted
+        """
+        ready, _, _ = select.select([self._sock], [], [], self.hand_timeout)
+        if not ready:
+            return False
+        newest = None
+        while True:
+            try:
+                n = self._sock.recv_into(self._buf)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            packet = self._parse(n)
+            if packet is None:
+                continue
+            if newest is not None:
+                self.skipped += 1
+            newest = packet
+        if newest is None:
+            return False
+
+        seq, t_us, landmarks = newest
+        now = time.time()
+        self._last_packet = now
+        self.received += 1
+        self.latency = now - t_us / 1e6
+        self._result = TrackedResult([landmarks] if landmarks is not None else [], t_us // 1000)
+        return True
+
+    def _parse(self, n):
+        if n not in (HEADER.size, PACKET_SIZE):
+            return None
+        magic, version, flags, seq, t_us = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            return None
+        seen = self._seen_seq
+        if seen is not None and not _newer(seq, seen):
+            if time.time() - self._last_packet <= self.hand_timeout:
+                self.late += 1
+                return None
+            # Silence and an older number: the sender restarted
+        elif seen is not None:
+            self.lost += ((seq - seen) & 0xFFFFFFFF) - 1
+        self._seen_seq = seq
+        landmarks = None
+        if flags & FLAG_HAND and n == PACKET_SIZE:
+            v = LANDMARKS.unpack_from(self._buf, HEADER.size)
+            s = 1.0 / QUANT_SCALE
+            landmarks = [RecordedLandmark(v[i] * s, v[i + 1] * s, v[i + 2] * s) for i in range(0, len(v), 3)]
+        return seq, t_us, landmarks
+
+    def release(self):
+        self._sock.close()
+        print(f"[REMOTE] {self.received} frames used, {self.lost} lost, {self.late} late/reordered, "
+              f"{self.skipped} superseded")
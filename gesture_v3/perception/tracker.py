@@ -16,9 +16,15 @@ class HandTracker:
     """
     Wrapper for MediaPipe Hand Landmarker.
     Uses VIDEO mode for temporal consistency (internal smoothing).
+    IMAGE mode treats every frame independently (batch extraction of unrelated frames).
     """
-    def __init__(self, model_path="hand_landmarker.task"):
+    def __init__(self, model_path="hand_landmarker.task", mode="video"):
+        """
+        :param model_path: hand_landmarker.task location
+        :param mode: "video" (timestamps must increase) or "image" (independent frames)
+        """
         self.model_path = model_path
+        self.mode = mode
         if not os.path.exists(self.model_path):
              # Try looking one level up if not found (development convenience)
              if os.path.exists("../" + model_path):
@@ -32,7 +38,7 @@ class HandTracker:
         # It requires timestamps to be passed in strictly increasing order.
         options = vision.HandLandmarkerOptions(
             base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
+            running_mode=vision.RunningMode.IMAGE if mode == "image" else vision.RunningMode.VIDEO,
             num_hands=1, # Version 1 restricted to single hand
             min_hand_detection_confidence=0.5,
             min_hand_presence_confidence=0.5,
@@ -44,13 +50,18 @@ class HandTracker:
         """
         Process a frame.
         :param image_rgb: OpenCV Image (RGB)
-        :param timestamp_ms: Current timestamp in milliseconds (Must be increasing!)
+        :param timestamp_ms: Current timestamp in milliseconds (Must be increasing! Ignored in image mode)
         :return: Detection result
         """
         # Create MediaPipe Image
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
         
         # Detect
+        if self.mode == "image":
+            return self.landmarker.detect(mp_image)
         result = self.landmarker.detect_for_video(mp_image, int(timestamp_ms))
         
         return result
+
+    def close(self):
+        self.landmarker.close()
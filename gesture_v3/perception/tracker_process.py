@@ -0,0 +1,281 @@
+import math
+import multiprocessing as mp
+import time
+import cv2
+import numpy as np
+from multiprocessing import shared_memory
+from gesture_v3.perception.recording import NUM_LANDMARKS, RecordedLandmark
+
+MAX_HANDS = 1 # HandTracker is configured for a single hand
+
+# Reply code for a frame the worker skipped because a newer one was queued
+DROPPED = -1
+
+def _worker_main(conn, frames_name, results_name, slot_bytes, model_path):
+    """
+    Worker process entry point.
+    Receives (slot, timestamp_ms, shape) for a frame already written to the shared
+    frame ring, writes landmarks for that slot into the shared result block and
+    replies (slot, timestamp_ms, num_hands). Older queued frames are answered with
+    DROPPED so the control process can reuse their slots.
+    """
+    from gesture_v3.perception.tracker import HandTracker
+
+    frames_shm = shared_memory.SharedMemory(name=frames_name)
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    results = np.ndarray((len(results_shm.buf) // (MAX_HANDS * NUM_LANDMARKS * 3 * 4), MAX_HANDS, NUM_LANDMARKS, 3),
+                         np.float32, buffer=results_shm.buf)
+    try:
+        tracker = HandTracker(model_path)
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+    conn.send(("ready", None))
+
+    last_ts = -1
+    frame = None
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                return
+            # Only the newest frame matters; hand the older slots straight back
+            while msg is not None and conn.poll():
+                conn.send((msg[0], msg[1], DROPPED))
+                msg = conn.recv()
+            if msg is None: # Shutdown
+                return
+
+            slot, timestamp_ms, shape = msg
+            if timestamp_ms <= last_ts: # VIDEO mode rejects non-increasing timestamps
+                conn.send((slot, timestamp_ms, 0))
+                continue
+            last_ts = timestamp_ms
+
+            frame = np.ndarray(shape, np.uint8, buffer=frames_shm.buf, offset=slot * slot_bytes)
+            try:
+                result = tracker.process(frame, timestamp_ms)
+                hands = result.hand_landmarks[:MAX_HANDS]
+                for h, hand in enumerate(hands):
+                    results[slot, h] = [(lm.x, lm.y, lm.z) for lm in hand]
+                conn.send((slot, timestamp_ms, len(hands)))
+            except Exception as e:
+                print(f"[TRACKER] Worker error: {e}")
+                conn.send((slot, timestamp_ms, 0))
+    finally:
+        del frame, results
+        frames_shm.close()
+        results_shm.close()
+
+class TrackedResult:
+    """
+    Subset of MediaPipe's HandLandmarkerResult used by the pipeline.
+    stale marks a repeat of an earlier frame's result (no fresh one was available).
+    """
+    __slots__ = ("hand_landmarks", "timestamp_ms", "stale")
+
+    def __init__(self, hand_landmarks, timestamp_ms=0, stale=False):
+        self.hand_landmarks = hand_landmarks
+        self.timestamp_ms = timestamp_ms
+        self.stale = stale
+
+class HandTrackerProcess:
+    """
+    HandTracker running in its own process, fed through shared memory.
+    Frames are written into a ring of preallocated shared slots (ideally directly, via
+    acquire()); only (slot, timestamp, shape) crosses the pipe. Landmarks come back in a
+    shared result block, again with only (slot, timestamp, hand count) on the pipe.
+    Inference then never holds this process's GIL, so capture, control and the HUD
+    thread keep running while MediaPipe works.
+    Modes:
+    - blocking (default): process() waits for this frame's landmarks (same latency as in-process);
+      past timeout it returns the previous landmarks marked stale
+    - pipelined: process() submits and returns the newest finished result (one frame older),
+      so capture/preprocess of the next frame overlaps inference
+    Drop-in for HandTracker.process().
+    """
+    def __init__(self, frame_shape, slots=3, pipelined=False, timeout=0.5, model_path="hand_landmarker.task"):
+        """
+        :param frame_shape: Largest (h, w, 3) frame that will be submitted
+        :param slots: Frame ring size (in-flight frames + one being written)
+        :param pipelined: Return the newest finished result instead of waiting
+        :param timeout: Seconds to wait for a result in blocking mode before giving up on it
+        :param model_path: hand_landmarker.task location (resolved in the worker)
+        """
+        self.slot_bytes = int(np.prod(frame_shape))
+        self.slots = slots
+        self.pipelined = pipelined
+        self.timeout = timeout
+        self.model_path = model_path
+
+        self._frames_shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        self._results_shm = shared_memory.SharedMemory(create=True, size=slots * MAX_HANDS * NUM_LANDMARKS * 3 * 4)
+        self._results = np.ndarray((slots, MAX_HANDS, NUM_LANDMARKS, 3), np.float32, buffer=self._results_shm.buf)
+
+        self._free = list(range(slots))
+        self._shapes = [None] * slots # Frame shape written into each slot
+        self._lost = False
+        self._acquired = None # (slot, view) handed out by acquire()
+        self._latest = TrackedResult([])
+        self._latest_ts = -1
+
+        ctx = mp.get_context("spawn") # MediaPipe / OpenCV state is not fork-safe
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_worker_main, name="HandTrackerProcess", daemon=True,
+                                    args=(child_conn, self._frames_shm.name, self._results_shm.name,
+                                          self.slot_bytes, model_path))
+
+    def start(self, timeout=30.0):
+        """
+        Start the worker and wait until its landmarker is loaded.
+        :raises RuntimeError: The worker could not create the landmarker
+        """
+        self._process.start()
+        try:
+            if not self._conn.poll(timeout):
+                raise RuntimeError("HandTracker worker did not start")
+            kind, detail = self._conn.recv()
+        except (EOFError, OSError):
+            kind, detail = "error", f"worker exited with code {self._process.exitcode}"
+        except RuntimeError:
+            self.stop()
+            raise
+        if kind != "ready":
+            self.stop()
+            raise RuntimeError(f"HandTracker worker failed: {detail}")
+
+    def acquire(self, shape):
+        """
+        Borrow a free frame slot to write the next frame into (e.g. as cvtColor's dst).
+        Passing the returned array to process() skips the copy.
+        :return: uint8 array of the given shape, or None if the ring is full / frame too large
+        """
+        shape = tuple(shape)
+        if int(np.prod(shape)) > self.slot_bytes:
+            return None
+        if self._acquired is not None:
+            slot, view = self._acquired
+            if view.shape == shape:
+                return view
+        else:
+            self._drain(block=False)
+            if not self._free:
+                return None
+            slot = self._free.pop()
+        view = np.ndarray(shape, np.uint8, buffer=self._frames_shm.buf, offset=slot * self.slot_bytes)
+        self._acquired = (slot, view)
+        self._shapes[slot] = shape
+        return view
+
+    def process(self, image_rgb, timestamp_ms):
+        """
+        Same contract as HandTracker.process().
+        :param image_rgb: RGB frame (an acquire()d slot is used in place)
+        :param timestamp_ms: Increasing timestamp in milliseconds
+        :return: TrackedResult with .hand_landmarks
+        """
+        timestamp_ms = int(timestamp_ms)
+        if self._acquired is not None and self._acquired[1] is image_rgb:
+            slot = self._acquired[0]
+        else:
+            if self._acquired is not None: # Borrowed but not used for this frame
+                self._free.append(self._acquired[0])
+            slot = self._take_slot(image_rgb)
+            if slot is None:
+                return self._stale() # Worker is saturated: skip this frame
+        self._acquired = None
+
+        try:
+            self._conn.send((slot, timestamp_ms, self._shapes[slot]))
+        except (BrokenPipeError, OSError):
+            self._free.append(slot)
+            return self._worker_lost()
+
+        if self.pipelined:
+            self._drain(block=False)
+            return self._latest
+
+        deadline = time.perf_counter() + self.timeout
+        while self._latest_ts < timestamp_ms:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self._drain(block=True, timeout=remaining):
+                if not self._process.is_alive():
+                    return self._worker_lost()
+                # Keep the previous landmarks rather than reporting the hand lost;
+                # the late result will be picked up later
+                return self._stale()
+        return self._latest if self._latest_ts == timestamp_ms else self._stale()
+
+    def _stale(self):
+        latest = self._latest
+        return TrackedResult(latest.hand_landmarks, latest.timestamp_ms, stale=True)
+
+    def _take_slot(self, image_rgb):
+        self._drain(block=False)
+        if not self._free:
+            if self.pipelined:
+                return None
+            # Blocking mode: wait for the worker to hand a slot back
+            self._drain(block=True, timeout=self.timeout)
+            if not self._free:
+                return None
+        slot = self._free.pop()
+        h, w = image_rgb.shape[:2]
+        if image_rgb.nbytes > self.slot_bytes:
+            # Larger than planned (camera ignored the requested size): landmarks are
+            # normalized, so shrinking into the slot is harmless
+            scale = math.sqrt(self.slot_bytes / image_rgb.nbytes)
+            h, w = int(h * scale), int(w * scale)
+        dst = np.ndarray((h, w, 3), np.uint8, buffer=self._frames_shm.buf, offset=slot * self.slot_bytes)
+        if (h, w) == image_rgb.shape[:2]:
+            np.copyto(dst, image_rgb)
+        else:
+            cv2.resize(image_rgb, (w, h), dst=dst, interpolation=cv2.INTER_AREA)
+        self._shapes[slot] = (h, w, 3)
+        return slot
+
+    def _drain(self, block, timeout=0.0):
+        """
+        Collect replies, free their slots and keep the newest result.
+        :return: True if at least one reply was read
+        """
+        got = False
+        try:
+            while self._conn.poll(timeout if block and not got else 0):
+                slot, timestamp_ms, hands = self._conn.recv()
+                got = True
+                if hands != DROPPED and timestamp_ms > self._latest_ts:
+                    # Copy out before the slot is reused
+                    self._latest = TrackedResult(
+                        [[RecordedLandmark(x, y, z) for x, y, z in self._results[slot, h].tolist()] for h in range(hands)],
+                        timestamp_ms)
+                    self._latest_ts = timestamp_ms
+                self._free.append(slot)
+        except (EOFError, OSError):
+            pass
+        return got
+
+    def _worker_lost(self):
+        if not self._lost:
+            print("[TRACKER] Worker process is gone; no landmarks until restart.")
+            self._lost = True
+        self._latest = TrackedResult([])
+        return self._latest
+
+    def stop(self):
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._acquired = None
+        self._results = None
+        for shm in (self._frames_shm, self._results_shm):
+            try:
+                shm.close()
+            except BufferError:
+                pass # A caller still holds a slot view; the mapping goes away with it
+            shm.unlink()
@@ -0,0 +1,65 @@
+import threading
+import time
+import numpy as np
+from gesture_v3 import config
+
+class TrackerWarmup:
+    """
+    Runs dummy inferences through a freshly created tracker on a background thread,
+    so MediaPipe's first-call costs (graph and delegate setup, buffer allocation) are
+    paid while the camera opens and the UI starts instead of on the user's first frames.
+    Stops once latency is steady: the last three calls within steady_ratio of each
+    other, after at least min_frames and at most max_frames calls.
+    ready is set when done (also on failure); the tracker must not be used before that,
+    and later timestamps must stay above last_ts.
+    Blank frames exercise the palm detector path (what runs until a hand appears);
+    the landmark model itself is only reached once a real hand is in view.
+    """
+    def __init__(self, tracker, start_time, shape=(config.CAPTURE_HEIGHT, config.CAPTURE_WIDTH, 3),
+                 min_frames=config.WARMUP_MIN_FRAMES, max_frames=config.WARMUP_MAX_FRAMES,
+                 steady_ratio=config.WARMUP_STEADY_RATIO):
+        """
+        :param tracker: Object with process(image_rgb, timestamp_ms)
+        :param start_time: Timestamp origin shared with the control loop (VIDEO mode needs increasing timestamps)
+        :param shape: Dummy frame shape (the real capture size, so buffers are sized once)
+        :param min_frames: Inferences always run
+        :param max_frames: Give up waiting for a steady latency after this many
+        :param steady_ratio: Max / min of the last three latencies that counts as steady
+        """
+        self.tracker = tracker
+        self.start_time = start_time
+        self.shape = shape
+        self.min_frames = max(3, min_frames)
+        self.max_frames = max(self.min_frames, max_frames)
+        self.steady_ratio = steady_ratio
+        self.latencies = []
+        self.last_ts = -1 # Last timestamp sent to the tracker (the loop continues above it)
+        self.ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="TrackerWarmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    def _steady(self):
+        last = self.latencies[-3:]
+        return len(self.latencies) >= self.min_frames and max(last) <= min(last) * self.steady_ratio
+
+    def _run(self):
+        image = np.zeros(self.shape, np.uint8)
+        try:
+            while len(self.latencies) < self.max_frames and not self._steady():
+                ts = max(int((time.time() - self.start_time) * 1000), self.last_ts + 1)
+                self.last_ts = ts
+                t = time.perf_counter()
+                self.tracker.process(image, ts)
+                self.latencies.append(time.perf_counter() - t)
+            print(f"[WARMUP] HandTracker ready after {len(self.latencies)} inferences "
+                  f"(first {self.latencies[0] * 1000:.1f} ms, now {self.latencies[-1] * 1000:.1f} ms)")
+        except Exception as e:
+            print(f"[WARMUP] HandTracker warm-up failed: {e}")
+        finally:
+            self.ready.set()
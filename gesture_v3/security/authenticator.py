@@ -1,15 +1,121 @@
 import cv2
-import face_recognition
-import pickle
 import os
 import time
 import numpy as np
 import sys
+from gesture_v3 import config
+from gesture_v3.perception.motion import MotionGate
+from gesture_v3.security.face_worker import FaceVerificationWorker
+from gesture_v3.security.face_tracker import FaceROITracker
+from gesture_v3.security.profile_store import FaceProfileStore
+
+# --- HUD LAYOUT (BGR) ---
+COLOR_CYAN = (255, 255, 0)
+COLOR_RED = (0, 0, 255)
+COLOR_GREEN = (0, 255, 0)
+COLOR_WHITE = (255, 255, 255)
+
+GRID_SPACING = 60
+GRID_COLOR = (0, 40, 0)
+GRID_ALPHA = 0.3
+TARGET_RADIUS = 180
+TARGET_SEGMENTS = 4
+TARGET_GAP = 20
+HUD_MARGIN = 40
+HUD_LINE_LEN = 80
+SCAN_GLOW_HALF = 7      # Glow band is 15px tall around the scan line
+SCAN_GLOW_ALPHA = 0.4
+HEADER_TEXT = "SECURE GATEWAY V3.1"
+
+STATUS_TEXT = {
+    "GRANTED": ("IDENTITY VERIFIED", "ACCESS GRANTED"),
+    "FAILED": ("UNKNOWN IDENTITY", "ACCESS DENIED"),
+    "NO_PROFILE": ("SYSTEM LOCKED", "REGISTRATION REQUIRED"),
+    "SCANNING": ("BIOMETRIC SCAN", "ALIGN FACE IN TARGET ZONE"),
+    "LOADING": ("INITIALIZING", "LOADING FACE MODELS"),
+    "ERROR": ("FACE ENGINE OFFLINE", "SEE CONSOLE - PRESS Q TO QUIT"),
+}
+
+
+class _SparseOverlay:
+    """
+    Premultiplied overlay stored only where alpha > 0.
+    Composite on those pixels: dst = dst * (1 - alpha) + premul
+    Fully opaque pixels are a plain scatter, and full-width opaque row
+    bands are a single block copy. Suited to thin, sparse artwork.
+    """
+    def __init__(self, layer, alpha, solid_rows=(0, 0)):
+        r0, r1 = solid_rows
+        self.solid_rows = (r0, r1)
+        self.solid = layer[r0:r1].copy()
+
+        a = alpha.copy()
+        a[r0:r1] = 0.0
+        flat_a = a.reshape(-1)
+        flat_layer = layer.reshape(-1, 3)
+
+        opaque = flat_a >= 1.0
+        self.opaque_idx = np.flatnonzero(opaque)
+        self.opaque_val = flat_layer[self.opaque_idx]
+
+        self.blend_idx = np.flatnonzero((flat_a > 0.0) & ~opaque)
+        blend_a = flat_a[self.blend_idx, None]
+        self.premul = flat_layer[self.blend_idx].astype(np.float32) * blend_a
+        self.inv_alpha = 1.0 - blend_a
+
+    def apply(self, img):
+        """
+        Composite in place.
+        """
+        if not img.flags.c_contiguous:
+            # reshape() of a view (crop, flip) would be a copy and drop the writes:
+            # composite a contiguous copy and write it back
+            tmp = np.ascontiguousarray(img)
+            self.apply(tmp)
+            img[...] = tmp
+            return
+        flat = img.reshape(-1, 3)
+        if len(self.blend_idx):
+            flat[self.blend_idx] = flat[self.blend_idx] * self.inv_alpha + self.premul
+        if len(self.opaque_idx):
+            flat[self.opaque_idx] = self.opaque_val
+        r0, r1 = self.solid_rows
+        if r1 > r0:
+            img[r0:r1] = self.solid
+
+
+class _GridOverlay:
+    """
+    Uniform 1px grid at constant alpha. Only the grid rows/columns are
+    blended (dst = dst * (1 - alpha) + color * alpha), each with one
+    in-place cv2.addWeighted against a cached solid strip.
+    """
+    def __init__(self, w, h, spacing, color, alpha):
+        self.xs = range(0, w, spacing)
+        self.ys = range(0, h, spacing)
+        self.spacing = spacing
+        self.alpha = alpha
+        self.row_strip = np.full((1, w, 3), color, np.uint8)
+        self.col_strip = np.full((h, 1, 3), color, np.uint8)
+
+    def apply(self, img):
+        a = self.alpha
+        for y in self.ys:
+            row = img[y:y + 1]
+            cv2.addWeighted(row, 1.0 - a, self.row_strip, a, 0, dst=row)
+        # Crossings were blended with the rows already; keep them from being blended twice
+        crossings = img[::self.spacing, ::self.spacing].copy()
+        for x in self.xs:
+            col = img[:, x:x + 1]
+            cv2.addWeighted(col, 1.0 - a, self.col_strip, a, 0, dst=col)
+        img[::self.spacing, ::self.spacing] = crossings
+
 
 class FaceAuthenticator:
     def __init__(self):
-        self.auth_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'security', 'auth.dat')
-        self.known_encoding = None
+        self.profiles = FaceProfileStore()
+        self.match_tolerance = 0.5
+        self.authenticated_user = None
         self.load_profile()
         
         # UI Animation State
@@ -17,62 +123,130 @@ class FaceAuthenticator:
         self.scan_direction = 1
         self.scan_speed = 15
 
+        # Cached static HUD layers
+        self._grid_cache = {}    # (w, h) -> _GridOverlay
+        self._static_cache = {}  # (w, h, status) -> _SparseOverlay
+        self._glow_cache = {}    # (w, color) -> solid glow band
+
     def load_profile(self):
-        if os.path.exists(self.auth_file):
-            try:
-                with open(self.auth_file, 'rb') as f:
-                    self.known_encoding = pickle.load(f)
-                print("[SECURITY] Profile loaded.")
-            except Exception as e:
-                print(f"[SECURITY] Error loading profile: {e}")
+        try:
+            count = self.profiles.load()
+        except Exception as e:
+            print(f"[SECURITY] Error loading profiles: {e}")
+            return
+        if count:
+            print(f"[SECURITY] {count} encodings loaded for {len(self.profiles.users())} user(s).")
         else:
             print("[SECURITY] No registered face found.")
 
+    def identify(self, face_encodings):
+        """
+        Match encodings against every enrolled user at once.
+        :return: Matched user id, or None
+        """
+        for user_id, _ in self.profiles.match(face_encodings, tolerance=self.match_tolerance):
+            if user_id is not None:
+                return user_id
+        return None
+
+    def _status_color(self, status):
+        if status == "GRANTED":
+            return COLOR_GREEN
+        if status in ("FAILED", "NO_PROFILE", "ERROR"):
+            return COLOR_RED
+        return COLOR_CYAN
+
+    def _grid_layer(self, w, h):
+        """
+        Background grid (30% over the camera feed), built once per resolution.
+        """
+        key = (w, h)
+        overlay = self._grid_cache.get(key)
+        if overlay is None:
+            overlay = self._grid_cache[key] = _GridOverlay(w, h, GRID_SPACING, GRID_COLOR, GRID_ALPHA)
+        return overlay
+
+    def _static_layer(self, w, h, status):
+        """
+        Target ring, corner brackets, status bar and header for one status,
+        rendered once per (resolution, status) as an opaque sparse overlay.
+        """
+        key = (w, h, status)
+        overlay = self._static_cache.get(key)
+        if overlay is not None:
+            return overlay
+
+        target_color = self._status_color(status)
+        layer = np.zeros((h, w, 3), np.uint8)
+
+        # 1. Central Target Zone (segmented circle)
+        center_x, center_y = w // 2, h // 2
+        angle_step = 360 / TARGET_SEGMENTS
+        for i in range(TARGET_SEGMENTS):
+            start_angle = i * angle_step + TARGET_GAP
+            end_angle = (i + 1) * angle_step - TARGET_GAP
+            cv2.ellipse(layer, (center_x, center_y), (TARGET_RADIUS, TARGET_RADIUS), 0, start_angle, end_angle, target_color, 2)
+            cv2.ellipse(layer, (center_x, center_y), (TARGET_RADIUS-10, TARGET_RADIUS-10), 0, start_angle, end_angle, target_color, 1)
+
+        # 2. Corner HUD
+        margin, line_len = HUD_MARGIN, HUD_LINE_LEN
+        for cx, sx in ((margin, 1), (w - margin, -1)):
+            for cy, sy in ((margin, 1), (h - margin, -1)):
+                cv2.line(layer, (cx, cy), (cx + sx * line_len, cy), target_color, 4)
+                cv2.line(layer, (cx, cy), (cx, cy + sy * line_len), target_color, 4)
+
+        # 3. Status bar: opaque black background with centred text
+        main_text, sub_text = STATUS_TEXT.get(status, STATUS_TEXT["SCANNING"])
+        bar_top = max(0, h - 100)
+        layer[bar_top:h] = 0
+        cv2.line(layer, (0, h - 100), (w, h - 100), target_color, 2)
+
+        text_size = cv2.getTextSize(main_text, cv2.FONT_HERSHEY_DUPLEX, 1.2, 2)[0]
+        text_x = (w - text_size[0]) // 2
+        cv2.putText(layer, main_text, (text_x, h - 60), cv2.FONT_HERSHEY_DUPLEX, 1.2, target_color, 2)
+
+        sub_size = cv2.getTextSize(sub_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 1)[0]
+        sub_x = (w - sub_size[0]) // 2
+        cv2.putText(layer, sub_text, (sub_x, h - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLOR_WHITE, 1)
+
+        # 4. Top Header
+        header_org = (margin + 20, margin + 50)
+        cv2.putText(layer, HEADER_TEXT, header_org, cv2.FONT_HERSHEY_PLAIN, 1.2, target_color, 1)
+
+        # Opaque wherever something was drawn; the status bar rows are one block copy
+        alpha = np.any(layer != 0, axis=2).astype(np.float32)
+        overlay = self._static_cache[key] = _SparseOverlay(layer, alpha, solid_rows=(bar_top, h))
+        return overlay
+
+    def _glow_band(self, w, color):
+        key = (w, color)
+        band = self._glow_cache.get(key)
+        if band is None:
+            band = self._glow_cache[key] = np.full((2 * SCAN_GLOW_HALF + 1, w, 3), color, np.uint8)
+        return band
+
     def draw_hud(self, img, w, h, status="SCANNING", face_loc=None):
-        # Colors
-        COLOR_CYAN = (255, 255, 0)
-        COLOR_RED = (0, 0, 255)
-        COLOR_GREEN = (0, 255, 0)
-        COLOR_WHITE = (255, 255, 255)
-        
-        overlay = img.copy()
-        
+        """
+        Composite the security HUD onto the camera frame in place.
+        Static layers are cached per resolution/status; only the grid pixels,
+        the scan band and the cached overlay pixels are touched each frame.
+        """
+        target_color = self._status_color(status)
+
         # 1. Background Grid Effect
-        grid_spacing = 60
-        for x in range(0, w, grid_spacing):
-            cv2.line(overlay, (x, 0), (x, h), (0, 40, 0), 1)
-        for y in range(0, h, grid_spacing):
-            cv2.line(overlay, (0, y), (w, y), (0, 40, 0), 1)
-            
-        cv2.addWeighted(overlay, 0.3, img, 0.7, 0, img)
-        
-        # 2. Central Target Zone (The "Space" the user asked for)
-        center_x, center_y = w // 2, h // 2
-        radius = 180
-        
-        # Draw segmented circle for Target Zone
-        # Segments
-        n_segments = 4
-        angle_step = 360 / n_segments
-        gap = 20
-        
-        target_color = COLOR_CYAN
-        if status == "GRANTED": target_color = COLOR_GREEN
-        elif status == "FAILED" or status == "NO_PROFILE": target_color = COLOR_RED
-        
-        for i in range(n_segments):
-            start_angle = i * angle_step + gap
-            end_angle = (i + 1) * angle_step - gap
-            cv2.ellipse(img, (center_x, center_y), (radius, radius), 0, start_angle, end_angle, target_color, 2)
-            cv2.ellipse(img, (center_x, center_y), (radius-10, radius-10), 0, start_angle, end_angle, target_color, 1)
+        self._grid_layer(w, h).apply(img)
 
-        # 3. Scanning Animation (Vertical Line)
+        # 2. Scanning Animation (Vertical Line)
         if status in ["SCANNING", "SEARCHING", "ANALYZING"]:
+            # Glow: blend only the band around the scan line
+            y0 = max(0, self.scan_line_y - SCAN_GLOW_HALF)
+            y1 = min(h, self.scan_line_y + SCAN_GLOW_HALF + 1)
+            if y1 > y0:
+                band = img[y0:y1]
+                glow = self._glow_band(w, target_color)[:y1 - y0]
+                cv2.addWeighted(band, 1.0 - SCAN_GLOW_ALPHA, glow, SCAN_GLOW_ALPHA, 0, dst=band)
             cv2.line(img, (0, self.scan_line_y), (w, self.scan_line_y), target_color, 2)
-            # Glow
-            cv2.line(overlay, (0, self.scan_line_y), (w, self.scan_line_y), target_color, 15)
-            cv2.addWeighted(overlay, 0.4, img, 0.6, 0, img)
-            
+
             self.scan_line_y += (self.scan_speed * self.scan_direction)
             if self.scan_line_y > h or self.scan_line_y < 0:
                 self.scan_direction *= -1
@@ -80,55 +254,12 @@ class FaceAuthenticator:
             # Analysis Text near scanner
             cv2.putText(img, f"SCAN_Y: {self.scan_line_y:04d}", (20, self.scan_line_y - 10), cv2.FONT_HERSHEY_PLAIN, 1, target_color, 1)
 
-        # 4. Corner HUD
-        margin = 40
-        line_len = 80
-        
-        # Top-Left
-        cv2.line(img, (margin, margin), (margin + line_len, margin), target_color, 4)
-        cv2.line(img, (margin, margin), (margin, margin + line_len), target_color, 4)
-        # Top-Right
-        cv2.line(img, (w - margin, margin), (w - margin - line_len, margin), target_color, 4)
-        cv2.line(img, (w - margin, margin), (w - margin, margin + line_len), target_color, 4)
-        # Bottom-Left
-        cv2.line(img, (margin, h - margin), (margin + line_len, h - margin), target_color, 4)
-        cv2.line(img, (margin, h - margin), (margin, h - margin - line_len), target_color, 4)
-        # Bottom-Right
-        cv2.line(img, (w - margin, h - margin), (w - margin - line_len, h - margin), target_color, 4)
-        cv2.line(img, (w - margin, h - margin), (w - margin, h - margin - line_len), target_color, 4)
-
-        # 5. Dynamic Status Text
-        if status == "GRANTED":
-            main_text = "IDENTITY VERIFIED"
-            sub_text = "ACCESS GRANTED"
-        elif status == "FAILED":
-            main_text = "UNKNOWN IDENTITY"
-            sub_text = "ACCESS DENIED"
-        elif status == "NO_PROFILE":
-            main_text = "SYSTEM LOCKED"
-            sub_text = "REGISTRATION REQUIRED"
-        else: # SCANNING / ANALYZING
-            main_text = "BIOMETRIC SCAN"
-            sub_text = "ALIGN FACE IN TARGET ZONE"
-        
-        # Background for text
-        cv2.rectangle(img, (0, h - 100), (w, h), (0, 0, 0), -1)
-        cv2.line(img, (0, h - 100), (w, h - 100), target_color, 2)
-        
-        # Draw Text
-        text_size = cv2.getTextSize(main_text, cv2.FONT_HERSHEY_DUPLEX, 1.2, 2)[0]
-        text_x = (w - text_size[0]) // 2
-        cv2.putText(img, main_text, (text_x, h - 60), cv2.FONT_HERSHEY_DUPLEX, 1.2, target_color, 2)
-        
-        sub_size = cv2.getTextSize(sub_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 1)[0]
-        sub_x = (w - sub_size[0]) // 2
-        cv2.putText(img, sub_text, (sub_x, h - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, COLOR_WHITE, 1)
-
-        # Top Header
-        cv2.putText(img, "SECURE GATEWAY V3.1", (margin + 20, margin + 50), cv2.FONT_HERSHEY_PLAIN, 1.2, target_color, 1)
+        # 3. Target zone, corners, status bar, header
+        self._static_layer(w, h, status).apply(img)
 
-        # 6. Face Highlighting (if detected)
+        # 4. Face Highlighting (if detected)
         if face_loc:
+            center_x, center_y = w // 2, h // 2
             top, right, bottom, left = face_loc
             # Connecting lines to center
             cv2.line(img, (left, top), (center_x, center_y), target_color, 1)
@@ -140,10 +271,15 @@ class FaceAuthenticator:
     def login_loop(self, cap):
         """
         Blocking loop that prevents system access until face is matched.
+        Face detection/encoding runs in a background process; the UI loop
+        only submits the latest downscaled frame and picks up results.
+        Checks are gated by a thumbnail motion detector: a static scene is
+        re-checked only on a heartbeat that backs off while nothing happens.
+        Once a face is found, later checks search only a tracked ROI around it.
         Returns entries to the main loop.
         """
         # Removed the early return for missing profile
-        # if self.known_encoding is None: ...
+        # if not len(self.profiles): ...
         
         print("[SECURITY] LOCKED. Waiting for face match...")
         
@@ -153,76 +289,102 @@ class FaceAuthenticator:
         if not cap.isOpened():
             cap.open(0)
 
-        last_check_time = 0
-        check_interval = 0.5 
-        
         # Determine initial status
-        if self.known_encoding is None:
+        if len(self.profiles) == 0:
             status = "NO_PROFILE"
+            worker = None
         else:
-            status = "SCANNING"
+            status = "LOADING"
+            worker = FaceVerificationWorker()
+            worker.start()
             
         face_location_display = None
+
+        motion = MotionGate()
+        tracker = FaceROITracker()
+        heartbeat = config.LOGIN_HEARTBEAT_MIN
+        next_check = 0.0
         
-        start_time = time.time()
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                continue
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    continue
 
-            frame = cv2.flip(frame, 1)
-            h, w, c = frame.shape
-            
-            # 1. Processing (throttled)
-            current_time = time.time()
-            if current_time - last_check_time > check_interval:
-                last_check_time = current_time
+                frame = cv2.flip(frame, 1)
+                h, w, c = frame.shape
                 
+                # 1. Processing (asynchronous)
                 # If no profile, we can't match, so just stay in NO_PROFILE state
-                if self.known_encoding is not None:
-                    # Face Check
-                    small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-                    rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-                    
-                    face_locations = face_recognition.face_locations(rgb_small_frame)
-                    
-                    if face_locations:
-                        status = "ANALYZING"
-                        # Just take the first face for UI display purposes (scaled back up)
-                        top, right, bottom, left = face_locations[0]
-                        face_location_display = (top*4, right*4, bottom*4, left*4)
-                        
-                        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
-                        
-                        match_found = False
-                        for encoding in face_encodings:
-                            matches = face_recognition.compare_faces([self.known_encoding], encoding, tolerance=0.5)
-                            if True in matches:
-                                match_found = True
-                                status = "GRANTED"
-                                break
-                        
-                        if match_found:
-                            # Show Success UI for a moment
-                            self.draw_hud(frame, w, h, status="GRANTED", face_loc=face_location_display)
-                            cv2.imshow("SECURITY CHECK", frame)
-                            cv2.waitKey(1500) # Pause to show success
-                            cv2.destroyWindow("SECURITY CHECK")
-                            return True
+                if worker is not None:
+                    current_time = time.time()
+
+                    # Scene changed since the last check: check again right away
+                    if motion.update(frame):
+                        heartbeat = config.LOGIN_HEARTBEAT_MIN
+                        next_check = current_time
+
+                    result = worker.poll()
+                    if result is not None:
+                        face_locations, face_encodings = result
+                        tracker.update(face_locations)
+                        if face_locations:
+                            # Someone is there: keep checking continuously
+                            heartbeat = config.LOGIN_HEARTBEAT_MIN
+                            next_check = current_time
+                            # Just take the first face for UI display purposes (scaled back up)
+                            top, right, bottom, left = face_locations[0]
+                            face_location_display = (top*4, right*4, bottom*4, left*4)
+                            
+                            user_id = self.identify(face_encodings)
+                            
+                            if user_id is not None:
+                                self.authenticated_user = user_id
+                                print(f"[SECURITY] Access granted: {user_id}")
+                                # Show Success UI for a moment
+                                self.draw_hud(frame, w, h, status="GRANTED", face_loc=face_location_display)
+                                cv2.imshow("SECURITY CHECK", frame)
+                                cv2.waitKey(1500) # Pause to show success
+                                cv2.destroyWindow("SECURITY CHECK")
+                                return True
+                            else:
+                                status = "FAILED"
                         else:
-                            status = "FAILED"
-                    else:
-                        status = "SCANNING"
+                            status = "SCANNING"
+                            face_location_display = None
+                            # Empty scene: slow heartbeat, backing off
+                            next_check = current_time + heartbeat
+                            heartbeat = min(heartbeat * 2.0, config.LOGIN_HEARTBEAT_MAX)
+                    elif worker.failed:
+                        status = "ERROR"
                         face_location_display = None
-                else:
-                    status = "NO_PROFILE"
+                    elif status == "LOADING" and worker.ready:
+                        status = "SCANNING"
 
-            # 2. Draw UI
-            self.draw_hud(frame, w, h, status=status, face_loc=face_location_display)
-            
-            cv2.imshow("SECURITY CHECK", frame)
-            key = cv2.waitKey(1)
-            if key == ord('q'):
-                print("System Terminated by User.")
-                sys.exit(0)
+                    # Feed the worker the newest frame when a check is due (once its models are loaded)
+                    if worker.ready and not worker.busy and current_time >= next_check:
+                        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
+                        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                        small_gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+
+                        # Search only around the tracked face, full frame otherwise
+                        roi = tracker.roi(small_gray)
+                        if roi is not None:
+                            x0, y0, x1, y1 = roi
+                            worker.submit(rgb_small_frame[y0:y1, x0:x1], offset=(x0, y0))
+                        else:
+                            worker.submit(rgb_small_frame)
+                        tracker.on_submit(small_gray)
+                        motion.mark()
+
+                # 2. Draw UI
+                self.draw_hud(frame, w, h, status=status, face_loc=face_location_display)
+                
+                cv2.imshow("SECURITY CHECK", frame)
+                key = cv2.waitKey(1)
+                if key == ord('q'):
+                    print("System Terminated by User.")
+                    sys.exit(0)
+        finally:
+            if worker is not None:
+                worker.stop()
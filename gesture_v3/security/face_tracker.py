@@ -0,0 +1,81 @@
+
+import cv2
+import numpy as np
+
+class FaceROITracker:
+    """
+    Tracks the last detected face box between full detections.
+    The box template is re-located by normalized cross-correlation inside a
+    padded search window, and the next detection/encoding only runs inside
+    a padded ROI around it. After max_misses checks without a face the
+    tracker resets and the caller goes back to full-frame search.
+    Coordinates are in the (downscaled) check-frame space.
+    """
+    def __init__(self, pad=0.6, match_threshold=0.5, max_misses=3):
+        self.pad = pad
+        self.match_threshold = match_threshold
+        self.max_misses = max_misses
+
+        self.box = None         # (top, right, bottom, left)
+        self.template = None    # Grayscale face crop
+        self.misses = 0
+        self._submitted_gray = None
+
+    def reset(self):
+        self.box = None
+        self.template = None
+        self.misses = 0
+
+    def _padded(self, box, shape, pad):
+        top, right, bottom, left = box
+        h, w = shape[:2]
+        px, py = int((right - left) * pad), int((bottom - top) * pad)
+        return max(0, left - px), max(0, top - py), min(w, right + px), min(h, bottom + py)
+
+    def roi(self, small_gray):
+        """
+        Predict where the face is now.
+        :param small_gray: Grayscale check frame
+        :return: (x0, y0, x1, y1) region to search, or None for a full-frame search
+        """
+        if self.box is None:
+            return None
+
+        sx0, sy0, sx1, sy1 = self._padded(self.box, small_gray.shape, self.pad)
+        th, tw = self.template.shape
+        if sx1 - sx0 < tw or sy1 - sy0 < th:
+            return None
+
+        res = cv2.matchTemplate(small_gray[sy0:sy1, sx0:sx1], self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (mx, my) = cv2.minMaxLoc(res)
+        if score < self.match_threshold:
+            return None
+
+        left, top = sx0 + mx, sy0 + my
+        predicted = (top, left + tw, top + th, left)
+        return self._padded(predicted, small_gray.shape, self.pad)
+
+    def on_submit(self, small_gray):
+        """
+        Remember the frame a request was made from (results arrive later).
+        """
+        self._submitted_gray = small_gray
+
+    def update(self, face_locations):
+        """
+        Feed back detection results (full check-frame coordinates).
+        """
+        if face_locations and self._submitted_gray is not None:
+            top, right, bottom, left = face_locations[0]
+            h, w = self._submitted_gray.shape[:2]
+            top, left = max(0, top), max(0, left)
+            bottom, right = min(h, bottom), min(w, right)
+            if bottom - top >= 8 and right - left >= 8:
+                self.box = (top, right, bottom, left)
+                self.template = np.ascontiguousarray(self._submitted_gray[top:bottom, left:right])
+                self.misses = 0
+                return
+
+        self.misses += 1
+        if self.misses >= self.max_misses:
+            self.reset()
@@ -0,0 +1,161 @@
+
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+from gesture_v3 import config
+
+# Reply id sent once the models are warm (real request ids start at 1)
+READY_ID = 0
+
+def _worker_main(conn, low_priority=False):
+    """
+    Worker process entry point.
+    Receives (request_id, rgb_small_frame, (offset_x, offset_y)), replies
+    (request_id, face_locations, face_encodings) with locations shifted by the offset.
+    Only the newest pending request is processed; older ones are dropped.
+    """
+    import face_recognition
+
+    # Background checks should only use idle CPU
+    if low_priority and hasattr(os, "nice"):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+    # Load and exercise the dlib models now (in parallel with camera / UI startup)
+    # rather than on the first real check
+    try:
+        dummy = np.zeros((120, 160, 3), np.uint8)
+        face_recognition.face_locations(dummy)
+        face_recognition.face_encodings(dummy, [(10, 110, 110, 10)])
+    except Exception as e:
+        print(f"[SECURITY] Face model warm-up failed: {e}")
+    conn.send((READY_ID, [], []))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        # Drop stale requests: keep only the newest one in the pipe
+        while msg is not None and conn.poll():
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                return
+
+        if msg is None: # Shutdown
+            return
+
+        request_id, rgb_small_frame, (ox, oy) = msg
+        try:
+            face_locations = face_recognition.face_locations(rgb_small_frame)
+            face_encodings = []
+            if face_locations:
+                face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+            face_locations = [(top + oy, right + ox, bottom + oy, left + ox) for top, right, bottom, left in face_locations]
+            conn.send((request_id, face_locations, face_encodings))
+        except Exception as e:
+            print(f"[SECURITY] Face worker error: {e}")
+            conn.send((request_id, [], []))
+
+class FaceVerificationWorker:
+    """
+    Runs dlib face detection + encoding in a separate process so the
+    login UI never blocks on inference.
+    At most one request is in flight; results are collected with poll().
+    The worker warms its models up right after start(); ready turns True
+    (on a poll()) once that is done. Requests sent earlier simply wait.
+    If the worker process dies, failed turns True and no further requests are taken;
+    a request unanswered for timeout seconds is dropped so the next one can go out.
+    """
+    def __init__(self, low_priority=False, timeout=config.FACE_WORKER_TIMEOUT):
+        """
+        :param low_priority: Lower the worker's scheduling priority (background checks)
+        :param timeout: Seconds before an unanswered request is given up
+        """
+        ctx = mp.get_context("spawn") # dlib / OpenCV state is not fork-safe
+        self._conn, self._child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_worker_main, args=(self._child_conn, low_priority), name="FaceVerificationWorker", daemon=True)
+        self.timeout = timeout
+        self._next_id = 0
+        self.pending_id = None
+        self.submit_time = 0.0
+        self.ready = False
+        self.failed = False
+
+    def start(self):
+        self._process.start()
+        # Only the child holds its end now, so its death shows up as EOF here
+        self._child_conn.close()
+
+    @property
+    def busy(self):
+        return self.pending_id is not None
+
+    def submit(self, rgb_small_frame, offset=(0, 0)):
+        """
+        Queue a downscaled RGB frame (or a crop of one) for verification.
+        :param offset: (x, y) of the crop inside the full check frame
+        :return: Request id, or None if a request is still in flight
+        """
+        if self.busy or self.failed:
+            return None
+        self._next_id += 1
+        self.pending_id = self._next_id
+        self.submit_time = time.time()
+        try:
+            self._conn.send((self.pending_id, np.ascontiguousarray(rgb_small_frame), tuple(int(v) for v in offset)))
+        except (BrokenPipeError, OSError):
+            self._fail("pipe closed")
+            return None
+        return self.pending_id
+
+    def poll(self):
+        """
+        Non-blocking result check.
+        :return: (face_locations, face_encodings) or None if not ready
+        """
+        if self.failed:
+            return None
+        result = None
+        try:
+            while self._conn.poll():
+                request_id, face_locations, face_encodings = self._conn.recv()
+                if request_id == READY_ID:
+                    self.ready = True
+                elif request_id == self.pending_id:
+                    self.pending_id = None
+                    result = (face_locations, face_encodings)
+        except (EOFError, OSError):
+            self._fail(f"exited (code {self._process.exitcode})")
+            return result
+        if result is None and not self._process.is_alive():
+            self._fail(f"exited (code {self._process.exitcode})")
+        elif self.busy and time.time() - self.submit_time > self.timeout:
+            print(f"[SECURITY] Face check unanswered after {self.timeout:.0f}s; dropping it.")
+            self.cancel()
+        return result
+
+    def cancel(self):
+        """
+        Forget the in-flight request; its result will be ignored.
+        """
+        self.pending_id = None
+
+    def _fail(self, reason):
+        print(f"[SECURITY] Face worker {reason}; face checks are unavailable.")
+        self.failed = True
+        self.pending_id = None
+
+    def stop(self):
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
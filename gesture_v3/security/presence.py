@@ -0,0 +1,110 @@
+
+import cv2
+from gesture_v3 import config
+from gesture_v3.security.face_worker import FaceVerificationWorker
+from gesture_v3.security.profile_store import FaceProfileStore
+
+class PresenceMonitor:
+    """
+    Continuous presence verification.
+    Re-checks the enrolled face on downscaled frames from the running capture,
+    in a low-priority worker process, on an adaptive schedule:
+    - verified -> interval doubles (up to PRESENCE_MAX_INTERVAL)
+    - no match -> back to PRESENCE_MIN_INTERVAL
+    The ceiling never exceeds PRESENCE_ABSENT_TIMEOUT minus PRESENCE_CHECK_ALLOWANCE,
+    so the next check of a user who stays answers before the timeout runs out.
+    Frames with no check scheduled cost one comparison.
+    If the worker dies, the monitor disables itself (logged once) instead of pausing for good.
+    """
+    def __init__(self, profiles=None, tolerance=0.5):
+        self.profiles = profiles if profiles is not None else FaceProfileStore()
+        if profiles is None:
+            self.profiles.load()
+        self.tolerance = tolerance
+        self.worker = None
+
+        self.interval = config.PRESENCE_MIN_INTERVAL
+        self.max_interval = max(config.PRESENCE_MIN_INTERVAL,
+                                min(config.PRESENCE_MAX_INTERVAL, config.PRESENCE_ABSENT_TIMEOUT - config.PRESENCE_CHECK_ALLOWANCE))
+        self.next_check = 0.0
+        self.last_verified = 0.0
+        self.present = True
+        self.user_id = None
+
+    @property
+    def enabled(self):
+        return self.worker is not None
+
+    def start(self, now, user_id=None):
+        """
+        :param now: Current time (e.g. right after login); the grace period starts once the models are loaded
+        :param user_id: Restrict verification to this user (None = any enrolled user)
+        """
+        if len(self.profiles) == 0:
+            print("[SECURITY] Presence check disabled: no enrolled faces.")
+            return
+        self.user_id = user_id
+        self.worker = FaceVerificationWorker(low_priority=True)
+        self.worker.start()
+        self.last_verified = now
+        self.next_check = now
+
+    def stop(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+    def update(self, img, now):
+        """
+        Called once per frame from the control loop. Never blocks.
+        :param img: Current BGR capture frame (not modified)
+        :param now: Current time
+        :return: True while the verified user is considered present
+        """
+        if self.worker is None:
+            return True
+
+        if self.worker.failed:
+            # Without a worker nothing can ever verify: stop gating rather than pause control for good
+            print("[SECURITY] Presence check disabled: face worker unavailable.")
+            self.stop()
+            self.present = True
+            return True
+
+        if not self.worker.ready and not self.worker.failed:
+            # Models still loading: the absence timer only runs once checks can
+            self.worker.poll()
+            self.last_verified = now
+            self.next_check = now
+            if self.worker.ready:
+                print("[SECURITY] Presence check active.")
+            return True
+
+        if self.worker.busy:
+            result = self.worker.poll()
+            if result is not None:
+                self._on_result(result[1], now)
+        elif now >= self.next_check:
+            small = cv2.resize(img, (0, 0), fx=config.PRESENCE_SCALE, fy=config.PRESENCE_SCALE)
+            self.worker.submit(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+
+        present = (now - self.last_verified) < config.PRESENCE_ABSENT_TIMEOUT
+        if present != self.present:
+            print(f"[SECURITY] Presence {'restored' if present else 'lost'}.")
+            self.present = present
+        return present
+
+    def _on_result(self, face_encodings, now):
+        verified = False
+        if face_encodings:
+            for user_id, _ in self.profiles.match(face_encodings, tolerance=self.tolerance):
+                if user_id is not None and (self.user_id is None or user_id == self.user_id):
+                    verified = True
+                    break
+
+        if verified:
+            self.last_verified = now
+            self.interval = min(self.interval * 2.0, self.max_interval)
+        else:
+            self.interval = config.PRESENCE_MIN_INTERVAL
+        self.next_check = now + self.interval
@@ -0,0 +1,111 @@
+
+import os
+import pickle
+import numpy as np
+
+ENCODING_DIM = 128
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+LEGACY_AUTH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'auth.dat')
+
+class FaceProfileStore:
+    """
+    Multi-user face profile database.
+    Layout (no pickle): one profiles.npz holding
+    - encodings: (N, 128) float32 matrix of all enrolled encodings
+    - ids:       (N,) unicode array, owner user id of each row (width sized to the longest id)
+    Both arrays live in one file so a save replaces them together.
+    Matching compares a probe against every enrolled encoding in one vectorized step.
+    """
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, 'profiles.npz')
+
+        self.encodings = np.zeros((0, ENCODING_DIM), np.float32)
+        self.ids = np.zeros(0, dtype=str)
+        self._sq_norms = np.zeros(0, np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def users(self):
+        return sorted(set(self.ids.tolist()))
+
+    def load(self):
+        """
+        Load the database. Imports the legacy single-user auth.dat if no database exists yet.
+        :return: Number of enrolled encodings
+        """
+        if os.path.exists(self.path):
+            with np.load(self.path) as data:
+                self.encodings = data['encodings']
+                self.ids = data['ids']
+            if self.encodings.shape != (len(self.ids), ENCODING_DIM):
+                raise ValueError(f"Corrupt profile store: {self.encodings.shape} encodings for {len(self.ids)} ids")
+        elif os.path.exists(LEGACY_AUTH_FILE):
+            with open(LEGACY_AUTH_FILE, 'rb') as f:
+                legacy = pickle.load(f)
+            print("[SECURITY] Migrating legacy auth.dat to profile store.")
+            self.add("default", [legacy])
+        self._refresh()
+        return len(self)
+
+    def _refresh(self):
+        # |k|^2 per enrolled row, reused by every match
+        self._sq_norms = np.einsum('ij,ij->i', self.encodings, self.encodings).astype(np.float32)
+
+    def save(self):
+        """
+        Atomically write the database (one temp file + rename).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, encodings=np.ascontiguousarray(self.encodings, np.float32), ids=self.ids)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def add(self, user_id, encodings):
+        """
+        Enroll one or more encodings for a user (appends; existing encodings are kept).
+        """
+        if not isinstance(user_id, str) or not user_id:
+            raise ValueError("user id must be a non-empty string")
+        new = np.asarray(encodings, np.float32).reshape(-1, ENCODING_DIM)
+        self.encodings = np.concatenate([self.encodings, new])
+        # Concatenation widens the unicode dtype to the longest id, so none is truncated
+        self.ids = np.concatenate([self.ids, np.full(len(new), user_id)])
+        self.save()
+        self._refresh()
+
+    def remove(self, user_id):
+        keep = self.ids != user_id
+        self.encodings = self.encodings[keep]
+        self.ids = self.ids[keep]
+        self.save()
+        self._refresh()
+
+    def distances(self, probes):
+        """
+        Euclidean distance of each probe to every enrolled encoding.
+        :param probes: (M, 128) array-like
+        :return: (M, N) float32 matrix
+        """
+        probes = np.asarray(probes, np.float32).reshape(-1, ENCODING_DIM)
+        # |p - k|^2 = |p|^2 + |k|^2 - 2 p.k  (one matrix product for all pairs)
+        sq = np.einsum('ij,ij->i', probes, probes)[:, None] + self._sq_norms[None, :] - 2.0 * (probes @ self.encodings.T)
+        return np.sqrt(np.maximum(sq, 0.0))
+
+    def match(self, probes, tolerance=0.5):
+        """
+        Identify probe encodings.
+        :param probes: (M, 128) array-like of face encodings
+        :param tolerance: Max distance for a match (face_recognition default is 0.6)
+        :return: List of (user_id or None, best_distance), one per probe
+        """
+        if len(self) == 0 or len(probes) == 0:
+            return [(None, float('inf'))] * len(probes)
+        dist = self.distances(probes)
+        best = np.argmin(dist, axis=1)
+        best_dist = dist[np.arange(len(best)), best]
+        return [(str(self.ids[j]) if d <= tolerance else None, float(d)) for j, d in zip(best, best_dist)]
@@ -1,17 +1,32 @@
 
 import cv2
 import numpy as np
-from collections import deque
 from gesture_v3 import config
 
+TRAIL_LENGTH = 20
+
+# Segment i (point i-1 -> i) thickness, precomputed: int(sqrt(20 / i) * 2)
+TRAIL_THICKNESS = (np.sqrt(TRAIL_LENGTH / np.arange(1, TRAIL_LENGTH)) * 2).astype(np.int32)
+
+# Consecutive segments sharing a thickness are drawn as one polyline.
+# Each run is (first_point, last_point, thickness) with inclusive point indices.
+TRAIL_RUNS = []
+_start = 1
+for _i in range(2, TRAIL_LENGTH + 1):
+    if _i == TRAIL_LENGTH or TRAIL_THICKNESS[_i - 1] != TRAIL_THICKNESS[_start - 1]:
+        TRAIL_RUNS.append((_start - 1, _i - 1, int(TRAIL_THICKNESS[_start - 1])))
+        _start = _i
+del _start, _i
+
 class CinematicHUD:
     """
     UI Layer.
     Renders "Iron Man" style overlay.
     """
     def __init__(self):
-        # Trail history
-        self.trail = deque(maxlen=20)
+        # Trail history (newest first), preallocated
+        self.trail = np.zeros((TRAIL_LENGTH, 2), np.int32)
+        self.trail_len = 0
         self.pulse_phase = 0.0
 
     def draw(self, img, hand_landmarks, state, confidence):
@@ -23,7 +38,7 @@ class CinematicHUD:
         :param confidence: Gesture Confidence (0-1)
         """
         if not hand_landmarks:
-            self.trail.clear()
+            self.trail_len = 0
             return
             
         h, w, _ = img.shape
@@ -36,13 +51,13 @@ class CinematicHUD:
         cx = int((idx_base.x + pinky_base.x + wrist.x) / 3 * w)
         cy = int((idx_base.y + pinky_base.y + wrist.y) / 3 * h)
         
-        # Update Trail
-        self.trail.appendleft((cx, cy))
+        # Update Trail (shift in place, newest at index 0)
+        self.trail[1:] = self.trail[:-1]
+        self.trail[0] = (cx, cy)
+        self.trail_len = min(self.trail_len + 1, TRAIL_LENGTH)
         
         # 1. Draw Trail (Light Writer Effect)
-        for i in range(1, len(self.trail)):
-            thickness = int(np.sqrt(20 / i) * 2)
-            cv2.line(img, self.trail[i-1], self.trail[i], config.COLOR_IDLE, thickness)
+        self._draw_trail(img, h, w)
 
         # 2. Draw Reticle (Rotating Circles)
         self.pulse_phase += 0.1
@@ -91,3 +106,27 @@ class CinematicHUD:
         # 3. Text Label
         cv2.putText(img, f"STATUS: {state}", (cx + 50, cy - 50), 
                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+
+    def _draw_trail(self, img, h, w):
+        """
+        Trail as a handful of batched polylines (one per thickness run),
+        drawn only inside the trail's bounding box.
+        """
+        n = self.trail_len
+        if n < 2:
+            return
+
+        pts = self.trail[:n]
+        pad = int(TRAIL_THICKNESS[0])
+        x0, y0 = np.maximum(pts.min(axis=0) - pad, 0)
+        x1, y1 = np.minimum(pts.max(axis=0) + pad + 1, (w, h))
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        roi = img[y0:y1, x0:x1]
+        local = (pts - (x0, y0)).astype(np.int32, copy=False)
+        for first, last, thickness in TRAIL_RUNS:
+            if first >= n - 1:
+                break
+            run = local[first:min(last, n - 1) + 1]
+            cv2.polylines(roi, [run], False, config.COLOR_IDLE, thickness)
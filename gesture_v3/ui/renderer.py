@@ -0,0 +1,198 @@
+
+import threading
+import time
+import cv2
+import numpy as np
+from gesture_v3 import config
+
+class HUDRenderer:
+    """
+    Display Layer.
+    Owns the preview window: HUD drawing, cv2.imshow and cv2.waitKey.
+    In threaded mode the control loop only hands over the latest frame
+    snapshot; a background thread draws the HUD at a capped rate so that
+    visuals never stall cursor control. HighGUI is not thread-safe, so
+    imshow / waitKey stay on the calling (main) thread: each submit()
+    shows the newest finished preview, i.e. one frame behind.
+    The preview is drawn at DISPLAY_WIDTH x DISPLAY_HEIGHT, independent of capture size.
+    """
+    def __init__(self, hud, window_name=config.APP_NAME, max_fps=config.HUD_MAX_FPS, threaded=config.HUD_THREADED,
+                 display_size=(config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT), profiler=None, display=True):
+        self.hud = hud
+        self.display = display # False: headless, submit() is a no-op
+        self.profiler = profiler
+        self.show_perf = profiler is not None and config.PERF_HUD
+        self._perf_lines = []
+        self._perf_refresh = 0.0
+        self.window_name = window_name
+        self.display_size = display_size
+        # Preview buffers, reused every frame: the HUD is drawn into the back one,
+        # the front one is what the main thread shows (swapped under _lock)
+        self._buffers = [None, None]
+        self._back = 0
+        self._fresh = False # Front buffer not shown yet
+        self._front_seq = None # Trace frame drawn into the front buffer
+        self._last_keys = 0.0
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.threaded = threaded
+
+        self.quit_requested = False
+
+        # Latest snapshot (single slot, newest wins)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._snapshot = None
+        self._version = 0
+        self._rendered_version = 0
+
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if not self.display or not self.threaded or self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="HUDRenderer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.display:
+            cv2.destroyAllWindows()
+
+    def submit(self, img, hand_landmarks, state, confidence, fps, banner=None, hud=True):
+        """
+        Hand a frame over for display. The caller must not touch img afterwards.
+        :param img: Full-resolution BGR frame (read-only; the HUD is drawn on a downscaled copy)
+        :param hand_landmarks: MediaPipe landmarks or None
+        :param state: Current Intent State
+        :param confidence: Gesture Confidence (0-1)
+        :param fps: Loop FPS for the info line
+        :param banner: Optional centred warning text (e.g. safety pause)
+        :param hud: False shows the bare frame with the info line (degraded mode)
+        """
+        if not self.display:
+            return
+        # Trace frame of this snapshot, so render-thread spans are tagged with the frame they draw
+        tracer = self.profiler.tracer if self.profiler is not None else None
+        seq = tracer.frame if tracer is not None else None
+        snapshot = (img, hand_landmarks, state, confidence, fps, banner, hud, seq)
+        if not self.threaded:
+            self._show(self._render(snapshot))
+            return
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._version += 1
+        self._wake.set()
+        self._present()
+
+    def _present(self):
+        """
+        Main thread: show the newest preview the render thread finished, and poll keys.
+        """
+        t = time.perf_counter()
+        with self._lock:
+            shown = self._fresh
+            seq = self._front_seq
+            if shown:
+                self._fresh = False
+                # imshow copies the image, so the render thread may reuse the buffer afterwards
+                cv2.imshow(self.window_name, self._buffers[1 - self._back])
+        # Nothing new: still keep the window responsive, at a lower rate
+        if shown or time.time() - self._last_keys > 0.05:
+            self._pump_keys() # waitKey is where the window actually repaints
+        if shown and self.profiler is not None:
+            self.profiler.mark("display", t, frame=seq)
+
+    def _loop(self):
+        last_render = 0.0
+        while self._running:
+            self._wake.wait(timeout=0.05)
+            self._wake.clear()
+
+            # Rate cap
+            wait = self.min_interval - (time.time() - last_render)
+            if wait > 0:
+                time.sleep(wait)
+
+            with self._lock:
+                snapshot = self._snapshot
+                version = self._version
+
+            if snapshot is not None and version != self._rendered_version:
+                self._render(snapshot)
+                self._rendered_version = version
+                last_render = time.time()
+                with self._lock:
+                    self._back = 1 - self._back
+                    self._fresh = True
+                    self._front_seq = snapshot[-1]
+
+    def _render(self, snapshot):
+        """
+        Draw the preview for a snapshot into the back buffer (no window calls).
+        :return: The preview image
+        """
+        frame, hand_landmarks, state, confidence, fps, banner, hud, seq = snapshot
+        t = time.perf_counter()
+        img = self._downscale(frame)
+
+        if banner:
+            h, w, _ = img.shape
+            cv2.putText(img, banner, (w//2 - 150, h//2),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        else:
+            if hud:
+                self.hud.draw(img, hand_landmarks, state, confidence)
+            cv2.putText(img, f"J.A.R.V.I.S  |  FPS: {int(fps)}", (20, 30), cv2.FONT_HERSHEY_PLAIN, 1, (200, 255, 200), 1)
+
+        if self.show_perf:
+            self._draw_perf_panel(img)
+        if self.profiler is not None:
+            self.profiler.mark("hud", t, frame=seq)
+        return img
+
+    def _show(self, img):
+        t = time.perf_counter()
+        cv2.imshow(self.window_name, img)
+        self._pump_keys() # waitKey is where the window actually repaints
+        if self.profiler is not None:
+            self.profiler.mark("display", t)
+
+    def _downscale(self, frame):
+        """
+        Resize the captured frame into the preallocated back buffer.
+        HUD coordinates come from normalized landmarks, so they follow the preview size.
+        """
+        dw, dh = self.display_size
+        preview = self._buffers[self._back]
+        if preview is None or preview.shape[:2] != (dh, dw):
+            preview = self._buffers[self._back] = np.empty((dh, dw, 3), np.uint8)
+        if frame.shape[:2] == (dh, dw):
+            np.copyto(preview, frame)
+        else:
+            cv2.resize(frame, (dw, dh), dst=preview, interpolation=cv2.INTER_LINEAR)
+        return preview
+
+    def _draw_perf_panel(self, img):
+        # Percentiles are recomputed at 2 Hz; the panel itself is just text
+        now = time.time()
+        if now - self._perf_refresh > 0.5:
+            self._perf_lines = self.profiler.hud_lines()
+            self._perf_refresh = now
+
+        x, y = 10, 50
+        cv2.rectangle(img, (x - 5, y - 14), (x + 230, y + 14 * len(self._perf_lines) - 8), (0, 0, 0), -1)
+        for i, line in enumerate(self._perf_lines):
+            cv2.putText(img, line, (x, y + i * 14), cv2.FONT_HERSHEY_PLAIN, 0.9, (200, 255, 200), 1)
+
+    def _pump_keys(self):
+        self._last_keys = time.time()
+        key = cv2.waitKey(1)
+        if key == ord('q'):
+            self.quit_requested = True
@@ -35,6 +35,9 @@ class HandTracker:
         ]
         # Some visualizations add horizontal knuckles (5,9), (9,13), (13,17)
         self.HAND_CONNECTIONS += [(5,9), (9,13), (13,17)]
+        # Same connections as an index array for batched drawing
+        self.connection_idx = np.array(self.HAND_CONNECTIONS, dtype=np.intp)
+        self.point_radius = 5
 
     def find_hands(self, img, draw=True):
         # Convert BGR to RGB for MediaPipe
@@ -57,21 +60,40 @@ class HandTracker:
 
     def draw_landmarks(self, img, landmarks):
         h, w, c = img.shape
-        # Convert NormalizedLandmark (x,y,z) to pixel coordinates
-        points = []
-        for lm in landmarks:
-            # MediaPipe Tasks: .x, .y, .z (normalized 0-1)
-            cx, cy = int(lm.x * w), int(lm.y * h)
-            points.append((cx, cy))
-        
-        # Draw connections
-        for p1, p2 in self.HAND_CONNECTIONS:
-            if p1 < len(points) and p2 < len(points):
-                cv2.line(img, points[p1], points[p2], config.COLOR_HAND_LINES, config.UI_THICKNESS)
+        n = len(landmarks)
+        if n == 0:
+            return
+        points = self._pixel_points(landmarks, w, h)
+
+        # Only touch the hand's bounding box
+        pad = max(self.point_radius, config.UI_THICKNESS) + 1
+        x0, y0 = np.maximum(points.min(axis=0) - pad, 0)
+        x1, y1 = np.minimum(points.max(axis=0) + pad + 1, (w, h))
+        if x1 <= x0 or y1 <= y0:
+            return
+        roi = img[y0:y1, x0:x1]
+        points -= (x0, y0)
+
+        # Draw connections: all segments in a single polylines call
+        idx = self.connection_idx
+        if n < 21:
+            idx = idx[(idx < n).all(axis=1)]
+        cv2.polylines(roi, points[idx], False, config.COLOR_HAND_LINES, config.UI_THICKNESS)
         
-        # Draw points
-        for cx, cy in points:
-             cv2.circle(img, (cx, cy), 5, config.COLOR_HAND_POINTS, cv2.FILLED)
+        # Draw points: zero-length thick segments render as filled discs
+        dots = np.repeat(points[:, None, :], 2, axis=1)
+        cv2.polylines(roi, dots, False, config.COLOR_HAND_POINTS, 2 * self.point_radius)
+
+    @staticmethod
+    def _pixel_points(landmarks, w, h):
+        """
+        Convert NormalizedLandmark (x,y,z) to int32 pixel coordinates in one shot.
+        MediaPipe Tasks: .x, .y, .z (normalized 0-1)
+        :return: (n, 2) array of x, y (truncated like int())
+        """
+        n = len(landmarks)
+        norm = np.fromiter((v for lm in landmarks for v in (lm.x, lm.y)), dtype=np.float64, count=2 * n)
+        return (norm.reshape(n, 2) * (w, h)).astype(np.int32)
 
     def get_landmark_list(self, img):
         lm_list = []
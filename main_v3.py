@@ -1,8 +1,11 @@
-
 """
 Project J.A.R.V.I.S (Gesture Interface V3)
 Start here.
+
+    python main_v3.py            # local camera + tracking
+    python main_v3.py --remote   # landmarks streamed from stream_landmarks.py over UDP
 """
+import argparse
 import sys
 import os
 
@@ -12,5 +15,14 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from gesture_v3.core.system import SystemController
 
 if __name__ == "__main__":
-    app = SystemController()
+    parser = argparse.ArgumentParser(description="J.A.R.V.I.S gesture interface (V3)")
+    parser.add_argument("--remote", action="store_true", help="Receive landmarks over UDP instead of using a camera")
+    args = parser.parse_args()
+
+    if args.remote:
+        from gesture_v3.perception.remote import RemoteLandmarkSource
+        source = RemoteLandmarkSource()
+        app = SystemController(cap=source, tracker=source)
+    else:
+        app = SystemController()
     app.run()
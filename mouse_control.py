@@ -1,12 +1,33 @@
+import math
 import pyautogui
-import numpy as np
 import config
+from gesture_v3.core.settings import default_snapshot
 
 class MouseController:
-    def __init__(self):
+    def __init__(self, cfg=None):
+        """
+        :param cfg: Config snapshot (default: config.py as written)
+        """
         self.screen_width, self.screen_height = pyautogui.size()
         self.prev_x, self.prev_y = 0, 0
         self.curr_x, self.curr_y = 0, 0
+        self.apply_config(cfg or default_snapshot(config))
+
+    def apply_config(self, cfg):
+        """
+        Bind mapping and smoothing values from a config snapshot (between frames only).
+        """
+        # Camera -> screen affine map, precomputed per snapshot
+        # screen = cam * scale + offset; maps [margin, frame - margin] onto [0, screen]
+        self.scale_x = self.screen_width / (cfg.FRAME_WIDTH - 2 * cfg.SCREEN_MARGIN)
+        self.scale_y = self.screen_height / (cfg.FRAME_HEIGHT - 2 * cfg.SCREEN_MARGIN)
+        self.offset_x = -cfg.SCREEN_MARGIN * self.scale_x
+        self.offset_y = -cfg.SCREEN_MARGIN * self.scale_y
+
+        self.min_smoothing = cfg.MIN_SMOOTHING
+        self.max_smoothing = cfg.MAX_SMOOTHING
+        self.speed_threshold = cfg.SMOOTHING_SPEED_THRESHOLD
+        self.scroll_speed = int(cfg.SCROLL_SPEED)
     
     def move_mouse(self, x, y):
         """
@@ -20,34 +41,28 @@ class MouseController:
         # x is from 0 to config.FRAME_WIDTH
         # y is from 0 to config.FRAME_HEIGHT
         
-        # Linear Interpolation: np.interp(v, [min_in, max_in], [min_out, max_out])
-        
-        screen_x = np.interp(x, 
-                             [config.SCREEN_MARGIN, config.FRAME_WIDTH - config.SCREEN_MARGIN], 
-                             [0, self.screen_width])
-        
-        screen_y = np.interp(y, 
-                             [config.SCREEN_MARGIN, config.FRAME_HEIGHT - config.SCREEN_MARGIN], 
-                             [0, self.screen_height])
+        # Plain float math: scalar np.interp / np.hypot cost more than the arithmetic itself
+        screen_x = float(x) * self.scale_x + self.offset_x
+        screen_y = float(y) * self.scale_y + self.offset_y
 
-        # 2. Clamp values to be safe
+        # 2. Clamp values to be safe (also covers points outside the active area)
         screen_x = max(0, min(screen_x, self.screen_width - 1))
         screen_y = max(0, min(screen_y, self.screen_height - 1))
 
         # 3. Dynamic Smoothing
         # Calculate distance to target
-        dist = np.hypot(screen_x - self.prev_x, screen_y - self.prev_y)
+        dist = math.hypot(screen_x - self.prev_x, screen_y - self.prev_y)
         
         # Map distance to smoothing factor
         # Large distance (fast move) -> Low Smoothing (Responsive) -> e.g., 2
         # Small distance (slow move) -> High Smoothing (Stable) -> e.g., 15
         
         # Normalize distance relative to threshold (0 to 1)
-        speed_factor = min(dist / config.SMOOTHING_SPEED_THRESHOLD, 1.0)
+        speed_factor = min(dist / self.speed_threshold, 1.0)
         
         # Invert: High speed = Low smoothing value
         # smooth_val = MAX - (MAX - MIN) * speed_factor
-        current_smooth = config.MAX_SMOOTHING - (config.MAX_SMOOTHING - config.MIN_SMOOTHING) * speed_factor
+        current_smooth = self.max_smoothing - (self.max_smoothing - self.min_smoothing) * speed_factor
         
         # Apply Smoothing
         self.curr_x = self.prev_x + (screen_x - self.prev_x) / current_smooth
@@ -80,6 +95,6 @@ class MouseController:
         """
         # Limit scroll speed for safety
         if steps > 0:
-            pyautogui.scroll(int(config.SCROLL_SPEED))
+            pyautogui.scroll(self.scroll_speed)
         else:
-            pyautogui.scroll(int(-config.SCROLL_SPEED))
+            pyautogui.scroll(-self.scroll_speed)
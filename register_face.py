@@ -1,6 +1,6 @@
 import cv2
 import face_recognition
-import pickle
+import argparse
 import os
 import sys
 import numpy as np
@@ -8,15 +8,97 @@ import numpy as np
 # Ensure project root is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-AUTH_FILE = os.path.join(os.path.dirname(__file__), 'gesture_v3', 'security', 'auth.dat')
+from gesture_v3.security.profile_store import FaceProfileStore
 
-def register():
+BURST_FRAMES = 15   # Frames captured per enrollment
+TOP_K = 5           # Best frames kept and stored
+MIN_SHARPNESS = 60.0    # Laplacian variance of the face crop below which a frame counts as blurred
+MIN_FACE_WIDTH = 0.12   # Face width as a fraction of the frame width (too far away below this)
+
+def capture_burst(cap, face_cascade, n_frames):
+    """
+    Grab n_frames and locate the largest face in each.
+    :return: List of (frame_bgr, (x, y, w, h), sharpness)
+    """
+    samples = []
+    for i in range(n_frames):
+        ret, frame = cap.read()
+        if not ret:
+            continue
+        frame = cv2.flip(frame, 1)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+        if len(faces) > 0:
+            # OpenCV returns (x, y, w, h); use the largest face found
+            x, y, fw, fh = [int(v) for v in max(faces, key=lambda f: f[2] * f[3])]
+            # Blur check: Laplacian variance of the face crop
+            sharpness = cv2.Laplacian(gray[y:y+fh, x:x+fw], cv2.CV_64F).var()
+            samples.append((frame, (x, y, fw, fh), sharpness))
+
+        preview = frame.copy()
+        cv2.putText(preview, f"CAPTURING {i + 1}/{n_frames}", (20, 40), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2)
+        cv2.imshow("Face Registration", preview)
+        cv2.waitKey(1)
+    return samples
+
+def usable_samples(samples, w):
+    """
+    Drop frames below the absolute quality floor (score_samples only ranks within the burst).
+    :return: (usable samples, reason string if none are left)
+    """
+    sharp = [s for s in samples if s[2] >= MIN_SHARPNESS]
+    usable = [s for s in sharp if s[1][2] >= MIN_FACE_WIDTH * w]
+    if usable:
+        return usable, None
+    if not sharp:
+        return [], "TOO BLURRY - HOLD STILL"
+    return [], "TOO FAR - MOVE CLOSER"
+
+def score_samples(samples, w, h):
+    """
+    Vectorized quality score: sharpness, face size and centering (each 0-1, relative to the burst).
+    """
+    boxes = np.array([s[1] for s in samples], np.float32)
+    sharpness = np.array([s[2] for s in samples], np.float32)
+
+    size = boxes[:, 2] * boxes[:, 3]
+    center = boxes[:, :2] + boxes[:, 2:] / 2
+    offset = np.hypot((center[:, 0] - w / 2) / (w / 2), (center[:, 1] - h / 2) / (h / 2))
+
+    sharp_score = sharpness / max(sharpness.max(), 1e-6)
+    size_score = size / max(size.max(), 1e-6)
+    center_score = 1.0 - np.clip(offset, 0.0, 1.0)
+    return 0.5 * sharp_score + 0.3 * size_score + 0.2 * center_score
+
+def encode_samples(samples):
+    """
+    Encode the known face box of each sample (no detector pass), on a padded crop
+    so only the face region is converted to RGB.
+    """
+    encodings = []
+    for frame, (x, y, fw, fh), _ in samples:
+        fh_img, fw_img = frame.shape[:2]
+        # Square crop with margin so dlib's landmark model sees the whole face
+        side = int(max(fw, fh) * 1.6)
+        cx, cy = x + fw // 2, y + fh // 2
+        x0, y0 = max(0, cx - side // 2), max(0, cy - side // 2)
+        x1, y1 = min(fw_img, x0 + side), min(fh_img, y0 + side)
+        rgb = np.ascontiguousarray(cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2RGB))
+
+        # face_recognition expects (top, right, bottom, left)
+        top, left = y - y0, x - x0
+        encodings.extend(face_recognition.face_encodings(rgb, [(top, left + fw, top + fh, left)]))
+    return encodings
+
+def register(user_id="default"):
     print("=============================================")
     print("   FACE UNLOCK REGISTRATION (FINAL FIX)")
+    print(f"   USER: {user_id}")
     print("=============================================")
     print("1. Look at the camera.")
     print("2. Align face in the target zone.")
-    print("3. Press 'SPACE' to capture.")
+    print("3. Press 'SPACE' and hold still for a short burst capture.")
     print("4. Press 'Q' to quit.")
     print("=============================================")
 
@@ -28,9 +110,13 @@ def register():
         print("ERROR: Could not open camera.")
         return
 
-    # Ensure security directory exists
-    os.makedirs(os.path.dirname(AUTH_FILE), exist_ok=True)
+    # Existing users/encodings are kept; this enrollment is appended
+    store = FaceProfileStore()
+    store.load()
     
+    # Load OpenCV Face Detector (Haar Cascade) once - Robust fallback to bypass dlib detector crash
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
     scan_y = 0
     scan_dir = 1
     COLOR_CYAN = (255, 255, 0)
@@ -72,47 +158,41 @@ def register():
         if key == ord('q'):
             break
         elif key == 32: # SPACE
-            # Load OpenCV Face Detector (Haar Cascade) - Robust fallback to bypass dlib detector crash
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            
             try:
-                # 1. Prepare Images
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # 2. Detect using OpenCV (Stable) instead of face_recognition (Crashing)
-                faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-                
-                if len(faces) == 0:
+                # 1. Capture a burst (faces located with the shared Haar detector)
+                samples = capture_burst(cap, face_cascade, BURST_FRAMES)
+                if not samples:
                     print("FAIL: No face detected (OpenCV). Try adjusting position/lighting.")
                     cv2.putText(display_frame, "NO FACE DETECTED", (w//2 - 150, h//2), cv2.FONT_HERSHEY_DUPLEX, 1, COLOR_RED, 2)
                     cv2.imshow("Face Registration", display_frame)
                     cv2.waitKey(500)
                     continue
 
-                # 3. Use the largest face found
-                # OpenCV returns (x, y, w, h)
-                # face_recognition expects (top, right, bottom, left)
-                face = max(faces, key=lambda f: f[2] * f[3])
-                x, y, w, h = [int(v) for v in face] # Explicit conversion to int
-                
-                # Convert format
-                css_rect = (y, x + w, y + h, x)
-                print(f"DEBUG: Face detected at {css_rect} using OpenCV.")
-                
-                # Draw the box so user knows it worked
-                cv2.rectangle(display_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+                # 2. Drop frames below the quality floor, then score the rest and keep the best K
+                samples, reason = usable_samples(samples, w)
+                if not samples:
+                    print(f"RETRY: {reason.lower()} and press SPACE again.")
+                    cv2.putText(display_frame, reason, (w//2 - 220, h//2), cv2.FONT_HERSHEY_DUPLEX, 1, COLOR_RED, 2)
+                    cv2.imshow("Face Registration", display_frame)
+                    cv2.waitKey(1000)
+                    continue
+                scores = score_samples(samples, w, h)
+                best = np.argsort(scores)[::-1][:TOP_K]
+                chosen = [samples[i] for i in best]
+                print(f"DEBUG: {len(samples)} faces captured, scores {np.round(scores[best], 2).tolist()}")
+
+                # Draw the best box so user knows it worked
+                x, y, fw, fh = chosen[0][1]
+                cv2.rectangle(display_frame, (x, y), (x+fw, y+fh), (0, 255, 0), 2)
                 cv2.imshow("Face Registration", display_frame)
                 cv2.waitKey(100)
 
-                # 4. Encode using the detected location
-                # We pass the RGB image and the location we found manually
+                # 3. Encode the top K at their known face boxes
                 # This bypasses the crashing detector in dlib
-                encodings = face_recognition.face_encodings(rgb, [css_rect])
+                encodings = encode_samples(chosen)
 
                 if len(encodings) > 0:
-                    with open(AUTH_FILE, 'wb') as f:
-                        pickle.dump(encodings[0], f)
+                    store.add(user_id, encodings)
                     
                     # Success Animation
                     cv2.rectangle(display_frame, (0,0), (w,h), (0,255,0), -1)
@@ -121,7 +201,7 @@ def register():
                     cv2.imshow("Face Registration", display_frame)
                     cv2.waitKey(2000)
                     
-                    print(f"SUCCESS: Face registered to {AUTH_FILE}")
+                    print(f"SUCCESS: {len(encodings)} encodings registered for '{user_id}' ({len(store)} in {store.directory})")
                     break
                 else:
                      print("FAIL: Could not generate encoding from detected face.")
@@ -135,4 +215,7 @@ def register():
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    register()
+    parser = argparse.ArgumentParser(description="Enroll a face for unlock.")
+    parser.add_argument("--user", default="default", help="Operator id to enroll (repeat to add more encodings)")
+    args = parser.parse_args()
+    register(args.user)
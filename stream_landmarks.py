@@ -0,0 +1,71 @@
+"""
+Tracking side of the remote mode.
+
+Runs the camera and MediaPipe on this machine and streams only the hand
+landmarks (one ~140-byte UDP datagram per frame, see
+gesture_v3/perception/remote.py) to the machine whose cursor is controlled:
+
+    python stream_landmarks.py --host 192.168.1.20     # tracking box
+    python main_v3.py --remote                          # control machine (REMOTE_BIND = its LAN address)
+
+Both default to loopback, so the pair can be tried on a single machine.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+from gesture_v3 import config
+from gesture_v3.perception.remote import LandmarkSender, PACKET_SIZE, HEADER
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream hand landmarks to a remote J.A.R.V.I.S control instance over UDP.")
+    parser.add_argument("--host", default=config.REMOTE_HOST, help="Control machine address")
+    parser.add_argument("--port", type=int, default=config.REMOTE_PORT, help="Control machine UDP port")
+    parser.add_argument("--camera", type=int, default=0, help="Camera index")
+    parser.add_argument("--model", default="hand_landmarker.task", help="MediaPipe hand landmarker model")
+    args = parser.parse_args()
+
+    from gesture_v3.perception.tracker import HandTracker
+    tracker = HandTracker(args.model)
+    cap = cv2.VideoCapture(args.camera)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAPTURE_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAPTURE_HEIGHT)
+    cap.set(cv2.CAP_PROP_FPS, config.TARGET_FPS)
+    sender = LandmarkSender(args.host, args.port)
+    print(f"[REMOTE] Streaming landmarks to {args.host}:{args.port} (Ctrl+C to stop)")
+
+    start = time.time()
+    frames = sent_bytes = 0
+    report = start + 5.0
+    try:
+        while True:
+            ok, img = cap.read()
+            if not ok:
+                continue
+            now = time.time()
+            # Mirror like the local pipeline does, so the control side needs no special case
+            img = cv2.flip(img, 1)
+            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            result = tracker.process(img_rgb, (now - start) * 1000)
+            hand = result.hand_landmarks[0] if result.hand_landmarks else None
+            sender.send(hand, now)
+            frames += 1
+            sent_bytes += PACKET_SIZE if hand is not None else HEADER.size
+            if now >= report:
+                elapsed = now - start
+                print(f"[REMOTE] {frames / elapsed:.1f} fps, {sent_bytes / elapsed / 1024:.1f} KB/s")
+                report = now + 5.0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sender.close()
+        cap.release()
+        tracker.close()
+
+if __name__ == "__main__":
+    main()